@@ -0,0 +1,59 @@
+"""Generate config files of a given size from the samples the processors start from."""
+
+import json
+
+from src.constants.flake8 import SAMPLE_FLAKE8
+from src.constants.pre_commit_config import SAMPLE_PRE_COMMIT_CONFIG
+from src.constants.pylintrc import SAMPLE_PYLINTRC
+from src.constants.pyproject_toml import SAMPLE_PYPROJECT_TOML
+from src.constants.vscode_settings import SAMPLE_VSCODE_SETTINGS
+from src.utils.core import thaw
+
+
+def generate_pre_commit_config(size: int) -> str:
+    """Return a .pre-commit-config.yaml file with `size` extra repos and `size` extra local hooks."""
+    lines = [SAMPLE_PRE_COMMIT_CONFIG.rstrip("\n")]
+    for index in range(size):
+        lines.append(f"  - repo: https://github.com/example/hooks-{index}")
+        lines.append(f"    rev: v{index}.0.0")
+        lines.append("    hooks:")
+        lines.append(f"      - id: hook-{index} # Generated")
+        lines.append(f"        args: [--option-{index}]")
+    lines.append("  - repo: local")
+    lines.append("    hooks:")
+    for index in range(size):
+        lines.append(f"      - id: local-{index}")
+        lines.append(f"        entry: scripts/local-{index}.sh")
+        lines.append("        language: script")
+    return "\n".join(lines) + "\n"
+
+
+def generate_pyproject_toml(size: int) -> str:
+    """Return a pyproject.toml file with `size` extra tool tables."""
+    tables = [f'[tool.generated-{index}]\nenabled = true\nvalue = "{index}"\n' for index in range(size)]
+    return "\n".join([SAMPLE_PYPROJECT_TOML, *tables])
+
+
+def generate_ini(sample: str, size: int) -> str:
+    """Return an ini file with `size` extra sections after `sample`."""
+    sections = [f"[generated-{index}]\noption-{index} = {index}\n" for index in range(size)]
+    return "\n".join([sample, *sections])
+
+
+def generate_pylintrc(size: int) -> str:
+    """Return a .pylintrc file with `size` extra sections."""
+    return generate_ini(SAMPLE_PYLINTRC, size)
+
+
+def generate_flake8(size: int) -> str:
+    """Return a .flake8 file with `size` extra sections."""
+    return generate_ini(SAMPLE_FLAKE8, size)
+
+
+def generate_vscode_settings(size: int) -> str:
+    """Return a .vscode/settings.json file with `size` extra settings and `size` extra search exclusions."""
+    settings = thaw(SAMPLE_VSCODE_SETTINGS)
+    for index in range(size):
+        settings[f"generated.setting{index}"] = index
+        settings["search.exclude"][f"generated-{index}/**"] = True
+    return json.dumps(settings, indent=2)
@@ -0,0 +1,225 @@
+"""Time the config processors against generated inputs of increasing size.
+
+Each benchmark parses a generated file, then times the processor and the serialisation of its result, which is what a
+real run does apart from reading and writing the file. The best time of `--repeat` runs is kept.
+
+    python -m benchmarks.run                        # compare against benchmarks/baseline.json
+    python -m benchmarks.run --save                 # record a new baseline
+    python -m benchmarks.run --sizes=10,100 --threshold=0.5
+
+Baselines only mean something on the machine that recorded them, so record one before making a change and compare
+after it. The run fails when a benchmark is slower than its baseline by more than `--threshold`.
+"""
+
+import json
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from configupdater import ConfigUpdater
+from ruamel.yaml import YAML
+from tomlkit import dumps, parse
+
+from benchmarks.generators import (
+    generate_flake8,
+    generate_pre_commit_config,
+    generate_pylintrc,
+    generate_pyproject_toml,
+    generate_vscode_settings,
+)
+from src.process_flake8 import process_flake8
+from src.process_pre_commit_config import PreCommitConfigProcessor
+from src.process_pylintrc import process_pylintrc
+from src.process_pyproject_toml import PyProjectTomlProcessor
+from src.process_vscode_settings import process_vscode_settings
+from src.utils.configupdater import dump_ini_file
+from src.utils.prettier import dump_json
+from src.utils.ruamel.yaml import dump_yaml
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_THRESHOLD = 0.25
+
+
+class Benchmark(NamedTuple):
+    """A processor with the functions to generate, load and process its input."""
+
+    name: str
+    generate: Callable[[int], str]
+    load: Callable[[str], Any]
+    process: Callable[[Any], str]
+
+
+class Result(NamedTuple):
+    """The best time of a benchmark for an input size, with its baseline if there is one."""
+
+    name: str
+    size: int
+    seconds: float
+    baseline: Optional[float]
+
+
+def _load_yaml(content: str) -> Any:
+    return YAML().load(StringIO(content))
+
+
+def _load_ini(content: str) -> ConfigUpdater:
+    data = ConfigUpdater()
+    data.read_string(content)
+    return data
+
+
+def _process_pre_commit_config(data: Any) -> str:
+    return dump_yaml(PreCommitConfigProcessor(pre_commit_config=data, test=True).process_pre_commit_config())
+
+
+def _process_pyproject_toml(data: Any) -> str:
+    PyProjectTomlProcessor(pyproject_toml=data, test=True).process_pyproject_toml()
+    return dumps(data)
+
+
+def _process_pylintrc(data: ConfigUpdater) -> str:
+    process_pylintrc(pylintrc=data, test=True)
+    return dump_ini_file(data)
+
+
+def _process_flake8(data: ConfigUpdater) -> str:
+    process_flake8(flake8_config=data, test=True)
+    return dump_ini_file(data)
+
+
+def _process_vscode_settings(data: Dict[str, Any]) -> str:
+    return dump_json(process_vscode_settings(vscode_settings=data, test=True), sort_keys=True)
+
+
+BENCHMARKS = [
+    Benchmark("pre_commit_config", generate_pre_commit_config, _load_yaml, _process_pre_commit_config),
+    Benchmark("pyproject_toml", generate_pyproject_toml, parse, _process_pyproject_toml),
+    Benchmark("pylintrc", generate_pylintrc, _load_ini, _process_pylintrc),
+    Benchmark("flake8", generate_flake8, _load_ini, _process_flake8),
+    Benchmark("vscode_settings", generate_vscode_settings, json.loads, _process_vscode_settings),
+]
+
+
+def result_key(name: str, size: int) -> str:
+    """Return the key of a benchmark result in the baseline file."""
+    return f"{name}[{size}]"
+
+
+def time_benchmark(benchmark: Benchmark, size: int, repeat: int) -> float:
+    """Return the best time in seconds of processing a generated input of `size` elements."""
+    content = benchmark.generate(size)
+    best = float("inf")
+    for _ in range(repeat):
+        data = benchmark.load(content)
+        start = time.perf_counter()
+        benchmark.process(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    """Load the results of a baseline file, or nothing if it is missing or from another format version."""
+    try:
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(baseline, dict) or baseline.get("format") != BASELINE_FORMAT_VERSION:
+        return {}
+    return baseline.get("results", {})
+
+
+def save_baseline(path: Path, results: List[Result]):
+    """Write the results to a baseline file, keeping the results of benchmarks that did not run."""
+    merged = load_baseline(path)
+    merged.update({result_key(result.name, result.size): result.seconds for result in results})
+    baseline = {
+        "format": BASELINE_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": dict(sorted(merged.items())),
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(results: List[Result], threshold: float) -> List[Result]:
+    """Return the results that are slower than their baseline by more than `threshold`."""
+    return [result for result in results if result.baseline and result.seconds > result.baseline * (1 + threshold)]
+
+
+def print_results(results: List[Result], threshold: float):
+    """Print a table of the results and their change against the baseline."""
+    print(f"{'benchmark':<30} {'seconds':>10} {'baseline':>10} {'change':>8}")
+    for result in results:
+        baseline = "-" if result.baseline is None else f"{result.baseline:.4f}"
+        change = "-"
+        if result.baseline:
+            ratio = result.seconds / result.baseline - 1
+            change = f"{ratio:+.0%}" + (" !" if ratio > threshold else "")
+        print(f"{result_key(result.name, result.size):<30} {result.seconds:>10.4f} {baseline:>10} {change:>8}")
+
+
+def build_parser() -> ArgumentParser:
+    """Build the argument parser of the benchmark runner."""
+    parser = ArgumentParser(prog="python -m benchmarks.run", description="Benchmark the config processors.")
+    parser.add_argument(
+        "--benchmarks",
+        default=",".join(benchmark.name for benchmark in BENCHMARKS),
+        type=lambda value: [name for name in value.split(",") if name],
+        help="Comma separated benchmarks to run",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        type=lambda value: [int(size) for size in value.split(",") if size],
+        help="Comma separated input sizes",
+    )
+    parser.add_argument("--repeat", default=3, type=int, help="Number of runs to keep the best time of")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, type=Path)
+    parser.add_argument("--threshold", default=DEFAULT_THRESHOLD, type=float, help="Allowed slowdown, 0.25 is 25%%")
+    parser.add_argument("--save", action="store_true", help="Record the results as the new baseline")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks and return 1 when one of them regressed."""
+    args = build_parser().parse_args(argv)
+    by_name = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+    unknown = [name for name in args.benchmarks if name not in by_name]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}. Valid benchmarks are: {', '.join(by_name)}", file=sys.stderr)
+        return 2
+
+    baseline = {} if args.save else load_baseline(args.baseline)
+    results = []
+    for name in args.benchmarks:
+        for size in args.sizes:
+            seconds = time_benchmark(by_name[name], size, args.repeat)
+            results.append(Result(name, size, seconds, baseline.get(result_key(name, size))))
+
+    print_results(results, args.threshold)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, run with --save to record one")
+        return 0
+
+    regressions = find_regressions(results, args.threshold)
+    if regressions:
+        names = ", ".join(result_key(result.name, result.size) for result in regressions)
+        print(f"Slower than the baseline by more than {args.threshold:.0%}: {names}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,43 @@
 # setup_python_app.sh creates project environments in the local .venv folder above, so the first option works out of the box.
 # Set WORKON_HOME if your environments live somewhere else.
 #
+# Environments created by venv or virtualenv (the ones with a pyvenv.cfg) are not activated by sourcing bin/activate.
+# VIRTUAL_ENV and PATH are set directly and the environment's own executable is exec'd. The resolved environment is cached
+# per project directory until its pyvenv.cfg changes, since this runs for every batch of files pre-commit passes to a hook.
+#
 # Example
 # cd my/python/package
 # ./ensure_venv.sh pylint src
 
+cache_dir="${UTILITY_REPO_SCRIPTS_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/utility-repo-scripts}/ensure-venv"
+cache_file="$cache_dir/${PWD//\//%}"
+
+exec_in_venv() {
+	local venv_path="$1"
+	shift
+
+	export VIRTUAL_ENV="$venv_path"
+	export PATH="$venv_path/bin:$PATH"
+	unset PYTHONHOME
+	if [[ "$1" != */* ]] && [ -x "$venv_path/bin/$1" ]; then
+		exec "$venv_path/bin/$1" "${@:2}"
+	fi
+	exec "$@"
+}
+
+read_cached_venv_path() {
+	# Sets cached_venv_path without a subshell, the whole point of the cache is to avoid forks
+	cached_venv_path=""
+	if [ ! -f "$cache_file" ] || ! read -r cached_venv_path <"$cache_file" ||
+		[ ! -f "$cached_venv_path/pyvenv.cfg" ] || [ "$cached_venv_path/pyvenv.cfg" -nt "$cache_file" ]; then
+		return 1
+	fi
+	# A project .venv created after the cache was written takes precedence again
+	if [ "$cached_venv_path" != "$PWD/.venv" ] && [ -f "$PWD/.venv/bin/activate" ]; then
+		return 1
+	fi
+}
+
 try_activate_venv() {
 	local venv_path="$1"
 	local activate_path="$venv_path/bin/activate"
@@ -21,6 +54,11 @@ try_activate_venv() {
 		return 1
 	fi
 
+	if [ -f "$venv_path/pyvenv.cfg" ]; then
+		mkdir -p "$cache_dir" 2>/dev/null && printf '%s\n' "$venv_path" >"$cache_file" 2>/dev/null
+		exec_in_venv "$venv_path" "${@:2}"
+	fi
+
 	# shellcheck disable=SC1090
 	if source "$activate_path" && [ -n "$VIRTUAL_ENV" ]; then
 		return 0
@@ -30,6 +68,10 @@ try_activate_venv() {
 }
 
 if [ -z "$VIRTUAL_ENV" ]; then
+	if read_cached_venv_path; then
+		exec_in_venv "$cached_venv_path" "$@"
+	fi
+
 	venv_name=$(basename "$PWD")
 	pyenv_root="${PYENV_ROOT:-$HOME/.pyenv}"
 	candidate_venv_paths=("$PWD/.venv")
@@ -41,7 +83,7 @@ if [ -z "$VIRTUAL_ENV" ]; then
 
 	activated=0
 	for candidate_venv_path in "${candidate_venv_paths[@]}"; do
-		if try_activate_venv "$candidate_venv_path"; then
+		if try_activate_venv "$candidate_venv_path" "$@"; then
 			activated=1
 			break
 		fi
@@ -51,4 +93,4 @@ if [ -z "$VIRTUAL_ENV" ]; then
 		echo "Command is run without a virtual environment in place and none of the candidate virtual environments exist or can be activated: ${candidate_venv_paths[*]}. This may cause the command to fail" >&2
 	fi
 fi
-"$@"
+exec "$@"
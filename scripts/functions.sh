@@ -1,193 +1,536 @@
 #!/bin/bash
 debug=${debug:-0} # Load debug cli option if it already exists
 
-function find_site_package() {
-	local package_name="$1"
-	local pypi_name="$2"
-	local package_location
-	local package_previously_installed
-	local package_probe_result
-	package_probe_result=$(python -c '
-import importlib.util
-import sys
-import traceback
-
-package_name = sys.argv[1]
-
-try:
-    package_spec = importlib.util.find_spec(package_name)
-except (ImportError, ModuleNotFoundError):
-    print("missing")
-except Exception:
-    traceback.print_exc()
-    raise
-else:
-    if package_spec is None:
-        print("missing")
-    else:
-        package_location = package_spec.origin or "<namespace>"
-        print(f"present:{package_location}")
-' "$package_name")
-	local package_probe_status=$?
-	if [ "$package_probe_status" -ne 0 ]; then
+function ensure_tool_venv() {
+	local requirements_path="$1"
+	local cache_dir="${UTILITY_REPO_SCRIPTS_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/utility-repo-scripts}"
+	local requirements_checksum
+	local interpreter
+	local interpreter_checksum
+	local tool_venv_dir
+	local lock_dir
+	local lock_pid
+	local build_status=0
+
+	if ! requirements_checksum=$(cksum <"$requirements_path"); then
 		return 1
 	fi
+	requirements_checksum="${requirements_checksum%% *}"
 
-	case "$package_probe_result" in
-	"missing")
-		package_location=""
-		package_previously_installed=0
-		;;
-	"present:"*)
-		package_location="${package_probe_result#present:}"
-		package_previously_installed=1
-		;;
-	*)
-		echo "find_site_package(): Unexpected probe result for $package_name: $package_probe_result" >&2
+	# Keyed by the interpreter that builds the environment, not by the requested version label, so a python
+	# rebuilt or upgraded under the same label gets a new environment
+	if ! interpreter=$(python -c 'import os, platform, sys; print(platform.python_version()); print(os.path.realpath(sys.executable)); print(sys.version)'); then
 		return 1
-		;;
-	esac
-
-	if [ "$debug" = 1 ]; then
-		echo "find_site_package(): $package_location" >&2
 	fi
+	interpreter_checksum=$(printf '%s' "$interpreter" | cksum)
+	interpreter_checksum="${interpreter_checksum%% *}"
+	tool_venv_dir="$cache_dir/tool-venvs/${interpreter%%$'\n'*}-$interpreter_checksum-$requirements_checksum"
 
-	if [ "$package_previously_installed" = 0 ]; then
+	if [ -f "$tool_venv_dir/.complete" ]; then
 		if [ "$debug" = 1 ]; then
-			echo "find_site_package(): $pypi_name not found" >&2
-			echo "find_site_package(): Installing $pypi_name temporarily for this setup step" >&2
-		fi
-		if ! pip install "$pypi_name"; then
-			return 1
+			echo "ensure_tool_venv(): Reusing tool environment at $tool_venv_dir" >&2
 		fi
 	else
-		if [ "$debug" = 1 ]; then
-			echo "find_site_package(): $pypi_name found" >&2
+		# Virtual environments are not relocatable, so the environment is built in its final location. Only one
+		# setup builds it, the others wait, and .complete is written last so a half-installed one is never used.
+		lock_dir="$tool_venv_dir.lock"
+		mkdir -p "$cache_dir/tool-venvs"
+		while ! mkdir "$lock_dir" 2>/dev/null; do
+			lock_pid=$(cat "$lock_dir/pid" 2>/dev/null)
+			if [ "$lock_pid" != "" ] && ! kill -0 "$lock_pid" 2>/dev/null; then
+				# The setup that was building it died
+				rm -rf "$lock_dir"
+			else
+				sleep 1
+			fi
+		done
+		echo "$$" >"$lock_dir/pid"
+
+		if [ ! -f "$tool_venv_dir/.complete" ]; then
+			if [ "$debug" = 1 ]; then
+				echo "ensure_tool_venv(): Building tool environment at $tool_venv_dir" >&2
+			fi
+			rm -rf "$tool_venv_dir"
+			if python -m venv "$tool_venv_dir" >&2 &&
+				"$tool_venv_dir/bin/python" -m pip install --disable-pip-version-check -r "$requirements_path" >&2; then
+				touch "$tool_venv_dir/.complete"
+			else
+				rm -rf "$tool_venv_dir"
+				build_status=1
+			fi
+		elif [ "$debug" = 1 ]; then
+			echo "ensure_tool_venv(): Reusing tool environment at $tool_venv_dir" >&2
+		fi
+		rm -rf "$lock_dir"
+
+		if [ "$build_status" != 0 ]; then
+			return 1
 		fi
 	fi
-	if [ "$debug" = 1 ]; then
-		echo "find_site_package(): $package_name exists = $package_previously_installed" >&2
+
+	printf '%s' "$tool_venv_dir/bin/python"
+}
+
+# Region timings are appended to this file as tab separated lines: name, start, end, exit status and skipped (0/1)
+region_timings_file=""
+region_timings_origin=""
+
+function monotonic_time() {
+	# Print the seconds of a monotonic clock, bash 3.2 has no builtin for it. Falls back to the wall clock.
+	perl -MTime::HiRes=clock_gettime,CLOCK_MONOTONIC -e 'printf("%.6f\n", clock_gettime(CLOCK_MONOTONIC))' 2>/dev/null ||
+		python3 -c 'import time; print("%.6f" % time.monotonic())' 2>/dev/null ||
+		date +%s
+}
+
+function enable_region_timings() {
+	region_timings_file=$(mktemp "${TMPDIR:-/tmp}/utility-repo-scripts-timings.XXXXXX") || return 1
+	region_timings_origin=$(monotonic_time)
+	region_timings_started_at=$(date +%s)
+}
+
+function start_region_timer() {
+	# Print the start time of a region, or nothing when timings are disabled
+	if [ "$region_timings_file" != "" ]; then
+		monotonic_time
 	fi
-	printf '%s' "$package_previously_installed"
 }
 
-function find_site_distribution() {
-	local distribution_name="$1"
-	local distribution_previously_installed
-	local distribution_probe_result
-	distribution_probe_result=$(python -c '
-from importlib import metadata
-import sys
-import traceback
-
-distribution_name = sys.argv[1]
-
-try:
-    metadata.distribution(distribution_name)
-except metadata.PackageNotFoundError:
-    print("missing")
-except Exception:
-    traceback.print_exc()
-    raise
-else:
-    print("present")
-' "$distribution_name")
-	local distribution_probe_status=$?
-	if [ "$distribution_probe_status" -ne 0 ]; then
-		return 1
+function record_region_timing() {
+	# record_region_timing <name> <start> <status> <skipped>
+	local end
+
+	if [ "$region_timings_file" != "" ]; then
+		end=$(monotonic_time)
+		printf '%s\t%s\t%s\t%s\t%s\n' "$1" "${2:-$end}" "$end" "$3" "$4" >>"$region_timings_file"
 	fi
+}
 
-	case "$distribution_probe_result" in
-	"missing")
-		distribution_previously_installed=0
-		;;
-	"present")
-		distribution_previously_installed=1
-		;;
-	*)
-		echo "find_site_distribution(): Unexpected probe result for $distribution_name: $distribution_probe_result" >&2
-		return 1
-		;;
-	esac
+function report_region_timings() {
+	# report_region_timings <print_table> <json_path>
+	local print_table="$1"
+	local json_path="$2"
+	local now
+
+	if [ "$region_timings_file" = "" ]; then
+		return 0
+	fi
+	now=$(monotonic_time)
 
-	if [ "$debug" = 1 ]; then
-		echo "find_site_distribution(): $distribution_name exists = $distribution_previously_installed" >&2
+	if [ "$print_table" = 1 ]; then
+		echo "$dash_separator Timings $dash_separator"
+		printf '%-24s %11s  %s\n' "Region" "Duration" "Result"
+		# Slowest first: sort on a leading duration column, then drop it
+		awk -F '\t' '{
+			result = $5 == 1 ? "skipped" : "status " $4
+			printf "%.6f\t%-24s %10.2fs  %s\n", $3 - $2, $1, $3 - $2, result
+		}' \
+			"$region_timings_file" | sort -t "$(printf '\t')" -k 1,1 -rn | cut -f 2-
+		awk -v origin="$region_timings_origin" -v now="$now" 'BEGIN { printf "%-24s %10.2fs\n", "Total", now - origin }'
 	fi
 
-	printf '%s' "$distribution_previously_installed"
+	if [ "$json_path" != "" ]; then
+		awk -F '\t' -v origin="$region_timings_origin" -v now="$now" -v started_at="$region_timings_started_at" '
+			BEGIN { printf "{\n  \"started_at\": %d,\n  \"duration\": %.6f,\n  \"regions\": [", started_at, now - origin }
+			{
+				separator = NR > 1 ? "," : ""
+				status = $4 == "" ? "null" : $4
+				skipped = $5 == 1 ? "true" : "false"
+				printf "%s\n    {\"region\": \"%s\", \"start\": %.6f, \"duration\": %.6f, \"status\": %s, \"skipped\": %s}",
+					separator, $1, $2 - origin, $3 - $2, status, skipped
+			}
+			END {
+				closing = NR > 0 ? "\n  " : ""
+				printf "%s]\n}\n", closing
+			}' "$region_timings_file" >"$json_path" ||
+			echo "Failed to write the region timings to $json_path" >&2
+	fi
+
+	rm -f "$region_timings_file"
+	region_timings_file=""
+}
+
+# Regions registered with schedule_region. Every region has to be scheduled after the regions it depends on.
+scheduled_region_names=()
+scheduled_region_functions=()
+scheduled_region_dependencies=()
+scheduled_region_statuses=()
+scheduled_region_pids=()
+
+function schedule_region() {
+	# schedule_region <name> <function> [dependency...]
+	scheduled_region_names+=("$1")
+	scheduled_region_functions+=("$2")
+	shift 2
+	scheduled_region_dependencies+=("$*")
+}
+
+function _scheduled_region_state() {
+	# Set scheduled_region_state to ready, waiting or blocked (a dependency failed or was skipped)
+	local dependency
+	local index
+
+	scheduled_region_state="ready"
+	for dependency in ${scheduled_region_dependencies[$1]}; do
+		for index in "${!scheduled_region_names[@]}"; do
+			if [ "${scheduled_region_names[$index]}" = "$dependency" ]; then
+				case "${scheduled_region_statuses[$index]}" in
+				0) ;;
+				pending | running) scheduled_region_state="waiting" ;;
+				*)
+					scheduled_region_state="blocked"
+					return
+					;;
+				esac
+			fi
+		done
+	done
 }
 
-function uninstall_site_package() {
-	local package_name="$1"
-	local package_installed="$2"
-	if [ "$package_installed" = 0 ]; then
-		echo "Uninstalling $package_name since it did not exist in the virtual environment prior to running this script. Consider adding $package_name as a dev dependency to stop seeing message."
-		pip uninstall -y "$package_name"
+function run_scheduled_regions() {
+	# run_scheduled_regions <parallel>
+	# With parallel=1 every region whose dependencies succeeded runs in the background, and its output is printed
+	# with a [name] prefix once it finishes so that concurrent regions do not interleave. With parallel=0 the regions
+	# run one after the other in the current shell, in the order they were scheduled.
+	local parallel="$1"
+	local log_dir=""
+	local remaining=${#scheduled_region_names[@]}
+	local running=0
+	local progressed
+	local region_start
+	local index
+	local name
+	local status
+	local failed=""
+
+	for index in "${!scheduled_region_names[@]}"; do
+		scheduled_region_statuses[index]="pending"
+	done
+
+	if [ "$parallel" = 1 ]; then
+		log_dir=$(mktemp -d "${TMPDIR:-/tmp}/utility-repo-scripts-regions.XXXXXX") || return 1
+	fi
+
+	while [ "$remaining" -gt 0 ]; do
+		progressed=0
+		for index in "${!scheduled_region_names[@]}"; do
+			name="${scheduled_region_names[$index]}"
+			case "${scheduled_region_statuses[$index]}" in
+			pending)
+				_scheduled_region_state "$index"
+				if [ "$scheduled_region_state" = "blocked" ]; then
+					echo "Skipping $name because a region it depends on failed"
+					record_region_timing "$name" "" "" 1
+					scheduled_region_statuses[index]="skipped"
+					remaining=$((remaining - 1))
+					progressed=1
+				elif [ "$scheduled_region_state" = "ready" ] && [ "$parallel" = 1 ]; then
+					if [ "$debug" = 1 ]; then
+						echo "Starting $name"
+					fi
+					# The nested subshell keeps the status file write even when the region calls exit
+					(
+						region_start=$(start_region_timer)
+						("${scheduled_region_functions[$index]}") >"$log_dir/$index.log" 2>&1 </dev/null
+						region_status=$?
+						record_region_timing "$name" "$region_start" "$region_status" 0
+						echo "$region_status" >"$log_dir/$index.status"
+					) &
+					scheduled_region_pids[index]=$!
+					scheduled_region_statuses[index]="running"
+					running=$((running + 1))
+					progressed=1
+				elif [ "$scheduled_region_state" = "ready" ]; then
+					region_start=$(start_region_timer)
+					status=0
+					"${scheduled_region_functions[$index]}" || status=$?
+					record_region_timing "$name" "$region_start" "$status" 0
+					scheduled_region_statuses[index]=$status
+					remaining=$((remaining - 1))
+					progressed=1
+				fi
+				;;
+			running)
+				if [ -f "$log_dir/$index.status" ]; then
+					wait "${scheduled_region_pids[$index]}" 2>/dev/null
+					status=$(cat "$log_dir/$index.status")
+					sed "s/^/[$name] /" "$log_dir/$index.log"
+					scheduled_region_statuses[index]=$status
+					running=$((running - 1))
+					remaining=$((remaining - 1))
+					progressed=1
+				fi
+				;;
+			esac
+		done
+
+		if [ "$progressed" = 0 ] && [ "$running" = 0 ]; then
+			# Only regions waiting on each other are left
+			for index in "${!scheduled_region_names[@]}"; do
+				if [ "${scheduled_region_statuses[$index]}" = "pending" ]; then
+					echo "Skipping ${scheduled_region_names[$index]} because its dependencies form a cycle"
+					record_region_timing "${scheduled_region_names[$index]}" "" "" 1
+					scheduled_region_statuses[index]="skipped"
+				fi
+			done
+			remaining=0
+		elif [ "$progressed" = 0 ]; then
+			sleep 0.1
+		fi
+	done
+
+	if [ "$log_dir" != "" ]; then
+		rm -rf "$log_dir"
 	fi
+
+	for index in "${!scheduled_region_names[@]}"; do
+		if [ "${scheduled_region_statuses[$index]}" != 0 ]; then
+			failed="$failed ${scheduled_region_names[$index]}"
+		fi
+	done
+	if [ "$failed" != "" ]; then
+		echo "Failed or skipped regions:$failed" >&2
+		return 1
+	fi
+}
+
+function dependency_fingerprint() {
+	# dependency_fingerprint <package_manager> <venv_dir>
+	# Print a checksum of everything that decides what the dependency install region installs
+	local package_manager="$1"
+	local venv_dir="$2"
+	local file
+
+	{
+		echo "package_manager=$package_manager"
+		echo "python=$(command -v python)"
+		# Holds the version and location of the interpreter the environment was created from
+		cat "$venv_dir/pyvenv.cfg" 2>/dev/null
+		for file in poetry.lock uv.lock pyproject.toml setup.py setup.cfg tox.ini requirements*.txt; do
+			if [ -f "$file" ]; then
+				echo "$file: $(cksum <"$file")"
+			fi
+		done
+	} | cksum
+}
+
+function background_pid() {
+	# Print the pid of the subshell it runs in, which $$ does not give and $BASHPID only gives from bash 4
+	sh -c 'echo "$PPID"'
 }
 
-function prettier_format() {
-	file_name="$1"
-	if command -v prettier >/dev/null; then
+function start_outdated_report() {
+	# start_outdated_report <report_file> <ttl_hours> <lock_file> <command...>
+	# Refresh the report in the background with the output of the command, unless it is younger than ttl_hours and
+	# the lock file. The pid of the refresh is written to <report_file>.pid until it finishes.
+	local report_file="$1"
+	local ttl_hours="$2"
+	local lock_file="$3"
+	shift 3
+
+	if [ -f "$report_file" ] && [ -n "$(find "$report_file" -mmin -"$((ttl_hours * 60))" 2>/dev/null)" ] &&
+		! [ "$lock_file" -nt "$report_file" ]; then
 		if [ "$debug" = 1 ]; then
-			echo "prettier_format(): prettier found"
-			echo "prettier_format(): Formatting $file_name"
+			echo "start_outdated_report(): Reusing the report at $report_file"
 		fi
-		prettier "$file_name" --write --ignore-path .prettierignore
 		return 0
-	else
-		if [ "$debug" = 1 ]; then
-			echo "prettier_format(): prettier not found"
+	fi
+
+	echo "Computing the outdated package report in the background, it will be printed at the end of the setup"
+	rm -f "$report_file"
+	# Written before the refresh starts, and replaced by the refresh itself, so a refresh that finishes at once never
+	# has its pid file written back after removing it
+	echo "$$" >"$report_file.pid"
+	(
+		background_pid >"$report_file.pid"
+		if "$@" >"$report_file.tmp" 2>&1; then
+			mv "$report_file.tmp" "$report_file"
+		else
+			rm -f "$report_file.tmp"
 		fi
+		rm -f "$report_file.pid"
+	) </dev/null >/dev/null 2>&1 &
+}
 
-		if command -v npm >/dev/null; then
-			if [ "$debug" = 1 ]; then
-				echo "prettier_format(): npm found"
-				echo "prettier_format(): Installing prettier globally to format $file_name"
-			fi
-			npm install -g prettier
-			prettier "$file_name" --write --ignore-path .prettierignore
+function print_outdated_report() {
+	# print_outdated_report <report_file> <update_hint>
+	local report_file="$1"
+	local update_hint="$2"
+	local pid
+
+	if [ -f "$report_file.pid" ]; then
+		pid=$(cat "$report_file.pid")
+		if [ "$pid" != "" ] && kill -0 "$pid" 2>/dev/null; then
+			echo "The outdated package report is still being computed, it will be printed by the next setup."
 			return 0
-		else
-			if [ "$debug" = 1 ]; then
-				echo "prettier_format(): npm not found"
-				echo "prettier_format(): Skipping formatting of $file_name"
-			fi
 		fi
+		rm -f "$report_file.pid"
+	fi
+
+	if [ ! -f "$report_file" ]; then
+		echo "The outdated package report could not be computed, it will be computed again by the next setup."
+	elif [ -s "$report_file" ]; then
+		echo "Outdated packages:"
+		cat "$report_file"
+		echo "$update_hint"
+	else
+		echo "No outdated packages."
 	fi
-	return 1
 }
 
-function json_sort() {
-	file_path="$1"
-	if command -v sort-json >/dev/null; then
+function start_pre_commit_install_hooks() {
+	# start_pre_commit_install_hooks <status_file> <log_file>
+	# Build every hook environment with `pre-commit install-hooks` in the background, so that the first commit does
+	# not have to. The status file holds "running <pid>" and then "<exit status> <.pre-commit-config.yaml checksum>".
+	# A commit started meanwhile waits on the pre-commit store lock instead of building the environments again.
+	local status_file="$1"
+	local log_file="$2"
+	local config_checksum
+	local state
+
+	config_checksum=$(cksum <.pre-commit-config.yaml)
+	config_checksum="${config_checksum%% *}"
+	state=$(cat "$status_file" 2>/dev/null)
+	case "$state" in
+	"running "*)
+		if kill -0 "${state#running }" 2>/dev/null; then
+			echo "The pre-commit hook environments are already being built in the background, see $log_file"
+			return 0
+		fi
+		;;
+	"0 $config_checksum")
 		if [ "$debug" = 1 ]; then
-			echo "sort-json found"
-			echo "Sorting $file_path"
+			echo "start_pre_commit_install_hooks(): The hook environments are up to date"
 		fi
-		sort-json "$file_path"
 		return 0
-	else
-		if [ "$debug" = 1 ]; then
-			echo "sort-json not found"
+		;;
+	esac
+
+	echo "Building the pre-commit hook environments in the background, see $log_file"
+	# Written before the build starts, and replaced by the build itself, so a build that finishes at once never has
+	# its exit status overwritten
+	echo "running $$" >"$status_file"
+	(
+		{
+			printf 'running '
+			background_pid
+		} >"$status_file"
+		install_status=0
+		pre-commit install-hooks >"$log_file" 2>&1 || install_status=$?
+		echo "$install_status $config_checksum" >"$status_file"
+	) </dev/null >/dev/null 2>&1 &
+}
+
+function print_pre_commit_install_hooks_status() {
+	# print_pre_commit_install_hooks_status <status_file> <log_file>
+	local status_file="$1"
+	local log_file="$2"
+	local state
+
+	state=$(cat "$status_file" 2>/dev/null)
+	case "$state" in
+	"running "*)
+		if kill -0 "${state#running }" 2>/dev/null; then
+			echo "The pre-commit hook environments are still being built in the background, see $log_file"
 		fi
+		;;
+	"" | "0 "*) ;;
+	*)
+		echo "Building the pre-commit hook environments failed, see $log_file. The first commit will build them."
+		;;
+	esac
+}
 
-		if command -v npm >/dev/null; then
-			if [ "$debug" = 1 ]; then
-				echo "npm found"
-				echo "Installing sort-json globally to format $file_path"
-			fi
-			npm install -g sort-json
-			sort-json "$file_path"
-			return 0
-		else
-			if [ "$debug" = 1 ]; then
-				echo "npm not found"
-				echo "Skipping sorting of $file_path"
+function fill_wheelhouse() {
+	# fill_wheelhouse <wheelhouse> <package_manager> <tool_requirements_path>
+	# Download everything the setup installs with pip or uv into the wheelhouse, for the python that is active
+	local wheelhouse="$1"
+	local package_manager="$2"
+	local tool_requirements_path="$3"
+	local download_args=(pip setuptools wheel -r "$tool_requirements_path")
+	local exported_requirements=""
+	local requirements_file
+	local requirements_found=0
+	local download_status=0
+
+	if [ -f "tox.ini" ]; then
+		download_args+=(tox)
+	fi
+	if [ "$package_manager" = "pip-tools" ]; then
+		download_args+=(pip-tools)
+	fi
+
+	if [ "$package_manager" = "uv" ]; then
+		exported_requirements=$(mktemp "${TMPDIR:-/tmp}/utility-repo-scripts-wheelhouse.XXXXXX") || return 1
+		if ! uv export --quiet --no-hashes --format requirements-txt --output-file "$exported_requirements"; then
+			rm -f "$exported_requirements"
+			return 1
+		fi
+		download_args+=(-r "$exported_requirements")
+	elif [ "$package_manager" = "poetry" ]; then
+		echo "poetry installs from its own sources, only the packages pip installs are downloaded to the wheelhouse"
+	else
+		for requirements_file in requirements*.txt; do
+			if [ -f "$requirements_file" ]; then
+				download_args+=(-r "$requirements_file")
+				requirements_found=1
 			fi
+		done
+		# The setup installs setup.py projects only when there are no requirements files
+		if [ "$requirements_found" = 0 ] && [ -f "setup.py" ]; then
+			download_args+=(.)
 		fi
 	fi
-	return 1
+
+	mkdir -p "$wheelhouse" &&
+		python -m pip download --disable-pip-version-check --dest "$wheelhouse" "${download_args[@]}" ||
+		download_status=$?
+	if [ "$exported_requirements" != "" ]; then
+		rm -f "$exported_requirements"
+	fi
+	return "$download_status"
+}
+
+function venv_python_version() {
+	# venv_python_version <venv_dir>
+	# Print the python version a virtual environment was created with, as written to pyvenv.cfg by venv or virtualenv
+	sed -n -E 's/^version(_info)?[[:space:]]*=[[:space:]]*([0-9]+(\.[0-9]+)*).*$/\2/p' "$1/pyvenv.cfg" 2>/dev/null |
+		head -n 1
+}
+
+function python_version_matches() {
+	# python_version_matches <venv_python_version> <requested_python_version>
+	# A requested 3.12 matches 3.12.4. Versions that are unknown or not plain numbers, like pypy3.10, always match
+	local venv_version="$1"
+	local requested_version="$2"
+
+	if [ "$venv_version" = "" ] || ! [[ "$requested_version" =~ ^[0-9]+(\.[0-9]+)*$ ]]; then
+		return 0
+	fi
+	[ "$venv_version" = "$requested_version" ] || [[ "$venv_version" == "$requested_version".* ]]
+}
+
+function venv_matches_python() {
+	# venv_matches_python <venv_dir> <requested_python_version>
+	# Succeed when the virtual environment is complete, was created with the requested python version and its base
+	# interpreter (home in pyvenv.cfg) still exists. Unknown versions or versions that are not plain numbers never match
+	local venv_dir="$1"
+	local requested_version="$2"
+	local venv_version
+	local home
+
+	if [ ! -x "$venv_dir/bin/python" ] || [ ! -f "$venv_dir/bin/activate" ] ||
+		! [[ "$requested_version" =~ ^[0-9]+(\.[0-9]+)*$ ]]; then
+		return 1
+	fi
+
+	venv_version=$(venv_python_version "$venv_dir")
+	if [ "$venv_version" = "" ] || ! python_version_matches "$venv_version" "$requested_version"; then
+		return 1
+	fi
+
+	home=$(sed -n -E 's/^home[[:space:]]*=[[:space:]]*(.*[^[:space:]])[[:space:]]*$/\1/p' "$venv_dir/pyvenv.cfg" |
+		head -n 1)
+	[ "$home" != "" ] && { [ -x "$home/python" ] || [ -x "$home/python3" ]; }
 }
 
 function print_bash_source_information() {
@@ -205,13 +548,6 @@ function print_bash_source_information() {
 	echo ""
 }
 
-function remove_trailing_whitespace() {
-	filename="$1"
-	tmp=$(mktemp)
-	sed -e 's/[[:space:]]*$//' <"$filename" >"$tmp"
-	mv "$tmp" "$filename"
-}
-
 function in_list() {
 	LIST=$1
 	DELIMITER=$2
@@ -220,12 +556,62 @@ function in_list() {
 }
 
 function install_vscode_Extension_if_not_installed() {
-	extension_name="$1"
-	installed_extensions="$2"
+	install_vscode_extensions "$2" "" "$1"
+}
+
+function list_vscode_extensions() {
+	# list_vscode_extensions <cache_file> <ttl_minutes>
+	# `code --list-extensions` starts VS Code, so its output is reused for ttl_minutes
+	local cache_file="$1"
+	local ttl_minutes="$2"
+	local extensions
 
-	if ! printf '%s\n' "$installed_extensions" | grep -Fxq -- "$extension_name"; then
-		code --install-extension "$extension_name" --force >/dev/null
+	if [ -f "$cache_file" ] && [ -n "$(find "$cache_file" -mmin -"$ttl_minutes" 2>/dev/null)" ]; then
+		cat "$cache_file"
+		return 0
+	fi
+
+	extensions=$(code --list-extensions) || return 1
+	mkdir -p "$(dirname -- "$cache_file")" && printf '%s\n' "$extensions" >"$cache_file"
+	printf '%s\n' "$extensions"
+}
+
+function install_vscode_extensions() {
+	# install_vscode_extensions <installed_extensions> <vsix_dir> <extension...>
+	# Install the missing extensions with a single code invocation, since each one starts VS Code. A missing extension
+	# is installed from the <vsix_dir>/<extension>-<version>.vsix with the highest version, or from
+	# <vsix_dir>/<extension>.vsix, when there is one.
+	local installed_extensions="$1"
+	local vsix_dir="$2"
+	local install_args=()
+	local extension_name
+	local vsix_path
+	shift 2
+
+	for extension_name in "$@"; do
+		# Extension ids are case insensitive
+		if printf '%s\n' "$installed_extensions" | grep -Fxqi -- "$extension_name"; then
+			continue
+		fi
+
+		vsix_path=""
+		if [ "$vsix_dir" != "" ]; then
+			# The glob sorts 2024.10.0 before 2024.2.0, and stays unexpanded when nothing matches
+			vsix_path=$(printf '%s\n' "$vsix_dir/$extension_name"-[0-9]*.vsix | sort -V | tail -n 1)
+			if [ ! -f "$vsix_path" ]; then
+				vsix_path=""
+				if [ -f "$vsix_dir/$extension_name.vsix" ]; then
+					vsix_path="$vsix_dir/$extension_name.vsix"
+				fi
+			fi
+		fi
+		install_args+=(--install-extension "${vsix_path:-$extension_name}")
+	done
+
+	if [ "${#install_args[@]}" = 0 ]; then
+		return 0
 	fi
+	code "${install_args[@]}" --force >/dev/null
 }
 
 function ensure_vscode_launch_file() {
@@ -1,7 +1,6 @@
 #!/bin/bash
 #region Variables, Script Dir Validation & Load Functions
 current_dir=$PWD
-pylintrc_filename=".pylintrc"
 dash_separator="--------------------" # 20 dashes
 script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" &>/dev/null && pwd)"
 
@@ -19,6 +18,8 @@ if [ ! -f "$script_dir"/scripts/functions.sh ]; then
 	exit 1
 fi
 source "$script_dir"/scripts/functions.sh "$@"
+# The regions run as functions, which have their own positional parameters
+setup_args=("$@")
 #endregion
 
 #region Process CLI Options
@@ -41,6 +42,22 @@ pre_commit_autoupdate=0
 overwrite_vscode_launch=0
 line_length=120
 pre_commit_pylint_entry_prefix="utility-repo-scripts/"
+no_cache=0
+parallel=1
+timings=0
+timings_file=""
+force_sync=0
+outdated_report=1
+outdated_report_ttl=24
+vscode_extensions_ttl=10
+vscode_vsix_dir=""
+pre_commit_install_hooks=1
+wheelhouse=""
+fill_wheelhouse=0
+pylint_hook_mode="process"
+pylint_result_cache=0
+mypy_mode="process"
+tool_performance_profile=""
 
 while getopts dr:-: OPT; do
 	# support long options: https://stackoverflow.com/a/28466267/519360
@@ -107,6 +124,54 @@ while getopts dr:-: OPT; do
 	pre_commit_pylint_entry_prefix)
 		pre_commit_pylint_entry_prefix=${OPTARG}
 		;;
+	no_cache)
+		no_cache=${OPTARG:-1}
+		;;
+	parallel)
+		parallel=${OPTARG:-1}
+		;;
+	timings)
+		timings=${OPTARG:-1}
+		;;
+	timings_file)
+		timings_file=${OPTARG}
+		;;
+	force_sync)
+		force_sync=${OPTARG:-1}
+		;;
+	outdated_report)
+		outdated_report=${OPTARG:-1}
+		;;
+	outdated_report_ttl)
+		outdated_report_ttl=${OPTARG}
+		;;
+	vscode_extensions_ttl)
+		vscode_extensions_ttl=${OPTARG}
+		;;
+	vscode_vsix_dir)
+		vscode_vsix_dir=${OPTARG}
+		;;
+	pre_commit_install_hooks)
+		pre_commit_install_hooks=${OPTARG:-1}
+		;;
+	wheelhouse)
+		wheelhouse=${OPTARG}
+		;;
+	fill_wheelhouse)
+		fill_wheelhouse=${OPTARG:-1}
+		;;
+	pylint_hook_mode)
+		pylint_hook_mode=${OPTARG}
+		;;
+	pylint_result_cache)
+		pylint_result_cache=${OPTARG:-1}
+		;;
+	mypy_mode)
+		mypy_mode=${OPTARG}
+		;;
+	tool_performance_profile)
+		tool_performance_profile=${OPTARG:-1}
+		;;
 	??*)
 		echo "Invalid long option provided (--$OPT). Consider removing this from the setup file"
 		;;
@@ -139,6 +204,22 @@ if [ "$debug" = 1 ]; then
 	echo "    --overwrite_vscode_launch: $overwrite_vscode_launch"
 	echo "    --line_length: $line_length"
 	echo "    --pre_commit_pylint_entry_prefix: $pre_commit_pylint_entry_prefix"
+	echo "    --no_cache: $no_cache"
+	echo "    --parallel: $parallel"
+	echo "    --timings: $timings"
+	echo "    --timings_file: $timings_file"
+	echo "    --force_sync: $force_sync"
+	echo "    --outdated_report: $outdated_report"
+	echo "    --outdated_report_ttl: $outdated_report_ttl"
+	echo "    --vscode_extensions_ttl: $vscode_extensions_ttl"
+	echo "    --vscode_vsix_dir: $vscode_vsix_dir"
+	echo "    --pre_commit_install_hooks: $pre_commit_install_hooks"
+	echo "    --wheelhouse: $wheelhouse"
+	echo "    --fill_wheelhouse: $fill_wheelhouse"
+	echo "    --pylint_hook_mode: $pylint_hook_mode"
+	echo "    --pylint_result_cache: $pylint_result_cache"
+	echo "    --mypy_mode: $mypy_mode"
+	echo "    --tool_performance_profile: $tool_performance_profile"
 	echo ""
 fi
 #endregion
@@ -148,86 +229,87 @@ if [ "$debug" != 0 ] && [ "$debug" != 1 ]; then
 	error "Invalid debug option: ($debug). Valid values are [0, 1]"
 fi
 
-if [ "$package_manager" != "pip" ] &&
-	[ "$package_manager" != "pip-tools" ] &&
-	[ "$package_manager" != "poetry" ] &&
-	[ "$package_manager" != "uv-pip" ] &&
-	[ "$package_manager" != "uv" ]; then
-	error "Invalid package_manager option: ($package_manager). Valid values are ['pip', 'pip-tools', 'poetry', 'uv-pip', 'uv']"
-else
-	if [ "$rebuild_venv" != 0 ] && [ "$rebuild_venv" != 1 ]; then
-		error "Invalid rebuild_venv option: ($rebuild_venv). Valid values are [0, 1]"
-	fi
-
-	if [ "$is_package" != 0 ] && [ "$is_package" != 1 ]; then
-		error "Invalid is_package option: ($is_package). Valid values are [0, 1]"
-	fi
+if [ "$rebuild_venv" != 0 ] && [ "$rebuild_venv" != 1 ]; then
+	error "Invalid rebuild_venv option: ($rebuild_venv). Valid values are [0, 1]"
 fi
 
 if [ -z "$python_version" ] || [[ "$python_version" == -* ]]; then
 	error "Invalid python_version option: ($python_version). Valid values are any non-empty pyenv install version string"
 fi
 
-if [ "$include_jumanji_house" != 0 ] && [ "$include_jumanji_house" != 1 ]; then
-	error "Invalid include_jumanji_house option: ($include_jumanji_house). Valid values are [0, 1]"
+if [ "$pre_commit_autoupdate" != 0 ] && [ "$pre_commit_autoupdate" != 1 ]; then
+	error "Invalid pre_commit_autoupdate option: ($pre_commit_autoupdate). Valid values are [0, 1]"
 fi
 
-if [ "$include_prettier" != 0 ] && [ "$include_prettier" != 1 ]; then
-	error "Invalid include_prettier option: ($include_prettier). Valid values are [0, 1]"
+if [ "$overwrite_vscode_launch" != 0 ] && [ "$overwrite_vscode_launch" != 1 ]; then
+	error "Invalid overwrite_vscode_launch option: ($overwrite_vscode_launch). Valid values are [0, 1]"
 fi
 
-if [ "$include_isort" != 0 ] && [ "$include_isort" != 1 ]; then
-	error "Invalid include_isort option: ($include_isort). Valid values are [0, 1]"
+if [ "$parallel" != 0 ] && [ "$parallel" != 1 ]; then
+	error "Invalid parallel option: ($parallel). Valid values are [0, 1]"
 fi
 
-if [ "$isort_profile" != "" ] &&
-	[ "$isort_profile" != "black" ] &&
-	[ "$isort_profile" != "django" ] &&
-	[ "$isort_profile" != "pycharm" ] &&
-	[ "$isort_profile" != "google" ] &&
-	[ "$isort_profile" != "open_stack" ] &&
-	[ "$isort_profile" != "plone" ] &&
-	[ "$isort_profile" != "attrs" ] &&
-	[ "$isort_profile" != "hug" ] &&
-	[ "$isort_profile" != "wemake" ] &&
-	[ "$isort_profile" != "appnexus" ]; then
-	error "Invalid isort_profile option: ($isort_profile). Valid values are ['', 'black', 'django', 'pycharm', 'google', 'open_stack', 'plone', 'attrs', 'hug', 'wemake', 'appnexus']"
+if [ "$timings" != 0 ] && [ "$timings" != 1 ]; then
+	error "Invalid timings option: ($timings). Valid values are [0, 1]"
 fi
 
-if [ "$python_formatter" != "" ] &&
-	[ "$python_formatter" != "autopep8" ] &&
-	[ "$python_formatter" != "black" ]; then
-	error "Invalid python_formatter option: ($python_formatter). Valid values are ['', autopep8, black]"
+if [ "$timings_file" != "" ] && [ ! -d "$(dirname -- "$timings_file")" ]; then
+	error "Invalid timings_file option: ($timings_file). The directory of the file must exist"
 fi
 
-if [ "$pylint_enabled" != 0 ] && [ "$pylint_enabled" != 1 ]; then
-	error "Invalid pylint_enabled option: ($pylint_enabled). Valid values are [0, 1]"
+if [ "$force_sync" != 0 ] && [ "$force_sync" != 1 ]; then
+	error "Invalid force_sync option: ($force_sync). Valid values are [0, 1]"
 fi
 
-if [ "$flake8_enabled" != 0 ] && [ "$flake8_enabled" != 1 ]; then
-	error "Invalid flake8_enabled option: ($flake8_enabled). Valid values are [0, 1]"
+if [ "$outdated_report" != 0 ] && [ "$outdated_report" != 1 ]; then
+	error "Invalid outdated_report option: ($outdated_report). Valid values are [0, 1]"
 fi
 
-if [ "$mypy_enabled" != 0 ] && [ "$mypy_enabled" != 1 ]; then
-	error "Invalid mypy_enabled option: ($mypy_enabled). Valid values are [0, 1]"
+if ! [[ "$outdated_report_ttl" =~ ^[0-9]+$ ]]; then
+	error "Invalid outdated_report_ttl option: ($outdated_report_ttl). Valid values are any non-negative integer"
 fi
 
-if [ "$pytest_enabled" != 0 ] && [ "$pytest_enabled" != 1 ]; then
-	error "Invalid pytest_enabled option: ($pytest_enabled). Valid values are [0, 1]"
+if ! [[ "$vscode_extensions_ttl" =~ ^[0-9]+$ ]]; then
+	error "Invalid vscode_extensions_ttl option: ($vscode_extensions_ttl). Valid values are any non-negative integer"
 fi
 
-if [ "$unittest_enabled" != 0 ] && [ "$unittest_enabled" != 1 ]; then
-	error "Invalid unittest_enabled option: ($unittest_enabled). Valid values are [0, 1]"
+if [ "$vscode_vsix_dir" != "" ] && [ ! -d "$vscode_vsix_dir" ]; then
+	error "Invalid vscode_vsix_dir option: ($vscode_vsix_dir). The directory must exist"
 fi
 
-if [ "$pre_commit_autoupdate" != 0 ] && [ "$pre_commit_autoupdate" != 1 ]; then
-	error "Invalid pre_commit_autoupdate option: ($pre_commit_autoupdate). Valid values are [0, 1]"
+if [ "$pre_commit_install_hooks" != 0 ] && [ "$pre_commit_install_hooks" != 1 ]; then
+	error "Invalid pre_commit_install_hooks option: ($pre_commit_install_hooks). Valid values are [0, 1]"
 fi
 
-if [ "$overwrite_vscode_launch" != 0 ] && [ "$overwrite_vscode_launch" != 1 ]; then
-	error "Invalid overwrite_vscode_launch option: ($overwrite_vscode_launch). Valid values are [0, 1]"
+if [ "$wheelhouse" != "" ] && [ "$fill_wheelhouse" != 1 ] && [ ! -d "$wheelhouse" ]; then
+	error "Invalid wheelhouse option: ($wheelhouse). The directory must exist, pass --fill_wheelhouse=1 to create it"
+fi
+
+if [ "$fill_wheelhouse" != 0 ] && [ "$fill_wheelhouse" != 1 ]; then
+	error "Invalid fill_wheelhouse option: ($fill_wheelhouse). Valid values are [0, 1]"
+fi
+
+if [ "$fill_wheelhouse" = 1 ] && [ "$wheelhouse" = "" ]; then
+	error "Invalid fill_wheelhouse option: ($fill_wheelhouse). --wheelhouse must be set to fill it"
+fi
+#endregion
+
+#region Setup Options
+# The options the processors use, package_manager included, are validated once by src/options.py (the only place
+# that validates them), before anything is installed. It sets them as shell variables, with flags as 0/1, and
+# exports them as JSON to every processor launched below. The project and tool environments do not exist yet, so it
+# runs with the python on the PATH, which is fine since it only uses the standard library.
+options_python=$(command -v python || command -v python3)
+if [ "$options_python" = "" ]; then
+	error "python not found. Please install python to use this setup script."
 fi
+if ! setup_options=$(cd "$script_dir" && "$options_python" -m src.options "${setup_args[@]}"); then
+	error "Invalid setup options"
+fi
+eval "$setup_options"
+#endregion
 
+#region Check Package Manager
 if [ "$package_manager" = "uv" ] || [ "$package_manager" = "uv-pip" ]; then
 	uv_installed=0
 	if command -v uv >/dev/null; then
@@ -247,7 +329,16 @@ if [ "$package_manager" = "uv" ] || [ "$package_manager" = "uv-pip" ]; then
 fi
 #endregion
 
+#region Region Timings
+# Every region below is timed, and the report is printed and/or written on exit, including when a region fails
+if [ "$timings" = 1 ] || [ "$timings_file" != "" ]; then
+	enable_region_timings
+	trap 'report_region_timings "$timings" "$timings_file"' EXIT
+fi
+#endregion
+
 #region Virtual Environment Setup
+venv_region_start=$(start_region_timer)
 if [ "$debug" = 1 ]; then
 	echo "$dash_separator Virtual Environment Setup $dash_separator"
 fi
@@ -260,22 +351,35 @@ if command -v pyenv >/dev/null; then
 	pyenv_installed=1
 fi
 
-if [ "$pyenv_installed" = 1 ]; then
+# pyenv is slow to start, so it is only used when the virtual environment has to be (re)built
+venv_reusable=0
+if [ "$rebuild_venv" = 0 ] && venv_matches_python "$venv_dir" "$python_version"; then
+	venv_reusable=1
+fi
+
+if [ "$venv_reusable" = 1 ]; then
+	if [ "$debug" = 1 ]; then
+		echo "Reusing existing virtual environment at $venv_dir, it already uses python $python_version"
+	fi
+
+	# What `pyenv local` would have written, the interpreter is installed since the virtual environment uses it
+	if [ "$(cat .python-version 2>/dev/null)" != "$python_version" ]; then
+		printf '%s\n' "$python_version" >.python-version
+	fi
+elif [ "$pyenv_installed" = 1 ]; then
 	eval "$(pyenv init - bash)"
 
 	pyenv install -s "$python_version"
 	pyenv local "$python_version"
 
 	rebuild_reason=""
-	if [ "$package_manager" = "pip" ]; then
-		# We have to always delete the environment if using pip as package manager since it doesn't
-		# provide a way to synchronize the dependencies within the virtual environment like pip-tools or poetry
-		# We provide an option flag rebuild_venv to force delete the environment if using poetry or pip-tools
-		rebuild_reason="pip package manager requires a clean virtual environment"
-	elif [ "$rebuild_venv" = 1 ]; then
+	venv_python_version=$(venv_python_version "$venv_dir")
+	if [ "$rebuild_venv" = 1 ]; then
 		rebuild_reason="--rebuild_venv is enabled"
 	elif [ ! -x "$venv_python_path" ] || [ ! -f "$venv_activate_path" ]; then
 		rebuild_reason="virtual environment is missing or incomplete"
+	elif ! python_version_matches "$venv_python_version" "$python_version"; then
+		rebuild_reason="virtual environment uses python $venv_python_version instead of $python_version"
 	fi
 
 	if [ "$rebuild_reason" != "" ]; then
@@ -299,34 +403,6 @@ if [ "$pyenv_installed" = 1 ]; then
 	elif [ "$debug" = 1 ]; then
 		echo "Reusing existing virtual environment at $venv_dir"
 	fi
-
-	if [ ! -f "$venv_activate_path" ]; then
-		echo "python -m venv failed to create a virtual environment for this project."
-		echo "Expected activation script was not found at $venv_activate_path."
-		echo "Please try the setup script again."
-		exit 1
-	fi
-
-	# shellcheck disable=SC1090
-	source "$venv_activate_path"
-
-	venv_python=$(command -v python)
-	echo "venv_python: $venv_python"
-	if [ "$venv_python" = "" ] || [ "$venv_python" != "$venv_python_path" ]; then
-		echo "The project virtual environment failed to activate from $venv_dir."
-		echo ""
-		echo "Possible reasons include:"
-		echo "    - The activation script did not update your shell PATH as expected."
-		echo "    - The virtual environment already exists and is linked to a different python version."
-		echo "        - In this case run ./setup 1 to force a rebuild of the virtual environment."
-		echo "    - The requested python version could not create virtual environments on this system."
-		echo "Please try the setup script again."
-		exit 1
-	fi
-
-	if [ "$package_manager" = "poetry" ]; then
-		export POETRY_VIRTUALENVS_IN_PROJECT=true
-	fi
 else
 	echo "pyenv not installed! Please install pyenv to use this setup script."
 	echo "To Install run the following command using brew:"
@@ -336,232 +412,281 @@ else
 	echo "Exiting..."
 	exit 1
 fi
-echo ""
-#endregion
 
-#region Install Dependencies
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator Installing Dependencies $dash_separator"
+if [ ! -f "$venv_activate_path" ]; then
+	echo "python -m venv failed to create a virtual environment for this project."
+	echo "Expected activation script was not found at $venv_activate_path."
+	echo "Please try the setup script again."
+	exit 1
 fi
 
-# Install Common Dependencies
-if [ "$package_manager" != "uv" ] && [ "$package_manager" != "uv-pip" ]; then
-	python -m pip install --upgrade pip
-	pip install --upgrade setuptools
-	pip install wheel
+# shellcheck disable=SC1090
+source "$venv_activate_path"
 
-	if [ -f "tox.ini" ]; then
-		pip install tox
-	fi
+venv_python=$(command -v python)
+echo "venv_python: $venv_python"
+if [ "$venv_python" = "" ] || [ "$venv_python" != "$venv_python_path" ]; then
+	echo "The project virtual environment failed to activate from $venv_dir."
+	echo ""
+	echo "Possible reasons include:"
+	echo "    - The activation script did not update your shell PATH as expected."
+	echo "    - The virtual environment already exists and is linked to a different python version."
+	echo "        - In this case run ./setup 1 to force a rebuild of the virtual environment."
+	echo "    - The requested python version could not create virtual environments on this system."
+	echo "Please try the setup script again."
+	exit 1
 fi
 
-# Install requirements
-req_installed=0
-if [ "$package_manager" = "pip" ]; then
-	if [ -f "requirements-dev.txt" ]; then
-		pip install -r requirements-dev.txt
-		req_installed=1
-	elif [ -f "requirements-test.txt" ]; then
-		pip install -r requirements-test.txt
-		req_installed=1
-	fi
+if [ "$package_manager" = "poetry" ]; then
+	export POETRY_VIRTUALENVS_IN_PROJECT=true
+fi
+record_region_timing virtual_environment "$venv_region_start" 0 0
+echo ""
+#endregion
 
-	# if no test or dev files, check for regular requirements
-	if [ "$req_installed" = "0" ] && [ -f "requirements.txt" ]; then
-		pip install -r requirements.txt
-		req_installed=1
+#region Wheelhouse
+function with_wheelhouse() {
+	# with_wheelhouse <command...>
+	# Run a pip or uv install of the setup so that it resolves from the wheelhouse only, when there is one. The
+	# variables are only set for that command, so pre-commit and the after setup script keep using the index.
+	if [ "$wheelhouse" = "" ]; then
+		"$@"
+		return
+	fi
+	PIP_NO_INDEX=1 PIP_FIND_LINKS="$wheelhouse" UV_NO_INDEX=1 UV_FIND_LINKS="$wheelhouse" "$@"
+}
+
+if [ "$wheelhouse" != "" ]; then
+	if [ "$fill_wheelhouse" = 1 ]; then
+		echo "Downloading the packages the setup installs to $wheelhouse"
+		if ! fill_wheelhouse "$wheelhouse" "$package_manager" "$script_dir/scripts/tool-requirements.txt"; then
+			error "Failed to fill the wheelhouse at $wheelhouse"
+		fi
+		echo ""
 	fi
-elif [ "$package_manager" = "pip-tools" ]; then
-	pip install --upgrade pip-tools
 
-	[ -f "requirements-dev.txt" ] && dev_requirements=1 || dev_requirements=0
-	[ -f "requirements-test.txt" ] && test_requirements=1 || test_requirements=0
-	[ -f "requirements.txt" ] && requirements=1 || requirements=0
+	wheelhouse=$(cd "$wheelhouse" && pwd)
+fi
+#endregion
 
-	if [ "$dev_requirements" = 1 ] && [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		pip-sync requirements-dev.txt requirements-test.txt requirements.txt
-		req_installed=1
-	elif [ "$dev_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		pip-sync requirements-dev.txt requirements.txt
-		req_installed=1
+#region Install Dependencies
+function setup_dependencies() {
+	local install_fingerprint
+	local install_fingerprint_path="$venv_dir/.urs-install-fingerprint"
+	local install_status=0
 
-	elif [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		pip-sync requirements-test.txt requirements.txt
-		req_installed=1
-	elif [ "$requirements" = 1 ]; then
-		pip-sync requirements.txt
-		req_installed=1
+	if [ "$debug" = 1 ]; then
+		echo "$dash_separator Installing Dependencies $dash_separator"
 	fi
-elif [ "$package_manager" = "uv-pip" ]; then
-	[ -f "requirements-dev.txt" ] && dev_requirements=1 || dev_requirements=0
-	[ -f "requirements-test.txt" ] && test_requirements=1 || test_requirements=0
-	[ -f "requirements.txt" ] && requirements=1 || requirements=0
 
-	if [ "$dev_requirements" = 1 ] && [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		uv pip sync requirements-dev.txt requirements-test.txt requirements.txt
-		req_installed=1
-	elif [ "$dev_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		uv pip sync requirements-dev.txt requirements.txt
-		req_installed=1
-	elif [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
-		uv pip sync requirements-test.txt requirements.txt
-		req_installed=1
-	elif [ "$requirements" = 1 ]; then
-		uv pip sync requirements.txt
-		req_installed=1
+	# The fingerprint is stored inside the virtual environment, so a rebuilt environment always installs again
+	install_fingerprint=$(dependency_fingerprint "$package_manager" "$venv_dir")
+	if [ "$force_sync" != 1 ] && [ -f "$install_fingerprint_path" ] &&
+		[ "$(cat "$install_fingerprint_path")" = "$install_fingerprint" ]; then
+		echo "Dependencies are up to date, skipping the $package_manager install. Use --force_sync=1 to install anyway."
+		setup_outdated_report
+		echo ""
+		return 0
 	fi
-elif [ "$package_manager" = "poetry" ]; then
-	[ -f "pyproject.toml" ] && py_project_toml=1 || py_project_toml=0
+	rm -f "$install_fingerprint_path"
 
-	if [ "$py_project_toml" = 0 ]; then
-		error "pyproject.toml not found. Cannot install requirements via Poetry"
-	fi
+	# Install Common Dependencies
+	if [ "$package_manager" != "uv" ] && [ "$package_manager" != "uv-pip" ]; then
+		with_wheelhouse python -m pip install --upgrade pip
+		with_wheelhouse pip install --upgrade setuptools
+		with_wheelhouse pip install wheel
 
-	if [ "$debug" = 1 ]; then
-		echo "Found pyproject.toml. Installing requirements via Poetry"
+		if [ -f "tox.ini" ]; then
+			with_wheelhouse pip install tox
+		fi
 	fi
 
-	poetry sync
-	echo "Calling poetry show -o to list outdated packages"
-	poetry show -o
-	echo "Consider running poetry update and using poetry show -o to update your packages."
-	req_installed=1
-elif [ "$package_manager" = "uv" ]; then
-	[ -f "pyproject.toml" ] && py_project_toml=1 || py_project_toml=0
+	# Install requirements
+	req_installed=0
+	if [ "$package_manager" = "pip" ]; then
+		# pip has no sync command, pip_sync.py installs what is missing or outdated and uninstalls extras instead
+		if [ -f "requirements-dev.txt" ]; then
+			with_wheelhouse python "$script_dir/src/pip_sync.py" requirements-dev.txt || install_status=$?
+			req_installed=1
+		elif [ -f "requirements-test.txt" ]; then
+			with_wheelhouse python "$script_dir/src/pip_sync.py" requirements-test.txt || install_status=$?
+			req_installed=1
+		fi
 
-	if [ "$py_project_toml" = 0 ]; then
-		error "pyproject.toml not found. Cannot install requirements via uv"
-	fi
+		# if no test or dev files, check for regular requirements
+		if [ "$req_installed" = "0" ] && [ -f "requirements.txt" ]; then
+			with_wheelhouse python "$script_dir/src/pip_sync.py" requirements.txt || install_status=$?
+			req_installed=1
+		fi
+	elif [ "$package_manager" = "pip-tools" ]; then
+		with_wheelhouse pip install --upgrade pip-tools
+
+		[ -f "requirements-dev.txt" ] && dev_requirements=1 || dev_requirements=0
+		[ -f "requirements-test.txt" ] && test_requirements=1 || test_requirements=0
+		[ -f "requirements.txt" ] && requirements=1 || requirements=0
+
+		if [ "$dev_requirements" = 1 ] && [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse pip-sync requirements-dev.txt requirements-test.txt requirements.txt || install_status=$?
+			req_installed=1
+		elif [ "$dev_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse pip-sync requirements-dev.txt requirements.txt || install_status=$?
+			req_installed=1
+
+		elif [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse pip-sync requirements-test.txt requirements.txt || install_status=$?
+			req_installed=1
+		elif [ "$requirements" = 1 ]; then
+			with_wheelhouse pip-sync requirements.txt || install_status=$?
+			req_installed=1
+		fi
+	elif [ "$package_manager" = "uv-pip" ]; then
+		[ -f "requirements-dev.txt" ] && dev_requirements=1 || dev_requirements=0
+		[ -f "requirements-test.txt" ] && test_requirements=1 || test_requirements=0
+		[ -f "requirements.txt" ] && requirements=1 || requirements=0
+
+		if [ "$dev_requirements" = 1 ] && [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse uv pip sync requirements-dev.txt requirements-test.txt requirements.txt || install_status=$?
+			req_installed=1
+		elif [ "$dev_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse uv pip sync requirements-dev.txt requirements.txt || install_status=$?
+			req_installed=1
+		elif [ "$test_requirements" = 1 ] && [ "$requirements" = 1 ]; then
+			with_wheelhouse uv pip sync requirements-test.txt requirements.txt || install_status=$?
+			req_installed=1
+		elif [ "$requirements" = 1 ]; then
+			with_wheelhouse uv pip sync requirements.txt || install_status=$?
+			req_installed=1
+		fi
+	elif [ "$package_manager" = "poetry" ]; then
+		[ -f "pyproject.toml" ] && py_project_toml=1 || py_project_toml=0
 
-	if [ "$debug" = 1 ]; then
-		echo "Found pyproject.toml. Installing requirements via uv"
+		if [ "$py_project_toml" = 0 ]; then
+			error "pyproject.toml not found. Cannot install requirements via Poetry"
+		fi
+
+		if [ "$debug" = 1 ]; then
+			echo "Found pyproject.toml. Installing requirements via Poetry"
+		fi
+
+		poetry sync || install_status=$?
+		req_installed=1
+	elif [ "$package_manager" = "uv" ]; then
+		[ -f "pyproject.toml" ] && py_project_toml=1 || py_project_toml=0
+
+		if [ "$py_project_toml" = 0 ]; then
+			error "pyproject.toml not found. Cannot install requirements via uv"
+		fi
+
+		if [ "$debug" = 1 ]; then
+			echo "Found pyproject.toml. Installing requirements via uv"
+		fi
+
+		with_wheelhouse uv sync || install_status=$?
+		req_installed=1
 	fi
+	# No need for an else statement since we validate inputs above
 
-	uv sync
-	req_installed=1
-fi
-# No need for an else statement since we validate inputs above
+	# if no requirements files, check for setup.py
+	if [ "$req_installed" = "0" ] && [ -f "setup.py" ]; then
+		if [ "$package_manager" = "poetry" ] || [ "$package_manager" = "uv" ]; then
+			# Poetry and uv native project support both depend on pyproject.toml
+			error "$package_manager does not support setup.py files. Please use a pyproject.toml file instead for $package_manager support"
+		fi
 
-# if no requirements files, check for setup.py
-if [ "$req_installed" = "0" ] && [ -f "setup.py" ]; then
-	if [ "$package_manager" = "poetry" ] || [ "$package_manager" = "uv" ]; then
-		# Poetry and uv native project support both depend on pyproject.toml
-		error "$package_manager does not support setup.py files. Please use a pyproject.toml file instead for $package_manager support"
+		if [ "$package_manager" = "uv-pip" ]; then
+			with_wheelhouse uv pip install -e . || install_status=$?
+		else
+			with_wheelhouse pip install -e . || install_status=$?
+		fi
+		req_installed=1
 	fi
 
-	if [ "$package_manager" = "uv-pip" ]; then
-		uv pip install -e .
-	else
-		pip install -e .
+	if [ "$req_installed" = "0" ]; then
+		error "ERROR: Unable to install any dependencies! Consider adding a requirements-dev.txt, requirements-test.txt, requirements.txt, and/or pyproject.toml. setup.py works as well but is experimental."
 	fi
-	req_installed=1
-fi
 
-if [ "$req_installed" = "0" ]; then
-	error "ERROR: Unable to install any dependencies! Consider adding a requirements-dev.txt, requirements-test.txt, requirements.txt, and/or pyproject.toml. setup.py works as well but is experimental."
-fi
+	if [ "$install_status" = 0 ]; then
+		printf '%s\n' "$install_fingerprint" >"$install_fingerprint_path"
+	else
+		echo "Installing the dependencies failed with status $install_status, the next run will install them again"
+	fi
 
-echo ""
+	setup_outdated_report
+	echo ""
+}
 #endregion
 
-#region Setup Prettier .prettierrc
-[ ! -f ".prettierrc" ] && prettierrc_exists=0 || prettierrc_exists=1
-
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator .prettierrc Setup $dash_separator"
-fi
+#region Outdated Package Report
+outdated_report_file="$venv_dir/.urs-outdated-report"
 
-if ! ruamel_yaml_clib_installed=$(find_site_distribution ruamel.yaml.clib); then
-	error "Failed to determine whether ruamel.yaml.clib is installed"
-fi
-if ! ruamel_yaml_installed=$(find_site_package ruamel.yaml ruamel.yaml); then
-	error "Failed to locate or temporarily install ruamel.yaml"
-fi
-python "$script_dir"/setup_prettierrc.py "$@" --exists="$prettierrc_exists"
-uninstall_site_package ruamel.yaml "$ruamel_yaml_installed"
-uninstall_site_package ruamel.yaml.clib "$ruamel_yaml_clib_installed"
-prettier_format .prettierrc
-
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
+function setup_outdated_report() {
+	# `poetry show -o` queries the package index for every dependency, so it runs in the background and its output
+	# is reused for --outdated_report_ttl hours, or until poetry.lock changes
+	if [ "$outdated_report" = 1 ] && [ "$package_manager" = "poetry" ]; then
+		start_outdated_report "$outdated_report_file" "$outdated_report_ttl" poetry.lock poetry show -o
+	fi
+}
 #endregion
 
-#region pre-commit Setup
-[ ! -f ".pre-commit-config.yaml" ] && pre_commit_config_exists=0 || pre_commit_config_exists=1
+#region Generate Config Files
+function run_config_processors() {
+	local tool_python
+	local config_status=0
 
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator .pre-commit-config.yaml Setup $dash_separator"
-fi
+	# The processors run with a cached tool environment so that their dependencies never have to be installed into
+	# (and removed from) the project's virtual environment. It is rebuilt only when tool-requirements.txt changes.
+	if ! tool_python=$(with_wheelhouse ensure_tool_venv "$script_dir/scripts/tool-requirements.txt"); then
+		error "Failed to build the utility-repo-scripts tool environment"
+	fi
 
-if ! ruamel_yaml_clib_installed=$(find_site_distribution ruamel.yaml.clib); then
-	error "Failed to determine whether ruamel.yaml.clib is installed"
-fi
-if ! ruamel_yaml_installed=$(find_site_package ruamel.yaml ruamel.yaml); then
-	error "Failed to locate or temporarily install ruamel.yaml"
-fi
-python "$script_dir"/setup_pre_commit_config.py "$@" --exists="$pre_commit_config_exists"
-uninstall_site_package ruamel.yaml "$ruamel_yaml_installed"
-uninstall_site_package ruamel.yaml.clib "$ruamel_yaml_clib_installed"
-prettier_format .pre-commit-config.yaml
+	# The processors run in a single interpreter. It is launched from $script_dir so that `src` always resolves
+	# to this repository, even when the project being set up has a top-level src package of its own.
+	# Processors whose files and options did not change since the last run are skipped using .venv/.urs-cache.json.
+	(cd "$script_dir" && "$tool_python" -m src --project_dir="$current_dir" "$@") || config_status=$?
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
-#endregion
+	if [ "$config_status" != 0 ]; then
+		error "Failed to generate one or more config files"
+	fi
+}
 
-#region pyproject.toml Setup
-[ ! -f "pyproject.toml" ] && pyproject_toml_exists=0 || pyproject_toml_exists=1
+function setup_pyproject_toml() {
+	if [ "$debug" = 1 ]; then
+		echo "$dash_separator Generate pyproject.toml $dash_separator"
+	fi
 
-if ! tomlkit_installed=$(find_site_package tomlkit tomlkit); then
-	error "Failed to locate or temporarily install tomlkit"
-fi
-python "$script_dir"/setup_pyproject_toml.py "$@" --exists="$pyproject_toml_exists"
-uninstall_site_package tomlkit "$tomlkit_installed"
+	run_config_processors --steps=pyproject_toml
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
-#endregion
+	if [ "$debug" = 1 ]; then
+		echo ""
+	fi
+}
 
-#region pylintrc Setup
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator Setup $pylintrc_filename $dash_separator"
-fi
+function setup_config_files() {
+	if [ "$debug" = 1 ]; then
+		echo "$dash_separator Generate Config Files $dash_separator"
+	fi
 
-if ! configupdater_installed=$(find_site_package configupdater configupdater); then
-	error "Failed to locate or temporarily install configupdater"
-fi
-[ ! -f "$pylintrc_filename" ] && pylintrc_exists=0 || pylintrc_exists=1
-python "$script_dir"/setup_pylintrc.py "$@" --exists="$pylintrc_exists"
-uninstall_site_package configupdater "$configupdater_installed"
-remove_trailing_whitespace "$pylintrc_filename"
+	run_config_processors --skip_steps=pyproject_toml
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
+	if [ "$debug" = 1 ]; then
+		echo ""
+	fi
+}
 #endregion
 
-#region .flake8 Setup
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator Setup .flake8 $dash_separator"
-fi
+#region pre-commit
+pre_commit_install_hooks_status_file="$venv_dir/.urs-pre-commit-install-hooks.status"
+pre_commit_install_hooks_log_file="$venv_dir/.urs-pre-commit-install-hooks.log"
 
-if ! configupdater_installed=$(find_site_package configupdater configupdater); then
-	error "Failed to locate or temporarily install configupdater"
-fi
-[ ! -f ".flake8" ] && flake8_exists=0 || flake8_exists=1
-python "$script_dir"/setup_flake8.py "$@" --exists="$flake8_exists"
-uninstall_site_package configupdater "$configupdater_installed"
-remove_trailing_whitespace .flake8
+function setup_pre_commit() {
+	local tool_python
+	local config_status=0
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
-#endregion
+	if [ ! -f ".pre-commit-config.yaml" ]; then
+		return 0
+	fi
 
-#region Install pre-commit hooks
-if [ -f ".pre-commit-config.yaml" ]; then
+	# Install pre-commit hooks
 	if [ "$debug" = 1 ]; then
 		echo "$dash_separator pre-commit install $dash_separator"
 	fi
@@ -569,151 +694,183 @@ if [ -f ".pre-commit-config.yaml" ]; then
 	if [ "$debug" = 1 ]; then
 		echo ""
 	fi
-fi
-#endregion
 
-#region pre-commit autoupdate
-if [ -f ".pre-commit-config.yaml" ] && [ "$pre_commit_autoupdate" = 1 ]; then
-	if [ "$debug" = 1 ]; then
-		echo "$dash_separator pre-commit autoupdate $dash_separator"
-	fi
-	pre-commit autoupdate
-	if [ "$debug" = 1 ]; then
+	# pre-commit autoupdate
+	if [ "$pre_commit_autoupdate" = 1 ]; then
+		if [ "$debug" = 1 ]; then
+			echo "$dash_separator pre-commit autoupdate $dash_separator"
+		fi
+		pre-commit autoupdate
+		if [ "$debug" = 1 ]; then
+			echo ""
+		fi
+	elif [ "$debug" = 1 ]; then
+		echo "Skipping pre-commit autoupdate because --pre_commit_autoupdate is disabled"
 		echo ""
 	fi
-elif [ -f ".pre-commit-config.yaml" ] && [ "$debug" = 1 ]; then
-	echo "Skipping pre-commit autoupdate because --pre_commit_autoupdate is disabled"
-	echo ""
-fi
-#endregion
 
-#region Fix Prettier pre-commit hook
-if [ "$include_prettier" = 1 ]; then
-	if [ "$debug" = 1 ]; then
-		echo "$dash_separator .pre-commit-config.yaml Setup $dash_separator"
+	# The tool environment was built by setup_pyproject_toml, this only looks it up
+	if ! tool_python=$(with_wheelhouse ensure_tool_venv "$script_dir/scripts/tool-requirements.txt"); then
+		error "Failed to build the utility-repo-scripts tool environment"
 	fi
 
-	[ ! -f ".pre-commit-config.yaml" ] && pre_commit_config_exists=0 || pre_commit_config_exists=1
+	# Fix Prettier pre-commit hook
+	# The config processors already pinned the prettier rev, it only has to be pinned again after an autoupdate
+	if [ "$include_prettier" = 1 ] && [ "$pre_commit_autoupdate" = 1 ]; then
+		if [ "$debug" = 1 ]; then
+			echo "$dash_separator .pre-commit-config.yaml Setup $dash_separator"
+		fi
 
-	if ! ruamel_yaml_clib_installed=$(find_site_distribution ruamel.yaml.clib); then
-		error "Failed to determine whether ruamel.yaml.clib is installed"
-	fi
-	if ! ruamel_yaml_installed=$(find_site_package ruamel.yaml ruamel.yaml); then
-		error "Failed to locate or temporarily install ruamel.yaml"
-	fi
-	python "$script_dir"/setup_fix_prettier_pre_commit.py "$@" --pre_commit_config_exists="$pre_commit_config_exists"
-	uninstall_site_package ruamel.yaml "$ruamel_yaml_installed"
-	uninstall_site_package ruamel.yaml.clib "$ruamel_yaml_clib_installed"
-	prettier_format .pre-commit-config.yaml
+		(cd "$script_dir" && "$tool_python" -m src --project_dir="$current_dir" --steps=fix_prettier_pre_commit) || config_status=$?
 
-	if [ "$debug" = 1 ]; then
+		if [ "$debug" = 1 ]; then
+			echo ""
+		fi
+	elif [ "$include_prettier" != 1 ] && [ "$debug" = 1 ]; then
+		echo "Skipping Prettier pre-commit hook fix because --include_prettier is disabled"
 		echo ""
 	fi
-elif [ "$debug" = 1 ]; then
-	echo "Skipping Prettier pre-commit hook fix because --include_prettier is disabled"
-	echo ""
-fi
-#endregion
 
-#region VS Code Settings
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator VS Code settings.json $dash_separator"
-fi
+	if [ "$config_status" != 0 ]; then
+		error "Failed to generate one or more config files"
+	fi
 
-[ ! -f ".vscode/settings.json" ] && vscode_settings_exist=0 || vscode_settings_exist=1
-mkdir -p .vscode
-python "$script_dir"/setup_vscode_settings.py "$@" --exists="$vscode_settings_exist"
-json_sort .vscode/settings.json
-prettier_format .vscode/settings.json
+	# `pre-commit install` only installs the git hook, the first commit would build every hook environment otherwise
+	if [ "$pre_commit_install_hooks" = 1 ]; then
+		start_pre_commit_install_hooks "$pre_commit_install_hooks_status_file" "$pre_commit_install_hooks_log_file"
+	fi
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
+	# Record the files again after pre-commit autoupdate so that the next run can skip every unchanged processor
+	if ! (cd "$script_dir" && "$tool_python" -m src --project_dir="$current_dir" --record_cache); then
+		echo "Failed to record the config file cache, the next run will regenerate every config file"
+	fi
+}
 #endregion
 
 #region VS Code Launch
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator VS Code launch.json $dash_separator"
-fi
+function setup_vscode_launch() {
+	if [ "$debug" = 1 ]; then
+		echo "$dash_separator VS Code launch.json $dash_separator"
+	fi
 
-ensure_vscode_launch_file ".vscode/launch.sample.json" ".vscode/launch.json" "$overwrite_vscode_launch" "$debug"
+	ensure_vscode_launch_file ".vscode/launch.sample.json" ".vscode/launch.json" "$overwrite_vscode_launch" "$debug"
 
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
+	if [ "$debug" = 1 ]; then
+		echo ""
+	fi
+}
 #endregion
 
 #region VS Code Extensions
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator VS Code Extensions $dash_separator"
-fi
-
-if command -v code >/dev/null; then
+function setup_vscode_extensions() {
 	if [ "$debug" = 1 ]; then
-		echo "Installing VSCode Extensions"
+		echo "$dash_separator VS Code Extensions $dash_separator"
 	fi
 
-	installed_extensions=$(code --list-extensions)
+	if command -v code >/dev/null; then
+		if [ "$debug" = 1 ]; then
+			echo "Installing VSCode Extensions"
+		fi
 
-	install_vscode_Extension_if_not_installed ms-python.python "$installed_extensions"
-	install_vscode_Extension_if_not_installed ms-python.vscode-pylance "$installed_extensions"
-	install_vscode_Extension_if_not_installed editorconfig.editorconfig "$installed_extensions"
-	install_vscode_Extension_if_not_installed streetsidesoftware.code-spell-checker "$installed_extensions"
-	install_vscode_Extension_if_not_installed esbenp.prettier-vscode "$installed_extensions"
-	install_vscode_Extension_if_not_installed ms-python.isort "$installed_extensions"
-	install_vscode_Extension_if_not_installed ms-python.pylint "$installed_extensions"
-	install_vscode_Extension_if_not_installed ms-python.flake8 "$installed_extensions"
+		local extensions_cache_file="${UTILITY_REPO_SCRIPTS_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/utility-repo-scripts}/vscode-extensions.txt"
+		local installed_extensions
+		local extensions=(
+			ms-python.python
+			ms-python.vscode-pylance
+			editorconfig.editorconfig
+			streetsidesoftware.code-spell-checker
+			esbenp.prettier-vscode
+			ms-python.isort
+			ms-python.pylint
+			ms-python.flake8
+		)
+
+		if [ "$python_formatter" = "black" ]; then
+			extensions+=(ms-python.black-formatter)
+		elif [ "$python_formatter" = "autopep8" ]; then
+			extensions+=(ms-python.autopep8)
+		fi
 
-	if [ "$python_formatter" = "black" ]; then
-		install_vscode_Extension_if_not_installed ms-python.black-formatter "$installed_extensions"
-	elif [ "$python_formatter" = "autopep8" ]; then
-		install_vscode_Extension_if_not_installed ms-python.autopep8 "$installed_extensions"
+		installed_extensions=$(list_vscode_extensions "$extensions_cache_file" "$vscode_extensions_ttl")
+		if install_vscode_extensions "$installed_extensions" "$vscode_vsix_dir" "${extensions[@]}"; then
+			# Keep the cached inventory in sync so the next setup within the ttl does not install them again
+			printf '%s\n' "$installed_extensions" "${extensions[@]}" | sort -fu >"$extensions_cache_file"
+		else
+			rm -f "$extensions_cache_file"
+		fi
+	else
+		# VS Code Not Found
+		if [ "$debug" = 1 ]; then
+			echo "The code command was not found, skipping VSCode settings..."
+			echo "To install VSCode, see https://code.visualstudio.com/download"
+			echo "If you have VSCode installed, make sure it is in your Applications folder, if on Mac, or in your PATH on Windows/Linux/Mac"
+			echo "To add the code command to your path, see https://code.visualstudio.com/docs/setup/mac#_launching-from-the-command-line"
+		fi
 	fi
-else
-	# VS Code Not Found
+
 	if [ "$debug" = 1 ]; then
-		echo "The code command was not found, skipping VSCode settings..."
-		echo "To install VSCode, see https://code.visualstudio.com/download"
-		echo "If you have VSCode installed, make sure it is in your Applications folder, if on Mac, or in your PATH on Windows/Linux/Mac"
-		echo "To add the code command to your path, see https://code.visualstudio.com/docs/setup/mac#_launching-from-the-command-line"
+		echo ""
 	fi
-fi
-
-if [ "$debug" = 1 ]; then
-	echo ""
-fi
+}
 #endregion
 
 #region Custom after setup script
-if [ "$debug" = 1 ]; then
-	echo "$dash_separator Custom After Setup Script $dash_separator"
-fi
+function setup_after_setup_script() {
+	if [ "$debug" = 1 ]; then
+		echo "$dash_separator Custom After Setup Script $dash_separator"
+	fi
 
-custom_script_name=".python_after_setup.sh"
-if [ -f "$HOME/$custom_script_name" ]; then
-	echo "Running custom after setup script: $HOME/$custom_script_name"
-	echo "Update this script to customize your virtual environments after creation"
-	"$HOME"/$custom_script_name
-else
-	echo "No custom after setup script was found at $HOME/$custom_script_name found. The script will be created..."
-	echo "Update this script to customize your virtual environments after creation"
-	{
-		echo "#!$SHELL"
-		echo "# This script will run after the setup script in your python repos"
-		echo "# Update this script to add extra python packages that you may need for your environment"
-		echo "# such as common editor packages"
+	custom_script_name=".python_after_setup.sh"
+	if [ -f "$HOME/$custom_script_name" ]; then
+		echo "Running custom after setup script: $HOME/$custom_script_name"
+		echo "Update this script to customize your virtual environments after creation"
+		"$HOME"/$custom_script_name
+	else
+		echo "No custom after setup script was found at $HOME/$custom_script_name found. The script will be created..."
+		echo "Update this script to customize your virtual environments after creation"
+		{
+			echo "#!$SHELL"
+			echo "# This script will run after the setup script in your python repos"
+			echo "# Update this script to add extra python packages that you may need for your environment"
+			echo "# such as common editor packages"
+			echo ""
+			echo "# pip install package1 package2"
+		} >>"$HOME"/$custom_script_name
+		chmod u+x "$HOME"/$custom_script_name
+	fi
+
+	if [ "$debug" = 1 ]; then
 		echo ""
-		echo "# pip install package1 package2"
-	} >>"$HOME"/$custom_script_name
-	chmod u+x "$HOME"/$custom_script_name
-fi
+	fi
+}
+#endregion
 
-if [ "$debug" = 1 ]; then
-	echo ""
+#region Run Setup Regions
+# Regions that do not depend on each other run concurrently, each with its output buffered and printed with a
+# [region] prefix once it finishes. --parallel=0 runs them one after the other in this order instead. The
+# pyproject.toml processor can rewrite pyproject.toml, so the dependencies are installed (and fingerprinted) after it,
+# while the other config files are generated at the same time. Both of them use the tool environment it builds.
+schedule_region pyproject_toml setup_pyproject_toml
+schedule_region config_files setup_config_files pyproject_toml
+schedule_region dependencies setup_dependencies pyproject_toml
+schedule_region pre_commit setup_pre_commit dependencies config_files
+schedule_region vscode_launch setup_vscode_launch
+schedule_region vscode_extensions setup_vscode_extensions
+schedule_region after_setup setup_after_setup_script dependencies
+
+if ! run_scheduled_regions "$parallel"; then
+	error "Project setup failed"
 fi
 #endregion
 
 #region Print out the final message
+if [ "$outdated_report" = 1 ] && [ "$package_manager" = "poetry" ]; then
+	print_outdated_report "$outdated_report_file" "Consider running poetry update and using poetry show -o to update your packages."
+	echo ""
+fi
+if [ "$pre_commit_install_hooks" = 1 ]; then
+	print_pre_commit_install_hooks_status "$pre_commit_install_hooks_status_file" "$pre_commit_install_hooks_log_file"
+fi
 echo "$dash_separator Project setup complete $dash_separator"
 echo "Run 'source .venv/bin/activate' to activate your virtual environment."
 #endregion
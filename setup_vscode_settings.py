@@ -2,6 +2,7 @@
 
 from argparse import ArgumentParser
 
+from src.constants.shared import DEFAULT_LINE_LENGTH
 from src.constants.vscode_settings import SAMPLE_VSCODE_SETTINGS, VSCODE_SETTINGS_JSON_FILENAME
 from src.process_vscode_settings import process_vscode_settings
 from src.utils.core import load_json_file, str2bool
@@ -18,6 +19,7 @@ def main(  # pylint: disable=too-many-positional-arguments
     unittest_enabled: bool = False,
     test: bool = False,
     exists: bool = False,
+    line_length: int = DEFAULT_LINE_LENGTH,
 ):
     # pylint: disable=too-many-arguments, too-many-locals
     """Do processing of the .vscode/settings.json file."""
@@ -36,6 +38,7 @@ def main(  # pylint: disable=too-many-positional-arguments
         mypy_enabled=mypy_enabled,
         pytest_enabled=pytest_enabled,
         unittest_enabled=unittest_enabled,
+        line_length=line_length,
     )
 
 
@@ -51,6 +54,7 @@ if __name__ == "__main__":
     parser.add_argument("--unittest_enabled", nargs="?", const=True, default=False, type=str2bool)
     parser.add_argument("--test", action="store_true")
     parser.add_argument("--exists", type=str2bool, default=False)
+    parser.add_argument("--line_length", default=DEFAULT_LINE_LENGTH, type=int)
     args, unknown = parser.parse_known_args()
 
     main(
@@ -64,4 +68,5 @@ if __name__ == "__main__":
         unittest_enabled=args.unittest_enabled,
         test=args.test,
         exists=args.exists,
+        line_length=args.line_length,
     )
@@ -0,0 +1,9 @@
+"""Allow running the config processors with `python -m src` and `python -m src fleet`."""
+
+import sys
+
+from src import cli, fleet
+
+if sys.argv[1:2] == ["fleet"]:
+    sys.exit(fleet.main(sys.argv[2:]))
+sys.exit(cli.main())
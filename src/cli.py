@@ -0,0 +1,299 @@
+"""Run every config processor in a single interpreter."""
+
+import os
+import traceback
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.constants.flake8 import FLAKE8_FILENAME, SAMPLE_FLAKE8
+from src.constants.pre_commit_config import PRE_COMMIT_CONFIG_FILENAME, SAMPLE_PRE_COMMIT_CONFIG
+from src.constants.prettier import PRETTIER_FILENAME, SAMPLE_PRETTIERRC
+from src.constants.pylintrc import PYLINTRC_FILENAME, SAMPLE_PYLINTRC
+from src.constants.pyproject_toml import PYPROJECT_TOML_FILENAME, REQUIREMENTS_FILENAMES, SAMPLE_PYPROJECT_TOML
+from src.constants.vscode_settings import SAMPLE_VSCODE_SETTINGS, VSCODE_SETTINGS_JSON_FILENAME
+from src.options import OPTIONS_ENV_VAR, add_setup_options, load_options
+from src.process_flake8 import process_flake8
+from src.process_pre_commit_config import PreCommitConfigProcessor
+from src.process_prettier import process_pre_commit_config, process_prettierrc
+from src.process_pylintrc import process_pylintrc
+from src.process_pyproject_toml import PyProjectTomlProcessor
+from src.process_vscode_settings import process_vscode_settings
+from src.utils.cache import cache_enabled, compute_step_key, load_cache, save_cache
+from src.utils.configupdater import load_ini_file
+from src.utils.core import load_json_file, pop_changed_files
+from src.utils.ruamel.yaml import load_yaml_file
+from src.utils.tomlkit import load_toml_file
+
+PRETTIERRC_STEP = "prettierrc"
+PRE_COMMIT_CONFIG_STEP = "pre_commit_config"
+PYPROJECT_TOML_STEP = "pyproject_toml"
+PYLINTRC_STEP = "pylintrc"
+FLAKE8_STEP = "flake8"
+FIX_PRETTIER_PRE_COMMIT_STEP = "fix_prettier_pre_commit"
+VSCODE_SETTINGS_STEP = "vscode_settings"
+
+
+def _run_prettierrc(args: Namespace):
+    prettierrc_data = load_json_file(
+        debug=args.debug,
+        exists=Path(PRETTIER_FILENAME).exists(),
+        filename=PRETTIER_FILENAME,
+        sample=SAMPLE_PRETTIERRC,
+    )
+    process_prettierrc(debug=args.debug, test=args.test, line_length=args.line_length, prettierrc_data=prettierrc_data)
+
+
+def _run_pre_commit_config(args: Namespace):
+    pre_commit_config = load_yaml_file(
+        debug=args.debug,
+        exists=Path(PRE_COMMIT_CONFIG_FILENAME).exists(),
+        filename=PRE_COMMIT_CONFIG_FILENAME,
+        sample=SAMPLE_PRE_COMMIT_CONFIG,
+    )
+    PreCommitConfigProcessor(
+        pre_commit_config=pre_commit_config,
+        debug=args.debug,
+        test=args.test,
+        include_jumanji_house=args.include_jumanji_house,
+        include_prettier=args.include_prettier,
+        include_isort=args.include_isort,
+        python_formatter=args.python_formatter,
+        pylint_enabled=args.pylint_enabled,
+        flake8_enabled=args.flake8_enabled,
+        pre_commit_pylint_entry_prefix=args.pre_commit_pylint_entry_prefix,
+        pylint_hook_mode=args.pylint_hook_mode,
+        pylint_result_cache=args.pylint_result_cache,
+        mypy_enabled=args.mypy_enabled,
+        mypy_mode=args.mypy_mode,
+        tool_performance_profile=args.tool_performance_profile,
+    ).process_pre_commit_config()
+
+
+def _run_pyproject_toml(args: Namespace):
+    pyproject_toml = load_toml_file(
+        debug=args.debug,
+        exists=Path(PYPROJECT_TOML_FILENAME).exists(),
+        filename=PYPROJECT_TOML_FILENAME,
+        sample=SAMPLE_PYPROJECT_TOML,
+    )
+    PyProjectTomlProcessor(
+        pyproject_toml=pyproject_toml,
+        include_isort=args.include_isort,
+        python_formatter=args.python_formatter,
+        isort_profile=args.isort_profile,
+        pytest_enabled=args.pytest_enabled,
+        line_length=args.line_length,
+        package_manager=args.package_manager,
+        is_package=args.is_package,
+        mypy_enabled=args.mypy_enabled,
+        mypy_mode=args.mypy_mode,
+        tool_performance_profile=args.tool_performance_profile,
+        debug=args.debug,
+        test=args.test,
+    ).process_pyproject_toml()
+
+
+def _run_pylintrc(args: Namespace):
+    pylintrc = load_ini_file(
+        debug=args.debug,
+        exists=Path(PYLINTRC_FILENAME).exists(),
+        filename=PYLINTRC_FILENAME,
+        sample=SAMPLE_PYLINTRC,
+    )
+    process_pylintrc(
+        pylintrc=pylintrc,
+        debug=args.debug,
+        line_length=args.line_length,
+        test=args.test,
+        tool_performance_profile=args.tool_performance_profile,
+    )
+
+
+def _run_flake8(args: Namespace):
+    flake8_config = load_ini_file(
+        debug=args.debug,
+        exists=Path(FLAKE8_FILENAME).exists(),
+        filename=FLAKE8_FILENAME,
+        sample=SAMPLE_FLAKE8,
+    )
+    process_flake8(
+        flake8_config=flake8_config,
+        debug=args.debug,
+        line_length=args.line_length,
+        test=args.test,
+        tool_performance_profile=args.tool_performance_profile,
+    )
+
+
+def _run_fix_prettier_pre_commit(args: Namespace):
+    if not args.include_prettier:
+        if args.debug:
+            print("Skipping Prettier pre-commit hook fix because --include_prettier is disabled")
+        return
+
+    pre_commit_config = load_yaml_file(
+        debug=args.debug,
+        exists=Path(PRE_COMMIT_CONFIG_FILENAME).exists(),
+        filename=PRE_COMMIT_CONFIG_FILENAME,
+        sample=SAMPLE_PRE_COMMIT_CONFIG,
+    )
+    process_pre_commit_config(
+        debug=args.debug,
+        test=args.test,
+        line_length=args.line_length,
+        pre_commit_config=pre_commit_config,
+    )
+
+
+def _run_vscode_settings(args: Namespace):
+    if not args.test:  # pragma: no cover
+        os.makedirs(Path(VSCODE_SETTINGS_JSON_FILENAME).parent, exist_ok=True)  # pragma: no cover
+
+    vscode_settings = load_json_file(
+        debug=args.debug,
+        exists=Path(VSCODE_SETTINGS_JSON_FILENAME).exists(),
+        filename=VSCODE_SETTINGS_JSON_FILENAME,
+        sample=SAMPLE_VSCODE_SETTINGS,
+    )
+    process_vscode_settings(
+        vscode_settings=vscode_settings,
+        debug=args.debug,
+        test=args.test,
+        include_isort=args.include_isort,
+        python_formatter=args.python_formatter,
+        pylint_enabled=args.pylint_enabled,
+        flake8_enabled=args.flake8_enabled,
+        mypy_enabled=args.mypy_enabled,
+        pytest_enabled=args.pytest_enabled,
+        unittest_enabled=args.unittest_enabled,
+        line_length=args.line_length,
+        mypy_mode=args.mypy_mode,
+    )
+
+
+# Order matters: the prettier fix has to run after the pre-commit config has been generated
+STEPS: Dict[str, Callable[[Namespace], None]] = {
+    PRETTIERRC_STEP: _run_prettierrc,
+    PRE_COMMIT_CONFIG_STEP: _run_pre_commit_config,
+    PYPROJECT_TOML_STEP: _run_pyproject_toml,
+    PYLINTRC_STEP: _run_pylintrc,
+    FLAKE8_STEP: _run_flake8,
+    FIX_PRETTIER_PRE_COMMIT_STEP: _run_fix_prettier_pre_commit,
+    VSCODE_SETTINGS_STEP: _run_vscode_settings,
+}
+
+# The files each processor reads and writes. They are hashed to decide whether a processor can be skipped.
+STEP_FILENAMES: Dict[str, List[str]] = {
+    PRETTIERRC_STEP: [PRETTIER_FILENAME, ".prettierignore"],
+    PRE_COMMIT_CONFIG_STEP: [PRE_COMMIT_CONFIG_FILENAME],
+    PYPROJECT_TOML_STEP: [PYPROJECT_TOML_FILENAME, *REQUIREMENTS_FILENAMES],
+    PYLINTRC_STEP: [PYLINTRC_FILENAME],
+    FLAKE8_STEP: [FLAKE8_FILENAME],
+    FIX_PRETTIER_PRE_COMMIT_STEP: [PRE_COMMIT_CONFIG_FILENAME],
+    VSCODE_SETTINGS_STEP: [VSCODE_SETTINGS_JSON_FILENAME],
+}
+
+# Options that do not change what the processors generate
+CACHE_IGNORED_OPTIONS = ["debug", "test", "project_dir", "steps", "skip_steps", "no_cache", "record_cache"]
+
+
+def parse_steps(value: str) -> List[str]:
+    """Convert a comma separated list of step names to a list of steps."""
+    steps = [step.strip() for step in value.split(",") if step.strip()]
+    for step in steps:
+        if step not in STEPS:
+            raise ArgumentTypeError(f"Invalid step: {step}. Valid Options are: {list(STEPS)}")
+    return steps
+
+
+def build_parser() -> ArgumentParser:
+    """Build the argument parser shared by every processor."""
+    parser = ArgumentParser(
+        prog="python -m src", description="Generate the config files of a python project.", allow_abbrev=False
+    )
+    parser.add_argument("--test", action="store_true")
+    parser.add_argument("--project_dir", default=None, type=str)
+    parser.add_argument("--steps", default=list(STEPS), type=parse_steps)
+    parser.add_argument("--skip_steps", default=[], type=parse_steps)
+    parser.add_argument("--record_cache", action="store_true")
+    add_setup_options(parser)
+    # Options parsed and validated by setup_python_app.sh with `python -m src.options` are the defaults
+    options = os.environ.get(OPTIONS_ENV_VAR)
+    if options:
+        parser.set_defaults(**load_options(options)._asdict())
+    return parser
+
+
+def cache_options(args: Namespace) -> Dict[str, Any]:
+    """Return the options that influence the generated files."""
+    return {key: value for key, value in vars(args).items() if key not in CACHE_IGNORED_OPTIONS}
+
+
+def record_cache(args: Namespace, steps: List[str], cached_keys: Dict[str, str]):
+    """Record the current state of the files of the given steps as up to date."""
+    options = cache_options(args)
+    for step in steps:
+        cached_keys[step] = compute_step_key(step, STEP_FILENAMES[step], options)
+    save_cache(cached_keys)
+
+
+def run_steps(args: Namespace) -> int:
+    """Run the selected processors in order and return a combined exit status.
+
+    Processors whose files and options did not change since the last recorded run are skipped.
+    """
+    steps = [step for step in args.steps if step not in args.skip_steps]
+    use_cache = not args.test and not args.no_cache and cache_enabled()
+    cached_keys = load_cache() if use_cache else {}
+    if args.record_cache:
+        if use_cache:
+            record_cache(args, steps, cached_keys)
+        return 0
+
+    options = cache_options(args)
+    failed_steps: List[str] = []
+    for step in steps:
+        if use_cache and cached_keys.get(step) == compute_step_key(step, STEP_FILENAMES[step], options):
+            if args.debug:
+                print(f"Skipping {step} processor because its files and options did not change")
+            continue
+
+        if args.debug:
+            print(f"Running {step} processor")
+        try:
+            STEPS[step](args)
+        except Exception:  # pylint: disable=broad-exception-caught
+            traceback.print_exc()
+            failed_steps.append(step)
+            cached_keys.pop(step, None)
+
+    if use_cache:
+        # Keys are computed once every processor ran because some of them share files
+        record_cache(args, [step for step in steps if step not in failed_steps], cached_keys)
+
+    if failed_steps:
+        print(f"The following processors failed: {failed_steps}")
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse the CLI arguments once and run every processor."""
+    args, unknown = build_parser().parse_known_args(argv)
+    if args.debug and unknown:
+        print(f"Ignoring unknown arguments: {unknown}")
+
+    if args.project_dir is not None:
+        project_dir = str(Path(args.project_dir).resolve())
+        os.chdir(project_dir)
+        os.environ["PWD"] = project_dir
+
+    pop_changed_files()
+    status = run_steps(args)
+    changed_files = pop_changed_files()
+    if changed_files:
+        print(f"Updated {', '.join(changed_files)}")
+    elif args.debug:
+        print("All config files are up to date")
+    return status
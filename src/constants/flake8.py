@@ -3,6 +3,8 @@
 from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
 
 FLAKE8_FILENAME = ".flake8"
+FLAKE8_JOBS_KEY = "jobs"
+FLAKE8_JOBS_PERFORMANCE_VALUE = "auto"
 
 SAMPLE_FLAKE8 = f"""[flake8]
 exclude = .git,__pycache__,{REPO_NAME}
@@ -1,5 +1,6 @@
 from src.constants.shared import DEFAULT_LINE_LENGTH
+from src.utils.core import freeze
 
 PRINT_WIDTH_KEY = "printWidth"
-SAMPLE_PRETTIERRC = {PRINT_WIDTH_KEY: DEFAULT_LINE_LENGTH}
+SAMPLE_PRETTIERRC = freeze({PRINT_WIDTH_KEY: DEFAULT_LINE_LENGTH})
 PRETTIER_FILENAME = ".prettierrc"
@@ -6,6 +6,8 @@ from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
 PYLINTRC_FILENAME = ".pylintrc"
 PYLINTRC_MASTER_SECTION_KEY = "MASTER"
 PYLINTRC_MASTER_IGNORE_KEY = "ignore"
+PYLINTRC_MASTER_JOBS_KEY = "jobs"
+PYLINTRC_MASTER_JOBS_PERFORMANCE_VALUE = "0"
 PYLINTRC_FORMAT_SECTION_KEY = "FORMAT"
 PYLINTRC_FORMAT_MAX_LINE_LENGTH_KEY = "max-line-length"
 
@@ -10,8 +10,15 @@ PYPROJECT_AUTOPEP8_KEY = "autopep8"
 PYPROJECT_BLACK_KEY = "black"
 PYPROJECT_ISORT_KEY = "isort"
 PYPROJECT_PYCODESTYLE_MATCH_VALUE = ".*.py"
+PYPROJECT_MYPY_KEY = "mypy"
+# Keep the mypy daemon and incremental runs from checking the virtual environment and this repo
+PYPROJECT_MYPY_EXCLUDE_VALUE = ("^\\.venv/", f"^{REPO_NAME}/")
 PYPROJECT_PYTEST_KEY = "pytest"
 PYPROJECT_PYTEST_INI_OPTIONS_KEY = "ini_options"
+PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE = "-n auto"
+PYTEST_XDIST_DISTRIBUTION = "pytest-xdist"
+# The requirements files setup_python_app.sh installs, searched for pytest-xdist next to pyproject.toml
+REQUIREMENTS_FILENAMES = ("requirements-dev.txt", "requirements-test.txt", "requirements.txt")
 PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_VALUE = "%(asctime)s [%(levelname)8s] %(message)s (%(filename)s:%(lineno)s)"
 PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_DATE_FORMAT_VALUE = "%Y-%m-%d %H:%M:%S"
 
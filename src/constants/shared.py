@@ -6,3 +6,6 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 DEFAULT_LINE_LENGTH = 120
 REPO_NAME = "utility-repo-scripts"
+
+MYPY_MODES = ("process", "daemon")
+MYPY_ARGS = ("--ignore-missing-imports", "--follow-imports=silent")
@@ -4,6 +4,7 @@
 from src.constants.pylintrc import PYLINTRC_FILENAME
 from src.constants.pyproject_toml import PYPROJECT_TOML_FILENAME
 from src.constants.shared import REPO_NAME
+from src.utils.core import freeze
 
 VSCODE_SETTINGS_JSON_FILENAME = ".vscode/settings.json"
 REPO_IGNORE_PATTERN = f"./{REPO_NAME}/**"
@@ -21,6 +22,7 @@ FLAKE8_ARGS_RCFILE_VALUE = "--rcfile=.flake8"
 ISORT_ARGS_KEY = "isort.args"
 ISORT_ARGS_VALUE = f"--settings={PYPROJECT_TOML_FILENAME}"
 MYPY_ARGS_KEY = "mypy-type-checker.args"
+MYPY_PREFER_DAEMON_KEY = "mypy-type-checker.preferDaemon"
 PYLINT_ARGS_KEY = "pylint.args"
 PYLINT_ARGS_RCFILE_VALUE = f"--rcfile={PYLINTRC_FILENAME}"
 
@@ -38,7 +40,7 @@ PYTHON_ANALYSIS_PACKAGE_INDEX_DEPTHS_KEY = "python.analysis.packageIndexDepths"
 DEPTH_KEY = "depth"
 INCLUDE_ALL_SYMBOLS_KEY = "includeAllSymbols"
 NAME_KEY = "name"
-INDEX_NAMES = [
+INDEX_NAMES = (
     "alembic",
     "boto3",
     "django",
@@ -54,7 +56,7 @@ INDEX_NAMES = [
     "sklearn",
     "sqlalchemy",
     "sqlmodel",
-]
+)
 DEFAULT_DEPTH = 2
 
 PYTHON_ANALYSIS_TYPE_CHECKING_MODE_KEY = "python.analysis.typeCheckingMode"
@@ -68,45 +70,47 @@ PYTHON_TESTING_UNITTEST_ARGS_KEY = "python.testing.unittestArgs"
 PYTHON_TESTING_UNITTEST_ENABLED_KEY = "python.testing.unittestEnabled"
 SEARCH_EXCLUDE_KEY = "search.exclude"
 
-SAMPLE_VSCODE_SETTINGS = {
-    PYTHON_LANGUAGE_KEY: {
-        EDITOR_CODE_ACTIONS_ON_SAVE_KEY: {SOURCE_ORGANIZE_IMPORTS_KEY: "explicit"},
-        EDITOR_DEFAULT_FORMATTER_KEY: "<python_formatter>",
-        EDITOR_FORMAT_ON_SAVE_KEY: True,
-    },
-    AUTOPEP8_ARGS_KEY: [],
-    BLACK_FORMATTER_ARGS_KEY: [BLACK_FORMATTER_ARGS_VALUE],
-    FLAKE8_ARGS_KEY: [FLAKE8_ARGS_RCFILE_VALUE],
-    ISORT_ARGS_KEY: [ISORT_ARGS_VALUE],
-    PYLINT_ARGS_KEY: [PYLINT_ARGS_RCFILE_VALUE],
-    PYTHON_ANALYSIS_AUTO_IMPORT_COMPLETIONS_KEY: True,
-    PYTHON_ANALYSIS_AUTO_SEARCH_PATHS_KEY: True,
-    PYTHON_ANALYSIS_DIAGNOSTIC_MODE_KEY: "workspace",
-    PYTHON_ANALYSIS_EXCLUDE_KEY: ["**/node_modules", "**/__pycache__", ".git", ".venv", REPO_IGNORE_PATTERN],
-    PYTHON_ANALYSIS_IMPORT_FORMAT_KEY: "absolute",
-    PYTHON_ANALYSIS_INDEXING_KEY: True,
-    PYTHON_ANALYSIS_INLAY_HINTS_FUNCTION_RETURN_TYPES_KEY: True,
-    PYTHON_ANALYSIS_INLAY_HINTS_PYTEST_PARAMETERS_KEY: True,
-    PYTHON_ANALYSIS_INLAY_HINTS_VARIABLE_TYPES_KEY: True,
-    PYTHON_ANALYSIS_TYPE_CHECKING_MODE_KEY: "basic",
-    PYTHON_ANALYSIS_USE_LIBRARY_CODE_FOR_TYPES_KEY: True,
-    PYTHON_DEFAULT_INTERPRETER_KEY: PYTHON_DEFAULT_INTERPRETER_VALUE,
-    PYTHON_TESTING_PYTEST_ARGS_KEY: [f"--ignore={REPO_IGNORE_PATTERN}"],
-    PYTHON_TESTING_PYTEST_ENABLED_KEY: False,
-    PYTHON_TESTING_UNITTEST_ARGS_KEY: ["-v", "-s", ".", "-p", "*test*.py"],
-    PYTHON_TESTING_UNITTEST_ENABLED_KEY: False,
-    SEARCH_EXCLUDE_KEY: {
-        "**/.git/**": True,
-        "**/node_modules/**": True,
-        "**/__pycache__/**": True,
-        ".coverage": True,
-        ".mypy_cache/**": True,
-        ".pytest_cache/**": True,
-        ".venv/**": True,
-        "htmlcov/**": True,
-        "poetry.lock": True,
-        f"{REPO_NAME}/**": True,
-    },
-}
+SAMPLE_VSCODE_SETTINGS = freeze(
+    {
+        PYTHON_LANGUAGE_KEY: {
+            EDITOR_CODE_ACTIONS_ON_SAVE_KEY: {SOURCE_ORGANIZE_IMPORTS_KEY: "explicit"},
+            EDITOR_DEFAULT_FORMATTER_KEY: "<python_formatter>",
+            EDITOR_FORMAT_ON_SAVE_KEY: True,
+        },
+        AUTOPEP8_ARGS_KEY: [],
+        BLACK_FORMATTER_ARGS_KEY: [BLACK_FORMATTER_ARGS_VALUE],
+        FLAKE8_ARGS_KEY: [FLAKE8_ARGS_RCFILE_VALUE],
+        ISORT_ARGS_KEY: [ISORT_ARGS_VALUE],
+        PYLINT_ARGS_KEY: [PYLINT_ARGS_RCFILE_VALUE],
+        PYTHON_ANALYSIS_AUTO_IMPORT_COMPLETIONS_KEY: True,
+        PYTHON_ANALYSIS_AUTO_SEARCH_PATHS_KEY: True,
+        PYTHON_ANALYSIS_DIAGNOSTIC_MODE_KEY: "workspace",
+        PYTHON_ANALYSIS_EXCLUDE_KEY: ["**/node_modules", "**/__pycache__", ".git", ".venv", REPO_IGNORE_PATTERN],
+        PYTHON_ANALYSIS_IMPORT_FORMAT_KEY: "absolute",
+        PYTHON_ANALYSIS_INDEXING_KEY: True,
+        PYTHON_ANALYSIS_INLAY_HINTS_FUNCTION_RETURN_TYPES_KEY: True,
+        PYTHON_ANALYSIS_INLAY_HINTS_PYTEST_PARAMETERS_KEY: True,
+        PYTHON_ANALYSIS_INLAY_HINTS_VARIABLE_TYPES_KEY: True,
+        PYTHON_ANALYSIS_TYPE_CHECKING_MODE_KEY: "basic",
+        PYTHON_ANALYSIS_USE_LIBRARY_CODE_FOR_TYPES_KEY: True,
+        PYTHON_DEFAULT_INTERPRETER_KEY: PYTHON_DEFAULT_INTERPRETER_VALUE,
+        PYTHON_TESTING_PYTEST_ARGS_KEY: [f"--ignore={REPO_IGNORE_PATTERN}"],
+        PYTHON_TESTING_PYTEST_ENABLED_KEY: False,
+        PYTHON_TESTING_UNITTEST_ARGS_KEY: ["-v", "-s", ".", "-p", "*test*.py"],
+        PYTHON_TESTING_UNITTEST_ENABLED_KEY: False,
+        SEARCH_EXCLUDE_KEY: {
+            "**/.git/**": True,
+            "**/node_modules/**": True,
+            "**/__pycache__/**": True,
+            ".coverage": True,
+            ".mypy_cache/**": True,
+            ".pytest_cache/**": True,
+            ".venv/**": True,
+            "htmlcov/**": True,
+            "poetry.lock": True,
+            f"{REPO_NAME}/**": True,
+        },
+    }
+)
 
 # endregion
@@ -0,0 +1,223 @@
+"""Run the config processors over many repositories in parallel."""
+
+import glob
+import io
+import os
+import shlex
+import subprocess
+import time
+import traceback
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from itertools import dropwhile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.cli import build_parser, run_steps
+from src.constants.flake8 import FLAKE8_FILENAME
+from src.constants.pre_commit_config import PRE_COMMIT_CONFIG_FILENAME
+from src.constants.prettier import PRETTIER_FILENAME
+from src.constants.pylintrc import PYLINTRC_FILENAME
+from src.constants.pyproject_toml import PYPROJECT_TOML_FILENAME
+from src.constants.vscode_settings import VSCODE_SETTINGS_JSON_FILENAME
+from src.options import SetupOptions
+from src.utils.core import pop_changed_files
+
+SCRIPT_DIR = Path(__file__).resolve().parents[1]
+SETUP_PYTHON_APP_SCRIPT = SCRIPT_DIR / "setup_python_app.sh"
+GENERATED_FILENAMES = [
+    PRETTIER_FILENAME,
+    PRE_COMMIT_CONFIG_FILENAME,
+    PYPROJECT_TOML_FILENAME,
+    PYLINTRC_FILENAME,
+    FLAKE8_FILENAME,
+    VSCODE_SETTINGS_JSON_FILENAME,
+]
+# Options that do not change what the processors generate, passing only these does not choose the repo options
+NON_SETUP_OPTIONS = ("debug", "no_cache")
+
+
+class RepoResult(NamedTuple):
+    """The outcome of processing a single repository."""
+
+    repo: str
+    status: int
+    duration: float
+    changed_files: List[str]
+    output: str
+
+
+def build_fleet_parser() -> ArgumentParser:
+    """Build the argument parser for the fleet command.
+
+    Every option that is not listed here is forwarded to the config processors, so processor options have to be
+    passed in their `--option=value` form.
+    """
+    parser = ArgumentParser(
+        prog="python -m src fleet",
+        description="Run the config processors over many repositories in parallel.",
+        allow_abbrev=False,
+    )
+    parser.add_argument("repos", nargs="*", help="Repository roots to process")
+    parser.add_argument(
+        "--glob", action="append", default=[], help="Glob pattern matching repository roots. Can be repeated."
+    )
+    parser.add_argument("--workers", default=os.cpu_count() or 1, type=int)
+    parser.add_argument(
+        "--full_setup",
+        action="store_true",
+        help="Run the complete setup (venv, installers, pre-commit, ...) instead of only the config processors",
+    )
+    return parser
+
+
+def find_repos(repos: List[str], patterns: List[str]) -> List[str]:
+    """Resolve the explicit repository roots and glob patterns to a sorted list of unique directories."""
+    candidates = list(repos)
+    for pattern in patterns:
+        candidates.extend(glob.glob(os.path.expanduser(pattern), recursive=True))
+
+    resolved = {str(Path(candidate).resolve()) for candidate in candidates}
+    return sorted(repo for repo in resolved if Path(repo).is_dir())
+
+
+def read_setup_options(repo: str) -> Optional[List[str]]:
+    """Return the options the repository's setup script passes to setup_python_app.sh, None when there are none.
+
+    Options whose value is a shell variable, like `--rebuild_venv="$rebuild_venv"`, cannot be read and are left out.
+    """
+    setup_path = Path(repo, "setup")
+    if not setup_path.is_file():
+        return None
+
+    for line in setup_path.read_text(encoding="utf-8").replace("\\\n", " ").splitlines():
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError:
+            continue
+        command = list(dropwhile(lambda token: not token.endswith("setup_python_app.sh"), tokens))
+        if command:
+            return [arg for arg in command[1:] if arg.startswith("-") and "$" not in arg]
+    return None
+
+
+def _passes_setup_options(argv: List[str]) -> bool:
+    names = {arg.split("=", 1)[0].lstrip("-") for arg in argv if arg.startswith("--")}
+    return any(name in SetupOptions._fields and name not in NON_SETUP_OPTIONS for name in names)
+
+
+def _snapshot(repo: str) -> Dict[str, Optional[bytes]]:
+    snapshot: Dict[str, Optional[bytes]] = {}
+    for filename in GENERATED_FILENAMES:
+        path = Path(repo) / filename
+        snapshot[filename] = path.read_bytes() if path.exists() else None
+    return snapshot
+
+
+def _run_full_setup(repo: str, processor_argv: List[str]) -> subprocess.CompletedProcess:
+    # Prefer the repository's own setup script since it holds that repository's options. The forwarded options are
+    # appended to it, like `./setup --line_length=100`, so they override the options it passes to the setup.
+    if Path(repo, "setup").is_file():
+        command = ["bash", "setup", *processor_argv]
+    else:
+        command = ["bash", str(SETUP_PYTHON_APP_SCRIPT), *processor_argv]
+    return subprocess.run(command, cwd=repo, text=True, capture_output=True, check=False)
+
+
+def process_repo(repo: str, processor_argv: List[str], full_setup: bool = False) -> RepoResult:
+    """Run the config processors, or the full setup, in a single repository.
+
+    Errors are reported as a failed result, so one broken repository does not stop the others.
+    """
+    start = time.perf_counter()
+    try:
+        status, output, changed_files = _process_repo(repo, processor_argv, full_setup)
+    except Exception:  # pylint: disable=broad-exception-caught
+        status, output, changed_files = 1, traceback.format_exc(), pop_changed_files()
+
+    return RepoResult(
+        repo=repo,
+        status=status,
+        duration=time.perf_counter() - start,
+        changed_files=changed_files,
+        output=output,
+    )
+
+
+def _process_repo(repo: str, processor_argv: List[str], full_setup: bool) -> Tuple[int, str, List[str]]:
+    if full_setup:
+        # The setup runs in a separate process, so compare the files before and after instead
+        before = _snapshot(repo)
+        completed = _run_full_setup(repo, processor_argv)
+        status = completed.returncode
+        output = completed.stdout + completed.stderr
+        after = _snapshot(repo)
+        changed_files = [filename for filename in GENERATED_FILENAMES if before[filename] != after[filename]]
+    else:
+        # The repository's own options come first so the forwarded ones override them, like they do in a full setup
+        repo_options = read_setup_options(repo)
+        if repo_options is None and not _passes_setup_options(processor_argv):
+            message = (
+                "No setup script passing options to setup_python_app.sh was found, pass the options of this repository"
+                " explicitly so that its config files are not reset to the defaults\n"
+            )
+            return 2, message, []
+
+        buffer = io.StringIO()
+        pop_changed_files()
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            try:
+                argv = [*(repo_options or []), *processor_argv, f"--project_dir={repo}"]
+                args, _unknown = build_parser().parse_known_args(argv)
+                os.chdir(repo)
+                os.environ["PWD"] = repo
+                status = run_steps(args)
+            except SystemExit as exc:  # Invalid processor options
+                status = exc.code if isinstance(exc.code, int) else 2
+        output = buffer.getvalue()
+        changed_files = pop_changed_files()
+
+    return status, output, changed_files
+
+
+def print_summary(results: List[RepoResult], debug: bool = False):
+    """Print a line per repository followed by the totals."""
+    for result in results:
+        state = "ok" if result.status == 0 else "FAILED"
+        changed = ", ".join(result.changed_files) if result.changed_files else "no changes"
+        print(f"{state:6} {result.duration:7.2f}s  {result.repo}  ({changed})")
+        if result.status != 0 or debug:
+            for line in result.output.splitlines():
+                print(f"    {line}")
+
+    failed = sum(1 for result in results if result.status != 0)
+    changed = sum(1 for result in results if result.changed_files)
+    print(f"Processed {len(results)} repositories: {changed} changed, {failed} failed")
+
+
+def run_fleet(fleet_args: Namespace, processor_argv: List[str]) -> List[RepoResult]:
+    """Process every repository with a bounded pool of worker processes."""
+    repos = find_repos(fleet_args.repos, fleet_args.glob)
+    if not repos:
+        return []
+
+    workers = max(1, min(fleet_args.workers, len(repos)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_repo, repo, processor_argv, fleet_args.full_setup) for repo in repos]
+        return [future.result() for future in futures]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse the fleet options, process every repository and print a summary."""
+    fleet_args, processor_argv = build_fleet_parser().parse_known_intermixed_args(argv)
+    # Validate the forwarded options once instead of failing in every worker
+    processor_args, _unknown = build_parser().parse_known_args(processor_argv)
+
+    results = run_fleet(fleet_args, processor_argv)
+    if not results:
+        print("No repositories matched")
+        return 1
+
+    print_summary(results, debug=processor_args.debug)
+    return 1 if any(result.status != 0 for result in results) else 0
@@ -0,0 +1,154 @@
+"""Parse and validate the setup_python_app.sh options the processors use, once.
+
+`python -m src.options "$@"` prints shell assignments of the validated options and exports them as JSON in the
+URS_OPTIONS environment variable, which every later `python -m src` launch reads instead of parsing the setup
+arguments again. It only uses the standard library so that it runs with the python of the project environment.
+"""
+
+import json
+import shlex
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional, Sequence
+
+from src.constants.pre_commit_config import PYLINT_HOOK_MODES
+from src.constants.shared import DEFAULT_LINE_LENGTH, MYPY_MODES, REPO_NAME
+from src.utils.core import str2bool
+
+OPTIONS_ENV_VAR = "URS_OPTIONS"
+PACKAGE_MANAGERS = ("pip", "pip-tools", "poetry", "uv-pip", "uv")
+PYTHON_FORMATTERS = ("", "autopep8", "black")
+ISORT_PROFILES = (
+    "",
+    "black",
+    "django",
+    "pycharm",
+    "google",
+    "open_stack",
+    "plone",
+    "attrs",
+    "hug",
+    "wemake",
+    "appnexus",
+)
+
+
+class SetupOptions(NamedTuple):
+    """The setup options shared by every processor. The defaults match setup_python_app.sh."""
+
+    debug: bool = False
+    no_cache: bool = False
+    include_jumanji_house: bool = True
+    include_prettier: bool = True
+    include_isort: bool = True
+    isort_profile: str = "black"
+    python_formatter: str = "black"
+    pylint_enabled: bool = True
+    flake8_enabled: bool = True
+    mypy_enabled: bool = True
+    mypy_mode: str = "process"
+    # None leaves the settings of the profile as they are, False removes them
+    tool_performance_profile: Optional[bool] = None
+    pytest_enabled: bool = True
+    unittest_enabled: bool = False
+    line_length: int = DEFAULT_LINE_LENGTH
+    package_manager: str = "poetry"
+    is_package: bool = False
+    pre_commit_pylint_entry_prefix: str = f"{REPO_NAME}/"
+    pylint_hook_mode: str = "process"
+    pylint_result_cache: bool = False
+
+
+def _flag(name: str) -> Callable[[str], bool]:
+    def convert(value: str) -> bool:
+        try:
+            return str2bool(value)
+        except ArgumentTypeError as error:
+            raise ArgumentTypeError(f"Invalid {name} option: ({value}). Valid values are [0, 1]") from error
+
+    return convert
+
+
+def _choice(name: str, choices: Sequence[str]) -> Callable[[str], str]:
+    def convert(value: str) -> str:
+        if value not in choices:
+            raise ArgumentTypeError(f"Invalid {name} option: ({value}). Valid values are {list(choices)}")
+        return value
+
+    return convert
+
+
+def _positive_int(name: str) -> Callable[[str], int]:
+    def convert(value: str) -> int:
+        if not value.isdigit() or int(value) == 0:
+            raise ArgumentTypeError(f"Invalid {name} option: ({value}). Valid values are any non-zero positive integer")
+        return int(value)
+
+    return convert
+
+
+def add_setup_options(parser: ArgumentParser):
+    """Add the options of SetupOptions to a parser, with their validation."""
+    defaults = SetupOptions()
+    parser.add_argument("-d", "--debug", action="store_true")
+    for name, default in defaults._asdict().items():
+        if name == "debug":
+            continue
+        if isinstance(default, bool) or name == "tool_performance_profile":
+            parser.add_argument(f"--{name}", nargs="?", const=True, default=default, type=_flag(name))
+        elif name == "line_length":
+            parser.add_argument(f"--{name}", default=default, type=_positive_int(name))
+        elif name == "package_manager":
+            parser.add_argument(f"--{name}", default=default, type=_choice(name, PACKAGE_MANAGERS))
+        elif name == "python_formatter":
+            parser.add_argument(f"--{name}", default=default, type=_choice(name, PYTHON_FORMATTERS))
+        elif name == "isort_profile":
+            parser.add_argument(f"--{name}", default=default, type=_choice(name, ISORT_PROFILES))
+        elif name == "pylint_hook_mode":
+            parser.add_argument(f"--{name}", default=default, type=_choice(name, PYLINT_HOOK_MODES))
+        elif name == "mypy_mode":
+            parser.add_argument(f"--{name}", default=default, type=_choice(name, MYPY_MODES))
+        else:
+            parser.add_argument(f"--{name}", default=default, type=str)
+
+
+def parse_setup_options(argv: Optional[List[str]] = None) -> SetupOptions:
+    """Parse the options of SetupOptions, ignoring the ones only setup_python_app.sh uses."""
+    parser = ArgumentParser(prog="python -m src.options", allow_abbrev=False)
+    add_setup_options(parser)
+    args, _unknown = parser.parse_known_args(argv)
+    return SetupOptions(**{name: getattr(args, name) for name in SetupOptions._fields})
+
+
+def dump_options(options: SetupOptions) -> str:
+    """Serialise options to JSON."""
+    return json.dumps(options._asdict(), separators=(",", ":"))
+
+
+def load_options(value: str) -> SetupOptions:
+    """Deserialise options serialised by dump_options. Missing options get their default value."""
+    data: Mapping[str, Any] = json.loads(value)
+    return SetupOptions(**{name: data[name] for name in SetupOptions._fields if name in data})
+
+
+def shell_assignments(options: SetupOptions) -> str:
+    """Return shell code that sets a variable per option, with flags as 0/1, and exports the options as JSON."""
+    lines = []
+    for name, value in options._asdict().items():
+        if isinstance(value, bool):
+            value = int(value)
+        elif value is None:
+            value = ""
+        lines.append(f"{name}={shlex.quote(str(value))}")
+    lines.append(f"export {OPTIONS_ENV_VAR}={shlex.quote(dump_options(options))}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the shell assignments of the validated options."""
+    print(shell_assignments(parse_setup_options(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Synchronise a virtual environment with requirements files using pip.
+
+pip has no sync command, so this installs only the requirements that are missing or installed at a version that does
+not satisfy them, and then uninstalls the distributions nothing requires anymore. Only distributions a previous sync
+installed for the requirements are uninstalled, unless --strict is passed, so packages installed by hand are kept.
+
+This file runs with the python of the project virtual environment, which only has the project dependencies
+installed, so it only depends on the standard library and on the copy of `packaging` vendored by pip.
+"""
+
+import re
+import shlex
+import subprocess
+import sys
+from argparse import ArgumentParser
+from importlib.metadata import distributions
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Collection, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+    from packaging.utils import canonicalize_name
+    from packaging.version import InvalidVersion
+except ImportError:  # pragma: no cover
+    from pip._vendor.packaging.requirements import InvalidRequirement, Requirement  # type: ignore[no-redef]
+    from pip._vendor.packaging.utils import canonicalize_name  # type: ignore[no-redef]
+    from pip._vendor.packaging.version import InvalidVersion  # type: ignore[no-redef]
+
+# Installed by setup_python_app.sh itself, they are never uninstalled even though the requirements do not list them
+PROTECTED_DISTRIBUTIONS = frozenset({"pip", "setuptools", "wheel", "tox"})
+COMMENT_PATTERN = re.compile(r"(^|\s+)#.*$")
+FILE_OPTION_PATTERN = re.compile(r"^(-r|--requirement|-c|--constraint)(?:=|\s+)(.+)$")
+# Per-requirement options, like the --hash options pip-compile --generate-hashes writes, follow the requirement
+PER_REQUIREMENT_OPTION_PATTERN = re.compile(r"\s--[a-z]")
+# Stored in the virtual environment, lists the distributions the last sync installed for the requirements
+MANAGED_RECORD_NAME = ".urs-pip-sync-managed"
+
+
+class InstalledDistribution(NamedTuple):
+    """The version and the requirements of a distribution installed in the environment."""
+
+    version: str
+    requires: List[str]
+
+
+class RequirementsSet(NamedTuple):
+    """Requirements files split into the requirements that can be compared with the environment and the rest."""
+
+    named: List[str]
+    unnamed: List[List[str]]
+    options: List[str]
+
+
+class SyncPlan(NamedTuple):
+    """What has to change in the environment to match the requirements."""
+
+    install: List[str]
+    uninstall: List[str]
+
+
+def parse_requirements_file(path: Path, requirements: Optional[RequirementsSet] = None) -> RequirementsSet:
+    """Read the requirements of a requirements file and of the files it includes with -r.
+
+    Lines that are not named requirements, such as `-e .` or paths, are kept apart because there is no way to tell
+    whether they are installed. Named requirements keep their per-requirement options, such as `--hash`. Constraint
+    files and index options are passed through to pip.
+    """
+    if requirements is None:
+        requirements = RequirementsSet(named=[], unnamed=[], options=[])
+    for raw_line in _logical_lines(path):
+        line = COMMENT_PATTERN.sub("", raw_line).strip()
+        if not line:
+            continue
+
+        file_option = FILE_OPTION_PATTERN.match(line)
+        if file_option is not None:
+            option, value = file_option.groups()
+            if option in ("-r", "--requirement"):
+                parse_requirements_file(path.parent / value.strip(), requirements)
+            else:
+                requirements.options.extend(["--constraint", str(path.parent / value.strip())])
+        elif line.startswith("-e") or line.startswith("--editable"):
+            requirements.unnamed.append(shlex.split(line))
+        elif line.startswith("-"):
+            requirements.options.extend(shlex.split(line))
+        else:
+            try:
+                _requirement(line)
+            except InvalidRequirement:
+                requirements.unnamed.append(shlex.split(line))
+            else:
+                requirements.named.append(line)
+    return requirements
+
+
+def split_requirement_line(line: str) -> Tuple[str, List[str]]:
+    """Split a requirement line into the requirement and its per-requirement options, such as `--hash`."""
+    option = PER_REQUIREMENT_OPTION_PATTERN.search(line)
+    if option is None:
+        return line, []
+    start = option.start()
+    return line[:start].strip(), shlex.split(line[start:])
+
+
+def _requirement(line: str) -> Requirement:
+    return Requirement(split_requirement_line(line)[0])
+
+
+def _logical_lines(path: Path) -> List[str]:
+    lines: List[str] = []
+    continued = ""
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.endswith("\\"):
+            continued += line[:-1] + " "
+            continue
+        lines.append(continued + line)
+        continued = ""
+    if continued:
+        lines.append(continued)
+    return lines
+
+
+def installed_distributions() -> Dict[str, InstalledDistribution]:
+    """Return the distributions installed in the running environment by canonical name."""
+    installed: Dict[str, InstalledDistribution] = {}
+    for distribution in distributions():
+        name = distribution.metadata["Name"]
+        if not name:
+            continue
+        # The first distribution on sys.path is the one that gets imported
+        installed.setdefault(
+            canonicalize_name(name),
+            InstalledDistribution(version=distribution.version, requires=list(distribution.requires or [])),
+        )
+    return installed
+
+
+def _applies(requirement: Requirement, extras: FrozenSet[str]) -> bool:
+    if requirement.marker is None:
+        return True
+    return any(requirement.marker.evaluate({"extra": extra}) for extra in extras | {""})
+
+
+def _satisfied(requirement: Requirement, installed: Optional[InstalledDistribution]) -> bool:
+    if installed is None:
+        return False
+    if not requirement.specifier:
+        return True
+    try:
+        return requirement.specifier.contains(installed.version, prereleases=True)
+    except InvalidVersion:
+        return False
+
+
+def plan_install(requirements: RequirementsSet, installed: Dict[str, InstalledDistribution]) -> List[str]:
+    """Return the named requirements that are missing or not satisfied by the installed version."""
+    install = []
+    for line in requirements.named:
+        requirement = _requirement(line)
+        if not _applies(requirement, frozenset()):
+            continue
+        if not _satisfied(requirement, installed.get(canonicalize_name(requirement.name))):
+            install.append(line)
+    return install
+
+
+def required_distributions(
+    requirements: RequirementsSet, installed: Dict[str, InstalledDistribution], roots: Iterable[str] = ()
+) -> Set[str]:
+    """Return the names of the required distributions and of their dependencies, extras included.
+
+    The roots are required too, along with their dependencies.
+    """
+    wanted: Dict[str, Set[str]] = {name: set() for name in roots}
+    pending = list(wanted)
+    for line in requirements.named:
+        requirement = _requirement(line)
+        if _applies(requirement, frozenset()):
+            name = canonicalize_name(requirement.name)
+            wanted.setdefault(name, set()).update(requirement.extras)
+            pending.append(name)
+
+    # Walk the dependencies of the installed distributions, extras included, starting from the requirements
+    visited: Dict[str, FrozenSet[str]] = {}
+    while pending:
+        name = pending.pop()
+        extras = frozenset(wanted[name])
+        if visited.get(name) == extras or name not in installed:
+            continue
+        visited[name] = extras
+        for line in installed[name].requires:
+            requirement = Requirement(line)
+            if not _applies(requirement, extras):
+                continue
+            dependency = canonicalize_name(requirement.name)
+            dependency_extras = wanted.setdefault(dependency, set())
+            if dependency not in visited or not requirement.extras <= dependency_extras:
+                dependency_extras.update(requirement.extras)
+                pending.append(dependency)
+
+    return set(wanted)
+
+
+def plan_uninstall(
+    requirements: RequirementsSet,
+    installed: Dict[str, InstalledDistribution],
+    managed: Optional[Collection[str]] = None,
+) -> List[str]:
+    """Return the installed distributions that are neither required nor a dependency of a required distribution.
+
+    When managed is given, only those distributions can be uninstalled: the others were installed by something else
+    than a sync, so they are kept along with their dependencies. Nothing is uninstalled when some requirements are not
+    named, since their dependencies are unknown.
+    """
+    if requirements.unnamed:
+        return []
+
+    roots = set(PROTECTED_DISTRIBUTIONS)
+    if managed is not None:
+        roots.update(name for name in installed if name not in managed)
+    wanted = required_distributions(requirements, installed, roots)
+    return sorted(name for name in installed if name not in wanted)
+
+
+def plan_sync(
+    requirements: RequirementsSet,
+    installed: Dict[str, InstalledDistribution],
+    managed: Optional[Collection[str]] = None,
+) -> SyncPlan:
+    """Return what has to be installed and uninstalled for the environment to match the requirements."""
+    return SyncPlan(
+        install=plan_install(requirements, installed),
+        uninstall=plan_uninstall(requirements, installed, managed),
+    )
+
+
+def read_managed(record: Path) -> Set[str]:
+    """Return the distributions a previous sync recorded, none when it never ran."""
+    try:
+        return set(record.read_text(encoding="utf-8").split())
+    except FileNotFoundError:
+        return set()
+
+
+def write_managed(record: Path, names: Iterable[str]) -> None:
+    """Record the distributions the sync installed for the requirements."""
+    record.write_text("".join(f"{name}\n" for name in sorted(names)), encoding="utf-8")
+
+
+def _pip(*args: str) -> int:
+    command = [sys.executable, "-m", "pip", *args]
+    print(" ".join(shlex.quote(arg) for arg in command), flush=True)
+    return subprocess.run(command, check=False).returncode
+
+
+def _install(requirements: RequirementsSet, install: List[str], unnamed: List[str]) -> int:
+    if not any(split_requirement_line(line)[1] for line in install):
+        return _pip("install", *requirements.options, *install, *unnamed)
+    # pip only accepts per-requirement options, like --hash, in a requirements file
+    with TemporaryDirectory() as temp_dir:
+        requirements_file = Path(temp_dir) / "requirements.txt"
+        requirements_file.write_text("".join(f"{line}\n" for line in install), encoding="utf-8")
+        return _pip("install", *requirements.options, "--requirement", str(requirements_file), *unnamed)
+
+
+def sync(
+    requirements: RequirementsSet, record: Optional[Path] = None, dry_run: bool = False, strict: bool = False
+) -> int:
+    """Install the missing requirements, then uninstall the distributions that are no longer required.
+
+    The distributions installed for the requirements are stored in record, and only the ones a previous sync stored
+    there are uninstalled. With strict, every distribution that is not required is uninstalled instead.
+    """
+    install = plan_install(requirements, installed_distributions())
+    unnamed = [arg for args in requirements.unnamed for arg in args]
+    if install or unnamed:
+        print(
+            f"Installing {len(install)} missing or outdated requirement(s): "
+            f"{', '.join(split_requirement_line(line)[0] for line in install) or '-'}"
+        )
+        if unnamed:
+            print(f"Installing requirement(s) that cannot be compared with the environment: {' '.join(unnamed)}")
+        if not dry_run:
+            status = _install(requirements, install, unnamed)
+            if status != 0:
+                return status
+    else:
+        print("All requirements are already installed")
+
+    # Computed after installing, so the dependencies of new versions are not uninstalled and reinstalled
+    installed = installed_distributions()
+    managed = None if strict else read_managed(record) if record is not None else set()
+    uninstall = plan_uninstall(requirements, installed, managed)
+    if record is not None and not dry_run:
+        write_managed(record, required_distributions(requirements, installed) & set(installed))
+    if requirements.unnamed:
+        print("Not uninstalling extra distributions because some requirements are not named")
+    elif uninstall:
+        print(f"Uninstalling {len(uninstall)} distribution(s) that are no longer required: {', '.join(uninstall)}")
+        if not dry_run:
+            return _pip("uninstall", "--yes", *uninstall)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Synchronise the running environment with the given requirements files."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("requirements_files", nargs="+", type=Path)
+    parser.add_argument("--dry_run", action="store_true", help="Print the plan without running pip")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also uninstall the distributions that were not installed by a sync, like packages installed by hand",
+    )
+    args = parser.parse_args(argv)
+
+    requirements = RequirementsSet(named=[], unnamed=[], options=[])
+    for requirements_file in args.requirements_files:
+        parse_requirements_file(requirements_file, requirements)
+    return sync(requirements, record=Path(sys.prefix) / MANAGED_RECORD_NAME, dry_run=args.dry_run, strict=args.strict)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
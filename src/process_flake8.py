@@ -1,8 +1,13 @@
 """Do processing of the .flake8 file."""
 
+from typing import Optional
+
 from configupdater import ConfigUpdater, Option
 
+from src.constants.flake8 import FLAKE8_JOBS_KEY, FLAKE8_JOBS_PERFORMANCE_VALUE
 from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
+from src.utils.configupdater import dump_ini_file
+from src.utils.core import write_if_changed
 
 
 def process_flake8(
@@ -10,6 +15,7 @@ def process_flake8(
     debug: bool = False,
     line_length: int = DEFAULT_LINE_LENGTH,
     test: bool = False,
+    tool_performance_profile: Optional[bool] = None,
 ):
     """Do processing of the .flake8 file."""
     if debug:
@@ -17,6 +23,7 @@ def process_flake8(
         print(f"    --debug: {debug}")
         print(f"    --test: {test}")
         print(f"    --line_length: {line_length}")
+        print(f"    --tool_performance_profile: {tool_performance_profile}")
         print("")
 
     if flake8_config.get_section("flake8", None) is None:
@@ -34,11 +41,21 @@ def process_flake8(
         exclude_settings.value = f"{exclude_settings.value}{',' if exclude_settings.value else ''}{REPO_NAME}"
     flake8_config.set("flake8", "exclude", exclude_settings.value)
 
+    # tool_performance_profile: only remove the value the profile writes, when it is turned off explicitly
+    jobs_settings = flake8_config.get("flake8", FLAKE8_JOBS_KEY, None)
+    if tool_performance_profile:
+        flake8_config.set("flake8", FLAKE8_JOBS_KEY, FLAKE8_JOBS_PERFORMANCE_VALUE)
+    elif (
+        tool_performance_profile is not None
+        and jobs_settings is not None
+        and jobs_settings.value == FLAKE8_JOBS_PERFORMANCE_VALUE
+    ):
+        flake8_config.remove_option("flake8", FLAKE8_JOBS_KEY)
+
     if not test:  # pragma: no cover
         if debug:  # pragma: no cover
             print("Writing .flake8 file")  # pragma: no cover
-        with open(".flake8", "w", encoding="utf-8") as flake8_file:  # pragma: no cover
-            flake8_config.write(flake8_file)  # pragma: no cover
+        write_if_changed(".flake8", dump_ini_file(flake8_config), debug=debug)  # pragma: no cover
     else:
         if debug:
             print("TESTING: Not Writing .flake8 file")
@@ -1,8 +1,7 @@
 """Do processing of the .pre-commit-config.yaml file."""
 
-from typing import Any, Dict, List, cast
+from typing import Any, Optional, Sequence
 
-from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 
 from src.constants.pre_commit_config import (
@@ -36,14 +35,21 @@ from src.constants.pre_commit_config import (
     LOCAL_REPO_URL,
     MARKDOWN_LINT_HOOK,
     MARKDOWN_LINT_HOOK_ID,
+    MYPY_DAEMON_HOOK,
+    MYPY_DAEMON_REPO,
+    MYPY_HOOK_ID,
     PRE_COMMIT_REPO,
     PRE_COMMIT_REPO_URL,
+    PRETTIER_CACHE_ARGS,
     PRETTIER_HOOK,
     PRETTIER_HOOK_ID,
     PRETTIER_REPO,
     PRETTIER_REPO_URL,
-    PYLINT_HOOK,
+    PYLINT_CACHE_SCRIPT,
     PYLINT_HOOK_ID,
+    PYLINT_HOOK_MODES,
+    PYLINT_HOOK_UPDATE,
+    PYLINT_SERVER_SCRIPT,
     SHELL_FORMAT_HOOK,
     SHELL_FORMAT_HOOK_ID,
     SHELLCHECK_HOOK,
@@ -51,9 +57,14 @@ from src.constants.pre_commit_config import (
     TRAILING_WHITESPACE_HOOK,
     TRAILING_WHITESPACE_HOOK_ID,
 )
-from src.constants.shared import REPO_NAME
-from src.utils.core import validate_python_formatter_option
-from src.utils.ruamel.yaml import find_hook_id_index, find_repo_index, remove_hooks, update_hook
+from src.constants.shared import MYPY_MODES, REPO_NAME
+from src.utils.core import validate_python_formatter_option, write_if_changed
+from src.utils.ruamel.yaml import PreCommitConfig, dump_yaml, remove_hooks, update_hook
+
+
+def _starts_with_script(args: Sequence[Any], script: str) -> bool:
+    """Whether args start with the `python <prefix><script>` command this processor generates."""
+    return len(args) >= 2 and args[0] == "python" and str(args[1]).endswith(script)
 
 
 class PreCommitConfigProcessor:
@@ -72,9 +83,16 @@ class PreCommitConfigProcessor:
         pylint_enabled: bool = True,
         flake8_enabled: bool = True,
         pre_commit_pylint_entry_prefix: str = f"{REPO_NAME}/",
+        pylint_hook_mode: str = "process",
+        pylint_result_cache: bool = False,
+        mypy_enabled: bool = True,
+        mypy_mode: str = "process",
+        tool_performance_profile: Optional[bool] = None,
     ):  # pylint: disable=too-many-arguments
         """Initialize the PreCommitConfigProcessor class."""
         self.pre_commit_config = pre_commit_config
+        # Indexed once so that every hook update does not have to scan the repos and hooks lists
+        self.indexed_config = PreCommitConfig(pre_commit_config)
         self.debug = debug
         self.test = test
         self.include_jumanji_house = include_jumanji_house
@@ -84,6 +102,11 @@ class PreCommitConfigProcessor:
         self.pylint_enabled = pylint_enabled
         self.flake8_enabled = flake8_enabled
         self.pre_commit_pylint_entry_prefix = pre_commit_pylint_entry_prefix
+        self.pylint_hook_mode = pylint_hook_mode
+        self.pylint_result_cache = pylint_result_cache
+        self.mypy_enabled = mypy_enabled
+        self.mypy_mode = mypy_mode
+        self.tool_performance_profile = tool_performance_profile
 
         if self.debug:
             print("process_pre_commit_config.py CLI Arguments:")
@@ -96,12 +119,23 @@ class PreCommitConfigProcessor:
             print(f"    --pylint_enabled: {self.pylint_enabled}")
             print(f"    --flake8_enabled: {self.flake8_enabled}")
             print(f"    --pylint_entry_prefix: {self.pre_commit_pylint_entry_prefix}")
+            print(f"    --pylint_hook_mode: {self.pylint_hook_mode}")
+            print(f"    --pylint_result_cache: {self.pylint_result_cache}")
+            print(f"    --mypy_enabled: {self.mypy_enabled}")
+            print(f"    --mypy_mode: {self.mypy_mode}")
+            print(f"    --tool_performance_profile: {self.tool_performance_profile}")
             print("")
 
     def process_pre_commit_config(self):
         """Do processing of the .pre-commit-config.yaml file."""
         # Validate String Inputs
         validate_python_formatter_option(python_formatter=self.python_formatter)
+        if self.pylint_hook_mode not in PYLINT_HOOK_MODES:
+            raise ValueError(
+                f"Invalid pylint_hook_mode: {self.pylint_hook_mode}. Valid Options are: {list(PYLINT_HOOK_MODES)}"
+            )
+        if self.mypy_mode not in MYPY_MODES:
+            raise ValueError(f"Invalid mypy_mode: {self.mypy_mode}. Valid Options are: {list(MYPY_MODES)}")
 
         # pre commit base hooks
         self._process_pre_commit_repo()
@@ -111,21 +145,22 @@ class PreCommitConfigProcessor:
 
         # include_prettier
         if not self.include_prettier:
-            remove_hooks(pre_commit_config=self.pre_commit_config, repo_urls=[PRETTIER_REPO_URL], debug=self.debug)
+            remove_hooks(pre_commit_config=self.indexed_config, repo_urls=[PRETTIER_REPO_URL], debug=self.debug)
         else:
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=PRETTIER_REPO_URL,
                 repo_default=PRETTIER_REPO,
                 hooks=[(PRETTIER_HOOK_ID, PRETTIER_HOOK)],
             )
+            self._update_prettier_config()
 
         # include_isort
         if not self.include_isort:
-            remove_hooks(pre_commit_config=self.pre_commit_config, repo_urls=[ISORT_REPO_URL], debug=self.debug)
+            remove_hooks(pre_commit_config=self.indexed_config, repo_urls=[ISORT_REPO_URL], debug=self.debug)
         else:
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=ISORT_REPO_URL,
                 repo_default=ISORT_REPO,
                 hooks=[(ISORT_HOOK_ID, ISORT_HOOK)],
@@ -141,10 +176,9 @@ class PreCommitConfigProcessor:
         if not self.test:  # pragma: no cover
             if self.debug:  # pragma: no cover
                 print("Creating .pre-commit-config.yaml")  # pragma: no cover
-            with open(".pre-commit-config.yaml", "w", encoding="utf-8") as file:  # pragma: no cover
-                yaml = YAML()  # pragma: no cover
-                yaml.default_flow_style = False  # pragma: no cover
-                yaml.dump(self.pre_commit_config, file)  # pragma: no cover
+            write_if_changed(  # pragma: no cover
+                ".pre-commit-config.yaml", dump_yaml(self.pre_commit_config), debug=self.debug
+            )
         else:
             if self.debug:
                 print("TESTING: Not Creating .pre-commit-config.yaml")
@@ -152,9 +186,23 @@ class PreCommitConfigProcessor:
 
         return self.pre_commit_config
 
+    def _update_prettier_config(self):
+        prettier_repo = self.indexed_config.find_repo(PRETTIER_REPO_URL)
+        prettier_hook = self.indexed_config.find_hook(prettier_repo, PRETTIER_HOOK_ID) if prettier_repo else None
+        if prettier_hook is None:
+            raise ValueError(f"Hook {PRETTIER_HOOK_ID} not found in repo {PRETTIER_REPO_URL}")
+
+        # tool_performance_profile: only add or remove the arguments the profile writes, when it is set explicitly
+        args = prettier_hook.get("args", [])
+        if self.tool_performance_profile:
+            args.extend([arg for arg in PRETTIER_CACHE_ARGS if arg not in args])
+        elif self.tool_performance_profile is not None:
+            args[:] = [arg for arg in args if arg not in PRETTIER_CACHE_ARGS]
+        prettier_hook["args"] = args
+
     def _process_pre_commit_repo(self):
         update_hook(
-            pre_commit_config=self.pre_commit_config,
+            pre_commit_config=self.indexed_config,
             repo_url=PRE_COMMIT_REPO_URL,
             repo_default=PRE_COMMIT_REPO,
             hooks=[
@@ -167,13 +215,13 @@ class PreCommitConfigProcessor:
     def _process_jumanji_house_repo(self):
         if not self.include_jumanji_house:
             remove_hooks(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_urls=[JUMANJI_HOUSE_REPO_URL],
                 debug=self.debug,
             )
         else:
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=JUMANJI_HOUSE_REPO_URL,
                 repo_default=JUMANJI_HOUSE_REPO,
                 hooks=[
@@ -188,58 +236,80 @@ class PreCommitConfigProcessor:
     def _process_python_formatter_option(self):
         if self.python_formatter == "autopep8":
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=AUTOPEP8_REPO_URL,
                 repo_default=AUTOPEP8_REPO,
                 hooks=[(AUTOPEP8_HOOK_ID, AUTOPEP8_HOOK)],
             )
 
             remove_hooks(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_urls=[BLACK_REPO_URL],
                 debug=self.debug,
             )
         elif self.python_formatter == "black":
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=BLACK_REPO_URL,
                 repo_default=BLACK_REPO,
                 hooks=[(BLACK_HOOK_ID, BLACK_HOOK)],
             )
 
             remove_hooks(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_urls=[AUTOPEP8_REPO_URL],
                 debug=self.debug,
             )
         else:
             remove_hooks(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_urls=[AUTOPEP8_REPO_URL, BLACK_REPO_URL],
                 debug=self.debug,
             )
 
     def _update_pylint_config(self):
-        local_repo_index = find_repo_index(self.pre_commit_config, LOCAL_REPO_URL)
-        repos = cast(List[Dict[str, Any]], self.pre_commit_config.get("repos", []))
-        local_repo = repos[local_repo_index]
+        local_repo = self.indexed_config.find_repo(LOCAL_REPO_URL)
+        if local_repo is None:
+            raise ValueError(f"Repo {LOCAL_REPO_URL} not found in .pre-commit-config.yaml")
+
+        pylint_hook = self.indexed_config.find_hook(local_repo, PYLINT_HOOK_ID)
+        if pylint_hook is None:
+            raise ValueError(f"Hook {PYLINT_HOOK_ID} not found in repo {LOCAL_REPO_URL}")
+        pylint_hook["entry"] = f"{self.pre_commit_pylint_entry_prefix}ensure_venv.sh"
 
-        pylint_hook_id = find_hook_id_index(pre_commit_repo=local_repo, hook_id=PYLINT_HOOK_ID)
-        hooks = cast(List[Dict[str, Any]], local_repo.get("hooks", []))
-        hooks[pylint_hook_id]["entry"] = f"{self.pre_commit_pylint_entry_prefix}ensure_venv.sh"
+        # The command ensure_venv.sh runs comes first in args, replace the one this generated and keep the rest
+        args = pylint_hook.get("args", [])
+        if _starts_with_script(args, PYLINT_CACHE_SCRIPT) and args[2:3] == ["--"]:
+            del args[:3]
+        was_server = _starts_with_script(args, PYLINT_SERVER_SCRIPT)
+        if was_server:
+            del args[:2]
+        elif args[:1] == ["pylint"]:
+            del args[:1]
+        if self.pylint_hook_mode == "server":
+            args[:0] = ["python", f"{self.pre_commit_pylint_entry_prefix}{PYLINT_SERVER_SCRIPT}"]
+            # One client per commit, the server lints one request at a time anyway
+            pylint_hook["require_serial"] = True
+        else:
+            args[:0] = ["pylint"]
+            if was_server:
+                pylint_hook.pop("require_serial", None)
+        if self.pylint_result_cache:
+            args[:0] = ["python", f"{self.pre_commit_pylint_entry_prefix}{PYLINT_CACHE_SCRIPT}", "--"]
+        pylint_hook["args"] = args
 
     def _process_python_linter_options(self):
         if self.pylint_enabled:
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=LOCAL_REPO_URL,
                 repo_default=LOCAL_REPO,
-                hooks=[(PYLINT_HOOK_ID, PYLINT_HOOK)],
+                hooks=[(PYLINT_HOOK_ID, PYLINT_HOOK_UPDATE)],
             )
             self._update_pylint_config()
         else:
             remove_hooks(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_urls=[LOCAL_REPO_URL],
                 local_ids=[PYLINT_HOOK_ID],
                 debug=self.debug,
@@ -247,10 +317,44 @@ class PreCommitConfigProcessor:
 
         if self.flake8_enabled:
             update_hook(
-                pre_commit_config=self.pre_commit_config,
+                pre_commit_config=self.indexed_config,
                 repo_url=FLAKE8_REPO_URL,
                 repo_default=FLAKE8_REPO,
                 hooks=[(FLAKE8_HOOK_ID, FLAKE8_HOOK)],
             )
         else:
-            remove_hooks(pre_commit_config=self.pre_commit_config, repo_urls=[FLAKE8_REPO_URL], debug=self.debug)
+            remove_hooks(pre_commit_config=self.indexed_config, repo_urls=[FLAKE8_REPO_URL], debug=self.debug)
+
+        self._process_mypy_options()
+
+    def _process_mypy_options(self):
+        # Only the generated daemon hook is updated or removed, never a mypy hook the project added itself
+        local_repo = self.indexed_config.find_repo(LOCAL_REPO_URL)
+        mypy_hook = self.indexed_config.find_hook(local_repo, MYPY_HOOK_ID) if local_repo is not None else None
+        generated_hook = mypy_hook is not None and list(mypy_hook.get("args", []))[:1] == ["dmypy"]
+
+        if self.mypy_enabled and self.mypy_mode == "daemon":
+            if mypy_hook is not None and not generated_hook:
+                if self.debug:
+                    print(f"Keeping the {MYPY_HOOK_ID} hook of the project instead of the mypy daemon hook")
+                return
+            update_hook(
+                pre_commit_config=self.indexed_config,
+                repo_url=LOCAL_REPO_URL,
+                repo_default=MYPY_DAEMON_REPO,
+                hooks=[(MYPY_HOOK_ID, MYPY_DAEMON_HOOK)],
+            )
+            local_repo = self.indexed_config.find_repo(LOCAL_REPO_URL)
+            mypy_hook = self.indexed_config.find_hook(local_repo, MYPY_HOOK_ID) if local_repo is not None else None
+            if mypy_hook is None:
+                raise ValueError(f"Hook {MYPY_HOOK_ID} not found in repo {LOCAL_REPO_URL}")
+            mypy_hook["entry"] = f"{self.pre_commit_pylint_entry_prefix}ensure_venv.sh"
+            return
+
+        if generated_hook:
+            remove_hooks(
+                pre_commit_config=self.indexed_config,
+                repo_urls=[LOCAL_REPO_URL],
+                local_ids=[MYPY_HOOK_ID],
+                debug=self.debug,
+            )
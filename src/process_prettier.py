@@ -1,16 +1,16 @@
 """Do processing of the .flake8 file."""
 
 import os
-from json import dump
 from typing import Any
 
-from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 
 from src.constants.pre_commit_config import PRETTIER_REPO, PRETTIER_REPO_URL
 from src.constants.prettier import PRINT_WIDTH_KEY
 from src.constants.shared import DEFAULT_LINE_LENGTH
-from src.utils.ruamel.yaml import find_repo_index, update_repo_rev
+from src.utils.core import write_if_changed
+from src.utils.prettier import dump_json
+from src.utils.ruamel.yaml import PreCommitConfig, dump_yaml, update_repo_rev
 
 
 def process_prettierrc(
@@ -34,8 +34,9 @@ def process_prettierrc(
     if not test:  # pragma: no cover
         if debug:  # pragma: no cover
             print("Writing .prettierrc file")  # pragma: no cover
-        with open(".prettierrc", "w", encoding="utf-8") as prettierrc_file:  # pragma: no cover
-            dump(prettierrc_data, prettierrc_file, indent=2)
+        write_if_changed(  # pragma: no cover
+            ".prettierrc", dump_json(prettierrc_data, print_width=line_length), debug=debug
+        )
     else:
         if debug:
             print("TESTING: Not Writing .prettierrc file")
@@ -55,8 +56,8 @@ def process_prettierrc(
         if not test:  # pragma: no cover
             if debug:  # pragma: no cover
                 print(f"Writing {prettierignore_path} file")  # pragma: no cover
-            with open(".prettierignore", "w", encoding="utf-8") as prettierignore_file:  # pragma: no cover
-                print(build_prettierignore_file_content(prettierignore_ignore_patterns), file=prettierignore_file)
+            prettierignore_content = build_prettierignore_file_content(prettierignore_ignore_patterns)
+            write_if_changed(prettierignore_path, f"{prettierignore_content}\n", debug=debug)  # pragma: no cover
         else:
             if debug:
                 print(f"TESTING: Not Writing {prettierignore_path} file")
@@ -87,16 +88,15 @@ def process_pre_commit_config(
         print("")
 
     # Fixing prettier pre-commit hook since it updates to an alpha version
-    try:
-        find_repo_index(pre_commit_config, PRETTIER_REPO_URL)
-    except ValueError:
+    indexed_config = PreCommitConfig(pre_commit_config)
+    if indexed_config.find_repo(PRETTIER_REPO_URL) is None:
         if debug:
             print("Skipping prettier pre-commit hook rev update because the repo is not configured")
     else:
         if debug:
             print("Updating prettier pre-commit hook")
         update_repo_rev(
-            pre_commit_config=pre_commit_config,
+            pre_commit_config=indexed_config,
             repo_url=PRETTIER_REPO_URL,
             repo_default=PRETTIER_REPO,
             rev="v3.1.0",
@@ -106,10 +106,7 @@ def process_pre_commit_config(
     if not test:  # pragma: no cover
         if debug:  # pragma: no cover
             print("Creating .pre-commit-config.yaml")  # pragma: no cover
-        with open(".pre-commit-config.yaml", "w", encoding="utf-8") as file:  # pragma: no cover
-            yaml = YAML()  # pragma: no cover
-            yaml.default_flow_style = False  # pragma: no cover
-            yaml.dump(pre_commit_config, file)  # pragma: no cover
+        write_if_changed(".pre-commit-config.yaml", dump_yaml(pre_commit_config), debug=debug)  # pragma: no cover
     else:
         if debug:
             print("TESTING: Not Creating .pre-commit-config.yaml")
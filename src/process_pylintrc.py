@@ -1,6 +1,6 @@
 """Do processing of the pylintrc file."""
 
-from typing import List
+from typing import List, Optional
 
 from configupdater import AssignMultilineValueError, ConfigUpdater, Option, Section
 
@@ -9,15 +9,23 @@ from src.constants.pylintrc import (
     PYLINTRC_FORMAT_MAX_LINE_LENGTH_KEY,
     PYLINTRC_FORMAT_SECTION_KEY,
     PYLINTRC_MASTER_IGNORE_KEY,
+    PYLINTRC_MASTER_JOBS_KEY,
+    PYLINTRC_MASTER_JOBS_PERFORMANCE_VALUE,
     PYLINTRC_MASTER_SECTION_KEY,
 )
 from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
+from src.utils.configupdater import dump_ini_file
+from src.utils.core import write_if_changed
 
 INDENT = " " * 7
 
 
 def process_pylintrc(
-    pylintrc: ConfigUpdater, debug: bool = False, line_length: int = DEFAULT_LINE_LENGTH, test: bool = False
+    pylintrc: ConfigUpdater,
+    debug: bool = False,
+    line_length: int = DEFAULT_LINE_LENGTH,
+    test: bool = False,
+    tool_performance_profile: Optional[bool] = None,
 ):
     """Do processing of the pylintrc file."""
     if debug:
@@ -25,6 +33,7 @@ def process_pylintrc(
         print(f"    --debug: {debug}")
         print(f"    --test: {test}")
         print(f"    --line_length: {line_length}")
+        print(f"    --tool_performance_profile: {tool_performance_profile}")
         print("")
 
     # Master Settings
@@ -52,6 +61,18 @@ def process_pylintrc(
             new_values.append(REPO_NAME)
             ignore_settings.set_values(values=new_values, separator="\n", indent=INDENT)
 
+    # tool_performance_profile: lint with one process per CPU, and only remove the value the profile writes when it is
+    # turned off explicitly, since the same value may have been set by hand
+    jobs_settings = master_section.get(PYLINTRC_MASTER_JOBS_KEY, None)
+    if tool_performance_profile:
+        master_section.set(PYLINTRC_MASTER_JOBS_KEY, PYLINTRC_MASTER_JOBS_PERFORMANCE_VALUE)
+    elif (
+        tool_performance_profile is not None
+        and jobs_settings is not None
+        and jobs_settings.value == PYLINTRC_MASTER_JOBS_PERFORMANCE_VALUE
+    ):
+        pylintrc.remove_option(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY)
+
     # Format Settings
     format_section = pylintrc.get_section(PYLINTRC_FORMAT_SECTION_KEY, None)
     if format_section is None:
@@ -63,8 +84,7 @@ def process_pylintrc(
     if not test:  # pragma: no cover
         if debug:  # pragma: no cover
             print(f"Writing {PYLINTRC_FILENAME} file")  # pragma: no cover
-        with open(PYLINTRC_FILENAME, "w", encoding="utf-8") as pylintrc_file:  # pragma: no cover
-            pylintrc.write(pylintrc_file)  # pragma: no cover
+        write_if_changed(PYLINTRC_FILENAME, dump_ini_file(pylintrc), debug=debug)  # pragma: no cover
     else:
         if debug:
             print(f"TESTING: Not Writing {PYLINTRC_FILENAME} file")
@@ -1,25 +1,32 @@
 """Do processing of the pyproject.toml file."""
 
+import re
+import shlex
 from pathlib import Path
-from typing import Optional, cast
+from typing import Any, Iterator, List, Optional, cast
 
-from tomlkit import TOMLDocument, document, dump, table
-from tomlkit.items import Table
+from tomlkit import TOMLDocument, array, document, dumps, table
+from tomlkit.items import Array, Table
 
 from src.constants.pyproject_toml import (
     PYPROJECT_AUTOPEP8_KEY,
     PYPROJECT_BLACK_KEY,
     PYPROJECT_ISORT_KEY,
+    PYPROJECT_MYPY_EXCLUDE_VALUE,
+    PYPROJECT_MYPY_KEY,
     PYPROJECT_POETRY_KEY,
     PYPROJECT_PYTEST_INI_OPTIONS_KEY,
     PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_DATE_FORMAT_VALUE,
     PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_VALUE,
     PYPROJECT_PYTEST_KEY,
+    PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE,
     PYPROJECT_TOML_FILENAME,
     PYPROJECT_TOOL_KEY,
+    PYTEST_XDIST_DISTRIBUTION,
+    REQUIREMENTS_FILENAMES,
 )
-from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
-from src.utils.core import validate_python_formatter_option
+from src.constants.shared import DEFAULT_LINE_LENGTH, MYPY_MODES, REPO_NAME
+from src.utils.core import delete_file, validate_python_formatter_option, write_if_changed
 
 
 class PyProjectTomlProcessor:
@@ -36,6 +43,9 @@ class PyProjectTomlProcessor:
         line_length: int = DEFAULT_LINE_LENGTH,
         package_manager: str = "poetry",
         is_package: bool = False,
+        mypy_enabled: bool = True,
+        mypy_mode: str = "process",
+        tool_performance_profile: Optional[bool] = None,
         debug: bool = False,
         test: bool = False,
     ):
@@ -49,6 +59,9 @@ class PyProjectTomlProcessor:
         self.line_length = line_length
         self.package_manager = package_manager
         self.is_package = is_package
+        self.mypy_enabled = mypy_enabled
+        self.mypy_mode = mypy_mode
+        self.tool_performance_profile = tool_performance_profile
         self.debug = debug
         self.test = test
 
@@ -61,6 +74,9 @@ class PyProjectTomlProcessor:
             print(f"    --line_length: {self.line_length}")
             print(f"    --package_manager: {self.package_manager}")
             print(f"    --is_package: {self.is_package}")
+            print(f"    --mypy_enabled: {self.mypy_enabled}")
+            print(f"    --mypy_mode: {self.mypy_mode}")
+            print(f"    --tool_performance_profile: {self.tool_performance_profile}")
             print(f"    --debug: {self.debug}")
             print(f"    --test: {self.test}")
             print("")
@@ -69,6 +85,8 @@ class PyProjectTomlProcessor:
         """Do processing of the pyproject.toml file."""
         # Validate String Inputs
         validate_python_formatter_option(python_formatter=self.python_formatter)
+        if self.mypy_mode not in MYPY_MODES:
+            raise ValueError(f"Invalid mypy_mode: {self.mypy_mode}. Valid Options are: {list(MYPY_MODES)}")
 
         # Fetch tools
         tools = cast(Optional[Table], self.pyproject_toml.get(PYPROJECT_TOOL_KEY))
@@ -85,6 +103,9 @@ class PyProjectTomlProcessor:
         # pytest_enabled
         self._process_pytest(tools=tools)
 
+        # mypy_mode
+        self._process_mypy(tools=tools)
+
         # Poetry package-mode
         self._poetry_package_mode(tools=tools)
 
@@ -157,6 +178,18 @@ class PyProjectTomlProcessor:
                 existing_addopts += f" {ignore_utility_repo_scripts}"
                 existing_addopts = existing_addopts.strip()
 
+            # tool_performance_profile: only add the value the profile writes, and only remove it when the profile is
+            # turned off explicitly. The arguments are compared like pytest splits them, so `-n autotune` is not it.
+            xdist_tokens = shlex.split(PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE)
+            addopts_tokens = shlex.split(existing_addopts)
+            xdist_index = _find_tokens(addopts_tokens, xdist_tokens)
+            if self.tool_performance_profile and self._declares_pytest_xdist():
+                if xdist_index is None:
+                    existing_addopts = f"{existing_addopts} {PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE}".strip()
+            elif self.tool_performance_profile is False and xdist_index is not None:
+                xdist_end = xdist_index + len(xdist_tokens)
+                existing_addopts = shlex.join([*addopts_tokens[:xdist_index], *addopts_tokens[xdist_end:]])
+
             ini_options["addopts"] = existing_addopts
 
             # Remaining Options
@@ -167,6 +200,40 @@ class PyProjectTomlProcessor:
 
             pytest_tool["ini_options"] = ini_options
 
+    def _declares_pytest_xdist(self) -> bool:
+        """Return whether pytest-xdist is a dependency of the project, `-n auto` is a usage error without it."""
+        names = set(_pyproject_dependency_names(self.pyproject_toml))
+        for filename in REQUIREMENTS_FILENAMES:
+            path = Path(filename)
+            if path.is_file():
+                names.update(_requirement_name(line) for line in path.read_text(encoding="utf-8").splitlines())
+        return PYTEST_XDIST_DISTRIBUTION in names
+
+    def _process_mypy(self, tools: Table):
+        # Only the daemon mode configures mypy, the [tool.mypy] table of the project is otherwise left alone
+        if not self.mypy_enabled or self.mypy_mode != "daemon":
+            return
+
+        mypy_tool = cast(Optional[Table], tools.get(PYPROJECT_MYPY_KEY))
+        if mypy_tool is None:
+            mypy_tool = table()
+            tools[PYPROJECT_MYPY_KEY] = mypy_tool
+        mypy_tool["incremental"] = True
+        mypy_tool["cache_dir"] = ".mypy_cache"
+        mypy_tool["sqlite_cache"] = True
+
+        # A single exclude pattern can also be written as a string
+        exclude = mypy_tool.get("exclude")
+        if not isinstance(exclude, Array):
+            patterns = array()
+            if exclude:
+                patterns.append(exclude)
+            mypy_tool["exclude"] = patterns
+            exclude = patterns
+        for pattern in PYPROJECT_MYPY_EXCLUDE_VALUE:
+            if pattern not in exclude:
+                exclude.append(pattern)
+
     def _poetry_package_mode(self, tools: Table):
         if self.package_manager == "poetry" and not self.is_package:
             poetry_tool: Table | None = cast(Optional[Table], tools.get(PYPROJECT_POETRY_KEY))
@@ -183,8 +250,7 @@ class PyProjectTomlProcessor:
                 if self.debug:  # pragma: no cover
                     print("Not Creating pyproject.toml")  # pragma: no cover
                     print("Deleting it if it exists")  # pragma: no cover
-                if Path(PYPROJECT_TOML_FILENAME).exists():  # pragma: no cover
-                    Path(PYPROJECT_TOML_FILENAME).unlink()  # pragma: no cover
+                delete_file(PYPROJECT_TOML_FILENAME, debug=self.debug)  # pragma: no cover
 
     def _handle_create(self, tools: Table):
         self._handle_removing_file(tools=tools)
@@ -193,8 +259,41 @@ class PyProjectTomlProcessor:
             if not self.test:  # pragma: no cover
                 if self.debug:  # pragma: no cover
                     print(f"Creating {PYPROJECT_TOML_FILENAME}")  # pragma: no cover
-                with open(PYPROJECT_TOML_FILENAME, "w", encoding="utf-8") as file:  # pragma: no cover
-                    dump(self.pyproject_toml, file)  # pragma: no cover
+                write_if_changed(  # pragma: no cover
+                    PYPROJECT_TOML_FILENAME, dumps(self.pyproject_toml), debug=self.debug
+                )
             else:
                 if self.debug:
                     print(f"TESTING: Not Creating {PYPROJECT_TOML_FILENAME}")
+
+
+def _find_tokens(tokens: List[str], value: List[str]) -> Optional[int]:
+    """Return the index at which the tokens of a value start, or None when the value is not one of the arguments."""
+    for index in range(len(tokens) - len(value) + 1):
+        end = index + len(value)
+        if tokens[index:end] == value:
+            return index
+    return None
+
+
+def _requirement_name(requirement: str) -> str:
+    """Return the normalised distribution name of a requirement, or an empty string for comments and options."""
+    match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", requirement)
+    return re.sub(r"[-_.]+", "-", match.group(1)).lower() if match else ""
+
+
+def _pyproject_dependency_names(pyproject_toml: Any) -> Iterator[str]:
+    """Yield the names of the dependencies declared in PEP 621, PEP 735 and poetry tables of pyproject.toml."""
+    project = pyproject_toml.get("project", {})
+    requirement_lists = [project.get("dependencies", [])]
+    requirement_lists.extend(project.get("optional-dependencies", {}).values())
+    requirement_lists.extend(pyproject_toml.get("dependency-groups", {}).values())
+    for requirements in requirement_lists:
+        # Dependency groups can also include other groups with a table
+        yield from (_requirement_name(requirement) for requirement in requirements if isinstance(requirement, str))
+
+    poetry_tool = pyproject_toml.get(PYPROJECT_TOOL_KEY, {}).get(PYPROJECT_POETRY_KEY, {})
+    dependency_tables = [poetry_tool.get("dependencies", {}), poetry_tool.get("dev-dependencies", {})]
+    dependency_tables.extend(group.get("dependencies", {}) for group in poetry_tool.get("group", {}).values())
+    for dependencies in dependency_tables:
+        yield from (_requirement_name(name) for name in dependencies)
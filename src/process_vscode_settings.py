@@ -1,10 +1,8 @@
 """Do processing of the .vscode/settings.json file."""
 
-import json
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, cast
 
-from src.constants.shared import REPO_NAME
+from src.constants.shared import DEFAULT_LINE_LENGTH, MYPY_ARGS, MYPY_MODES, REPO_NAME
 from src.constants.vscode_settings import (
     AUTOPEP8_ARGS_KEY,
     BLACK_FORMATTER_ARGS_KEY,
@@ -21,6 +19,7 @@ from src.constants.vscode_settings import (
     ISORT_ARGS_KEY,
     ISORT_ARGS_VALUE,
     MYPY_ARGS_KEY,
+    MYPY_PREFER_DAEMON_KEY,
     NAME_KEY,
     PYLINT_ARGS_KEY,
     PYLINT_ARGS_RCFILE_VALUE,
@@ -47,7 +46,8 @@ from src.constants.vscode_settings import (
     SEARCH_EXCLUDE_KEY,
     SOURCE_ORGANIZE_IMPORTS_KEY,
 )
-from src.utils.core import validate_python_formatter_option
+from src.utils.core import validate_python_formatter_option, write_if_changed
+from src.utils.prettier import dump_json
 
 
 def process_vscode_settings(  # pylint: disable=too-many-positional-arguments
@@ -61,6 +61,8 @@ def process_vscode_settings(  # pylint: disable=too-many-positional-arguments
     mypy_enabled: bool = True,
     pytest_enabled: bool = True,
     unittest_enabled: bool = False,
+    line_length: int = DEFAULT_LINE_LENGTH,
+    mypy_mode: str = "process",
 ):
     """Do processing of the .vscode/settings.json file."""
     # pylint: disable=too-many-arguments too-many-locals
@@ -75,10 +77,14 @@ def process_vscode_settings(  # pylint: disable=too-many-positional-arguments
         print(f"    --mypy_enabled: {mypy_enabled}")
         print(f"    --pytest_enabled: {pytest_enabled}")
         print(f"    --unittest_enabled: {unittest_enabled}")
+        print(f"    --line_length: {line_length}")
+        print(f"    --mypy_mode: {mypy_mode}")
         print("")
 
     # Validate String Inputs
     validate_python_formatter_option(python_formatter=python_formatter)
+    if mypy_mode not in MYPY_MODES:
+        raise ValueError(f"Invalid mypy_mode: {mypy_mode}. Valid Options are: {list(MYPY_MODES)}")
 
     # python.defaultInterpreterPath
     _process_python_default_interpreter(data=vscode_settings)
@@ -98,6 +104,7 @@ def process_vscode_settings(  # pylint: disable=too-many-positional-arguments
         pylint_enabled=pylint_enabled,
         flake8_enabled=flake8_enabled,
         mypy_enabled=mypy_enabled,
+        mypy_mode=mypy_mode,
     )
 
     # python_testing_framework
@@ -117,8 +124,9 @@ def process_vscode_settings(  # pylint: disable=too-many-positional-arguments
     if not test:  # pragma: no cover
         if debug:  # pragma: no cover
             print("Creating .vscode/settings.json")  # pragma: no cover
-        with open(".vscode/settings.json", "w", encoding="utf-8") as file:  # pragma: no cover
-            json.dump(vscode_settings, file)  # pragma: no cover
+        write_if_changed(  # pragma: no cover
+            ".vscode/settings.json", dump_json(vscode_settings, print_width=line_length, sort_keys=True), debug=debug
+        )
     else:
         if debug:
             print("TESTING: Not Creating .vscode/settings.json")
@@ -224,7 +232,7 @@ def _process_python_formatter_option(data: Dict[str, Any], python_formatter: str
 
 
 def _process_python_linter_options(
-    data: Dict[str, Any], pylint_enabled: bool, flake8_enabled: bool, mypy_enabled: bool
+    data: Dict[str, Any], pylint_enabled: bool, flake8_enabled: bool, mypy_enabled: bool, mypy_mode: str = "process"
 ):
     if pylint_enabled:
         data[PYLINT_ARGS_KEY] = [PYLINT_ARGS_RCFILE_VALUE]
@@ -237,10 +245,15 @@ def _process_python_linter_options(
         data.pop(FLAKE8_ARGS_KEY, None)
 
     if mypy_enabled:
-        data[MYPY_ARGS_KEY] = ["--ignore-missing-imports", "--follow-imports=silent"]
+        data[MYPY_ARGS_KEY] = list(MYPY_ARGS)
     else:
         data.pop(MYPY_ARGS_KEY, None)
 
+    if mypy_enabled and mypy_mode == "daemon":
+        data[MYPY_PREFER_DAEMON_KEY] = True
+    else:
+        data.pop(MYPY_PREFER_DAEMON_KEY, None)
+
 
 def _process_python_testing_options(data: Dict[str, Any], pytest_enabled: bool, unittest_enabled: bool):
     if pytest_enabled:
@@ -273,11 +286,12 @@ def _process_python_analysis_package_index_depths(data: Dict[str, Any]):
     if existing_package_index_depths is None:
         existing_package_index_depths = cast(List[Dict[str, Any]], [])
 
-    index_names_copy = deepcopy(INDEX_NAMES)
+    # Ordered set of the names that still need an entry
+    missing_index_names = dict.fromkeys(INDEX_NAMES)
 
     for item in existing_package_index_depths:
         name = cast(Optional[str], item.get(NAME_KEY))
-        if name is not None and name in index_names_copy:
+        if name is not None and name in missing_index_names:
             # Depth
             existing_depth = cast(Optional[int], item.get(DEPTH_KEY))
             if existing_depth is None or existing_depth < DEFAULT_DEPTH:
@@ -287,9 +301,9 @@ def _process_python_analysis_package_index_depths(data: Dict[str, Any]):
             # includeAllSymbols
             item[INCLUDE_ALL_SYMBOLS_KEY] = True
 
-            index_names_copy.remove(name)
+            del missing_index_names[name]
 
-    for name in index_names_copy:
+    for name in missing_index_names:
         existing_package_index_depths.append(
             {
                 NAME_KEY: name,
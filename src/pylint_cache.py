@@ -0,0 +1,261 @@
+"""Replay the pylint messages of the files that did not change since they were last linted.
+
+`python pylint_cache.py -- <pylint command> <pylint arguments> <files>` only lints the files that miss the cache with
+the pylint command, which is `pylint` or the pylint server client, and prints the cached messages of the other files.
+A file's entry is keyed by its content, the content of the project modules it imports directly, the pylint options and
+configuration files, and the pylint, astroid and python versions. Changes to modules imported indirectly are not seen,
+neither are checks that compare files, like duplicate-code, across a hit and a miss.
+
+This file runs with the python of the project virtual environment, so it only depends on the standard library.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+CACHE_VERSION = "1"
+CONFIG_FILES = (".pylintrc", "pylintrc", "pyproject.toml", "setup.cfg", "tox.ini")
+# The exit status bits pylint sets for each message type
+MESSAGE_STATUS = {"fatal": 1, "error": 2, "warning": 4, "refactor": 8, "convention": 16}
+PRUNE_AFTER_SECONDS = 30 * 24 * 60 * 60
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def cache_dir() -> Path:
+    """Return the directory of the cached pylint results, shared by every project since entries are content keyed."""
+    base_dir = os.environ.get("UTILITY_REPO_SCRIPTS_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "utility-repo-scripts"
+    )
+    return Path(base_dir) / "pylint-results"
+
+
+def _is_python_file(argument: str) -> bool:
+    if not os.path.isfile(argument):
+        return False
+    if argument.endswith((".py", ".pyi")):
+        return True
+    with open(argument, "rb") as file:
+        first_line = file.readline(256)
+    return first_line.startswith(b"#!") and b"python" in first_line
+
+
+def split_command(argv: Sequence[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Split a pylint command line into the command, the options and the files pre-commit appended."""
+    command_length = 0
+    while command_length < len(argv) and not argv[command_length].startswith("-"):
+        command_length += 1
+    files_start = len(argv)
+    while files_start > command_length and _is_python_file(argv[files_start - 1]):
+        files_start -= 1
+    return list(argv[:command_length]), list(argv[command_length:files_start]), list(argv[files_start:])
+
+
+def _hash_file(digest: Any, path: Path):
+    digest.update(str(path).encode("utf-8") + b"\0")
+    try:
+        digest.update(path.read_bytes())
+    except OSError:
+        digest.update(b"missing")
+    digest.update(b"\0")
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return ""
+
+
+def supports_json2() -> bool:
+    """Return whether the installed pylint has the json2 reporter the messages are read from, added in pylint 3."""
+    major = _distribution_version("pylint").split(".", 1)[0]
+    return major.isdigit() and int(major) >= 3
+
+
+def options_key(options: Sequence[str]) -> str:
+    """Return the part of the key shared by every file: pylint options, configuration files and versions."""
+    digest = hashlib.sha256()
+    for value in (CACHE_VERSION, sys.version, _distribution_version("pylint"), _distribution_version("astroid")):
+        digest.update(value.encode("utf-8") + b"\0")
+    config_files = [Path(name) for name in CONFIG_FILES]
+    for index, option in enumerate(options):
+        digest.update(option.encode("utf-8") + b"\0")
+        if option.startswith("--rcfile="):
+            config_files.append(Path(option.split("=", 1)[1]))
+        elif option == "--rcfile" and index + 1 < len(options):
+            config_files.append(Path(options[index + 1]))
+    for config_file in config_files:
+        _hash_file(digest, config_file)
+    return digest.hexdigest()
+
+
+def imported_files(path: Path) -> List[Path]:
+    """Return the project files a file imports directly, looked up from the working directory and its own package."""
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (SyntaxError, ValueError):
+        return []
+
+    # (directory the module is looked up from, dotted module name)
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update((root, alias.name) for alias in node.names for root in (Path("."), path.parent))
+        elif isinstance(node, ast.ImportFrom):
+            roots: Tuple[Path, ...] = (Path("."), path.parent)
+            if node.level:
+                package_dir = path.parent
+                for _ in range(node.level - 1):
+                    package_dir = package_dir.parent
+                roots = (package_dir,)
+            prefix = f"{node.module}." if node.module else ""
+            for root in roots:
+                if node.module:
+                    modules.add((root, node.module))
+                # `from package import module`
+                modules.update((root, f"{prefix}{alias.name}") for alias in node.names)
+
+    files = set()
+    for root, name in modules:
+        parts = name.split(".")
+        for length in range(1, len(parts) + 1):
+            module_path = root.joinpath(*parts[:length])
+            for candidate in (module_path.with_suffix(".py"), module_path / "__init__.py"):
+                if candidate.is_file() and candidate.resolve() != path.resolve():
+                    files.add(candidate)
+    return sorted(files)
+
+
+def file_key(shared_key: str, path: Path) -> str:
+    """Return the cache key of a file."""
+    digest = hashlib.sha256(shared_key.encode("utf-8"))
+    _hash_file(digest, path)
+    for imported_file in imported_files(path):
+        _hash_file(digest, imported_file)
+    return digest.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / key[:2] / f"{key}.json"
+
+
+def read_entry(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the cached messages of a key, or None on a miss."""
+    entry_path = _entry_path(key)
+    try:
+        messages = json.loads(entry_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # Entries are pruned by last use
+    os.utime(entry_path)
+    return messages
+
+
+def write_entry(key: str, messages: List[Dict[str, Any]]):
+    """Cache the messages of a key, atomically so concurrent hooks never read half an entry."""
+    entry_path = _entry_path(key)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=entry_path.parent, delete=False, encoding="utf-8") as file:
+        json.dump(messages, file)
+    os.replace(file.name, entry_path)
+
+
+def prune_cache(now: Optional[float] = None):
+    """Delete the entries that were not used for PRUNE_AFTER_SECONDS, at most once per PRUNE_INTERVAL_SECONDS."""
+    now = time.time() if now is None else now
+    marker = cache_dir() / ".last-prune"
+    try:
+        if now - marker.stat().st_mtime < PRUNE_INTERVAL_SECONDS:
+            return
+    except OSError:
+        pass
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    for entry_path in cache_dir().glob("*/*.json"):
+        try:
+            if now - entry_path.stat().st_mtime > PRUNE_AFTER_SECONDS:
+                entry_path.unlink()
+        except OSError:
+            pass
+
+
+def format_messages(module: str, messages: List[Dict[str, Any]]) -> str:
+    """Format messages like the pylint text reporter."""
+    lines = [f"************* Module {module}"]
+    for message in messages:
+        lines.append(
+            f"{message['path']}:{message['line']}:{message['column']}: {message['messageId']}: "
+            f"{message['message']} ({message['symbol']})"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def lint(command: Sequence[str], options: Sequence[str], files: Sequence[str]) -> Tuple[int, List[Dict[str, Any]]]:
+    """Lint files with the pylint command and return its exit status and messages, read from an extra JSON report."""
+    with tempfile.TemporaryDirectory() as report_dir:
+        report_path = os.path.join(report_dir, "report.json")
+        output_format = f"--output-format=text,json2:{report_path}"
+        status = subprocess.run([*command, *options, output_format, *files], check=False).returncode
+        try:
+            with open(report_path, encoding="utf-8") as report:
+                return status, json.load(report)["messages"]
+        except (OSError, ValueError, KeyError):
+            return status, []
+
+
+def run(argv: Sequence[str]) -> int:
+    """Lint the files that miss the cache and replay the cached messages of the others."""
+    command, options, files = split_command(argv)
+    # Older pylint versions cannot write the JSON report, so their messages are never cached
+    if not command or not files or not supports_json2():
+        return subprocess.run(list(argv), check=False).returncode
+
+    shared_key = options_key(options)
+    keys = {file: file_key(shared_key, Path(file)) for file in files}
+    status = 0
+    misses = []
+    for file in files:
+        messages = read_entry(keys[file])
+        if messages is None:
+            misses.append(file)
+        elif messages:
+            sys.stdout.write(format_messages(messages[0]["module"], messages))
+            for message in messages:
+                status |= MESSAGE_STATUS.get(message["type"], 0)
+    sys.stdout.flush()
+
+    if misses:
+        lint_status, messages = lint(command, options, misses)
+        status |= lint_status
+        # A fatal or usage error means some files were not linted
+        if not lint_status & (MESSAGE_STATUS["fatal"] | 32):
+            by_path: Dict[str, List[Dict[str, Any]]] = {os.path.normpath(file): [] for file in misses}
+            for message in messages:
+                by_path.setdefault(os.path.normpath(message["path"]), []).append(message)
+            for file in misses:
+                write_entry(keys[file], by_path[os.path.normpath(file)])
+        prune_cache()
+
+    if "--exit-zero" in options:
+        return 0
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the pylint command given after `--` through the cache."""
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ["--"]:
+        args = args[1:]
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Run pylint in a long lived local server that keeps the astroid trees of the dependencies between runs.
+
+`python pylint_server.py <pylint arguments>` is a thin client. It sends the arguments to the server of the current
+project and virtual environment over a Unix socket, prints what pylint printed and exits with its status. The server is
+started on demand, lints one request at a time and exits once it has been idle for IDLE_TIMEOUT seconds. pylint runs in
+a new process instead when the server cannot be reached.
+
+Between runs the server drops the astroid trees of the project modules and of the modules whose file changed, so only
+the dependencies stay parsed and inferred. It restarts when pylint or astroid is reinstalled.
+
+This file runs with the python of the project virtual environment, the client does not import pylint and the whole file
+only depends on the standard library and on the pylint installed in that environment.
+"""
+
+import fcntl
+import hashlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+IDLE_TIMEOUT = 30 * 60
+START_TIMEOUT = 60
+SERVE_ARGUMENT = "--serve"
+
+
+class ServerPaths(NamedTuple):
+    """The socket of a server, the lock taken to start it and its log file."""
+
+    socket: Path
+    lock: Path
+    log: Path
+
+
+def server_paths(project_dir: str, environment: str = sys.prefix) -> ServerPaths:
+    """Return the paths of the server of a project and virtual environment, in a directory only the user can access."""
+    server_dir = Path(tempfile.gettempdir()) / f"urs-pylint-{os.getuid()}"
+    server_dir.mkdir(mode=0o700, exist_ok=True)
+    status = server_dir.stat()
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f"{server_dir} must be owned by the current user and not accessible to others")
+
+    # Unix socket paths are limited to about 100 characters, so the project is identified by a hash
+    key = hashlib.sha1(f"{project_dir}\0{environment}".encode("utf-8")).hexdigest()[:16]
+    return ServerPaths(
+        socket=server_dir / f"{key}.sock", lock=server_dir / f"{key}.lock", log=server_dir / f"{key}.log"
+    )
+
+
+def send_request(socket_path: Path, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Send a request to a server and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        return json.loads(_receive(client))
+
+
+def _receive(connection: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def start_server(paths: ServerPaths):
+    """Start a server in the background, detached from the hook so pre-commit does not wait for it."""
+    with open(paths.log, "ab") as log:
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, __file__, SERVE_ARGUMENT, str(paths.socket)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+
+def request_lint(paths: ServerPaths, request: Dict[str, Any], start_timeout: float = START_TIMEOUT) -> Dict[str, Any]:
+    """Send a lint request, starting the server first when it is not running or has to restart."""
+    try:
+        response = send_request(paths.socket, request)
+        if not response.get("restart"):
+            return response
+    except (ConnectionError, FileNotFoundError):
+        pass
+
+    # Only one client starts a server, the others wait for it
+    with open(paths.lock, "a", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        deadline = time.monotonic() + start_timeout
+        started = False
+        while True:
+            try:
+                response = send_request(paths.socket, request)
+                if not response.get("restart"):
+                    return response
+                started = False
+            except (ConnectionError, FileNotFoundError):
+                if time.monotonic() > deadline:
+                    raise
+            if not started:
+                start_server(paths)
+                started = True
+            time.sleep(0.1)
+
+
+def run_pylint_process(args: Sequence[str]) -> int:
+    """Run pylint in a new process."""
+    return subprocess.run([sys.executable, "-m", "pylint", *args], check=False).returncode
+
+
+def client(args: Sequence[str]) -> int:
+    """Lint through the server of the current project and virtual environment."""
+    try:
+        response = request_lint(server_paths(os.getcwd()), {"cwd": os.getcwd(), "args": list(args)})
+    except OSError as error:
+        print(f"The pylint server is not available ({error}), running pylint in a new process", file=sys.stderr)
+        return run_pylint_process(args)
+
+    sys.stdout.write(response["output"])
+    return int(response["status"])
+
+
+def run_pylint(cwd: str, args: Sequence[str]) -> Tuple[int, str]:
+    """Run pylint in this process and return its exit status and output."""
+    from pylint.lint import Run  # pylint: disable=import-outside-toplevel
+
+    class ServerRun(Run):  # pylint: disable=too-few-public-methods
+        """Close the files reporters write to, like `--output-format=json2:<file>`, before answering.
+
+        pylint only closes them when the linter is collected, which does not happen soon in a long lived process.
+        """
+
+        def __init__(self, run_args: List[str]):
+            try:
+                super().__init__(run_args)
+            finally:
+                reporter = getattr(getattr(self, "linter", None), "reporter", None)
+                close_output_files = getattr(reporter, "close_output_files", None)
+                if close_output_files is not None:
+                    close_output_files()
+
+    output = io.StringIO()
+    previous_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                # Worker processes would not share the astroid trees the server keeps, so lint in this process
+                # unless the hook itself asks for jobs. Command line options override the configuration file.
+                ServerRun(["--jobs=1", *args])
+                status = 0
+            except SystemExit as error:
+                status = error.code if isinstance(error.code, int) else int(error.code is not None)
+    finally:
+        os.chdir(previous_cwd)
+    return status, output.getvalue()
+
+
+def refresh_astroid_cache(manager: Any, project_dir: str, loaded_at: Dict[str, float], last_run: float) -> List[str]:
+    """Drop the cached trees of the project modules and of the modules whose file changed since they were built.
+
+    `loaded_at` tracks when each cached module was built: modules that are new in the cache were built during the run
+    that started at `last_run`. Modules of the virtual environment are not project modules, even inside the project.
+    Return the names of the dropped modules.
+    """
+    project = os.path.join(os.path.realpath(project_dir), "")
+    environment = os.path.join(os.path.realpath(sys.prefix), "")
+    dropped = []
+    for name, module in list(manager.astroid_cache.items()):
+        path = getattr(module, "file", None)
+        if not path:
+            # Built from a live module, like builtins
+            continue
+
+        built_at = loaded_at.setdefault(name, last_run)
+        real_path = os.path.realpath(path)
+        try:
+            changed = os.stat(real_path).st_mtime > built_at
+        except OSError:
+            changed = True
+        if changed or (real_path.startswith(project) and not real_path.startswith(environment)):
+            del manager.astroid_cache[name]
+            del loaded_at[name]
+            dropped.append(name)
+
+    # Module lookups, so files added or removed since the last run are found
+    getattr(manager, "_mod_file_cache", {}).clear()
+    return dropped
+
+
+def _installation_fingerprint() -> Tuple[int, ...]:
+    import astroid  # pylint: disable=import-outside-toplevel
+    import pylint  # pylint: disable=import-outside-toplevel
+
+    return tuple(os.stat(str(module.__file__)).st_mtime_ns for module in (pylint, astroid))
+
+
+class PylintServer:
+    """Lint the requests of one project and virtual environment, one at a time."""
+
+    def __init__(
+        self,
+        socket_path: Path,
+        idle_timeout: float = IDLE_TIMEOUT,
+        lint: Callable[[str, Sequence[str]], Tuple[int, str]] = run_pylint,
+        manager: Optional[Any] = None,
+        fingerprint: Callable[[], Tuple[int, ...]] = _installation_fingerprint,
+    ):  # pylint: disable=too-many-arguments
+        """Initialize the PylintServer class."""
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.lint = lint
+        self.manager = manager
+        self.fingerprint = fingerprint
+        self.installation = fingerprint()
+        self.loaded_at: Dict[str, float] = {}
+        self.last_run = time.time()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Lint a request, or ask the client to restart the server when pylint or astroid was reinstalled."""
+        if self.fingerprint() != self.installation:
+            return {"restart": True}
+
+        if self.manager is None:
+            from astroid import MANAGER  # pylint: disable=import-outside-toplevel
+
+            self.manager = MANAGER
+        refresh_astroid_cache(self.manager, request["cwd"], self.loaded_at, self.last_run)
+        self.last_run = time.time()
+        status, output = self.lint(request["cwd"], request["args"])
+        return {"status": status, "output": output}
+
+    def serve_forever(self):
+        """Serve requests until the server has been idle for idle_timeout seconds or has to restart."""
+        previous_umask = os.umask(0o077)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+                self.socket_path.unlink(missing_ok=True)
+                server.bind(str(self.socket_path))
+                bound = self.socket_path.stat().st_ino
+                server.listen()
+                server.settimeout(self.idle_timeout)
+                try:
+                    self._serve(server)
+                finally:
+                    # A server started to replace this one may already be listening on the same path
+                    if self.socket_path.exists() and self.socket_path.stat().st_ino == bound:
+                        self.socket_path.unlink()
+        finally:
+            os.umask(previous_umask)
+
+    def _serve(self, server: socket.socket):
+        while True:
+            try:
+                connection, _address = server.accept()
+            except socket.timeout:
+                return
+            with connection:
+                connection.settimeout(None)
+                data = _receive(connection)
+                if not data:
+                    continue
+                try:
+                    response = self.handle(json.loads(data))
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    response = {"status": 32, "output": f"pylint server error: {error!r}\n"}
+                connection.sendall(json.dumps(response).encode("utf-8"))
+            if response.get("restart"):
+                return
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Serve with `--serve <socket>`, otherwise lint the arguments through the server."""
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == [SERVE_ARGUMENT]:
+        PylintServer(Path(args[1])).serve_forever()
+        return 0
+    return client(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
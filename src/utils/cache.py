@@ -0,0 +1,67 @@
+"""Content-hash cache used to skip config processors whose inputs did not change."""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+CACHE_FILENAME = ".venv/.urs-cache.json"
+CACHE_FORMAT_VERSION = 1
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+
+@lru_cache(maxsize=None)
+def fingerprint_source() -> str:
+    """Hash the source code of the processors so that any change to utility-repo-scripts invalidates the cache."""
+    digest = hashlib.sha256()
+    for path in sorted(SRC_DIR.rglob("*.py")):
+        digest.update(path.relative_to(SRC_DIR).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def compute_step_key(step: str, filenames: List[str], options: Dict[str, Any]) -> str:
+    """Hash everything a processor depends on: its input files, the effective options and the source code."""
+    digest = hashlib.sha256()
+    header = {
+        "format": CACHE_FORMAT_VERSION,
+        "source": fingerprint_source(),
+        "step": step,
+        "options": options,
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+    for filename in filenames:
+        path = Path(filename)
+        digest.update(b"\0" + filename.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() if path.is_file() else b"<missing>")
+    return digest.hexdigest()
+
+
+def cache_enabled() -> bool:
+    """The cache lives in the project's virtual environment so that rebuilding the venv also resets it."""
+    return Path(CACHE_FILENAME).parent.is_dir()
+
+
+def load_cache() -> Dict[str, str]:
+    """Load the step keys recorded by the previous run."""
+    try:
+        with open(CACHE_FILENAME, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT_VERSION:
+        return {}
+    steps = data.get("steps")
+    return {str(step): str(key) for step, key in steps.items()} if isinstance(steps, dict) else {}
+
+
+def save_cache(keys: Dict[str, str]):
+    """Persist the step keys for the next run."""
+    tmp_path = Path(f"{CACHE_FILENAME}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({"format": CACHE_FORMAT_VERSION, "steps": keys}, file, indent=2, sort_keys=True)
+        file.write("\n")
+    tmp_path.replace(CACHE_FILENAME)
@@ -27,3 +27,8 @@ def load_ini_file(debug: bool, exists: bool, filename: str, sample: str):
         data.read_string(sample)
 
     return data
+
+
+def dump_ini_file(data: ConfigUpdater) -> str:
+    """Serialise an ini file without trailing whitespace."""
+    return "\n".join(line.rstrip() for line in str(data).split("\n"))
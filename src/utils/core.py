@@ -1,11 +1,17 @@
 """Core Python utility functions for the project."""
 
 import json
+import os
+import stat
+import tempfile
 from argparse import ArgumentTypeError
-from copy import deepcopy
 from os import getenv
 from pathlib import Path
-from typing import Any, Dict, Union, cast
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Union, cast
+
+# Files created, replaced or deleted by write_if_changed/delete_file since the last call to pop_changed_files
+_CHANGED_FILES: List[str] = []
 
 
 def validate_python_formatter_option(python_formatter: str):
@@ -27,7 +33,25 @@ def str2bool(value: Union[str, bool, Any]):
     raise ArgumentTypeError("Boolean value expected.")
 
 
-def load_json_file(debug: bool, exists: bool, filename: str, sample: Dict[str, Any]):
+def freeze(value: Any) -> Any:
+    """Return a read only version of a constant template: dicts become mapping proxies and lists become tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable copy of a frozen template, made when it is inserted into a document."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def load_json_file(debug: bool, exists: bool, filename: str, sample: Mapping[str, Any]):
     """Load a json file or create it from a sample."""
     if exists:
         if debug:
@@ -42,5 +66,62 @@ def load_json_file(debug: bool, exists: bool, filename: str, sample: Dict[str, A
         with open(Path(filepath).resolve(), "r", encoding="utf-8") as file:
             data = cast(Dict[str, Any], json.load(file))
     else:
-        data = cast(Dict[str, Any], deepcopy(sample))
+        data = cast(Dict[str, Any], thaw(sample))
     return data
+
+
+def _default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_if_changed(filename: str, content: str, debug: bool = False) -> bool:
+    """Atomically replace a file with `content`, leaving it untouched when it already holds exactly that content.
+
+    Returns whether the file was written.
+    """
+    path = Path(os.path.realpath(filename))
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            if debug:
+                print(f"{filename} is already up to date")
+            return False
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = _default_file_mode()
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    if debug:
+        print(f"Wrote {filename}")
+    _CHANGED_FILES.append(filename)
+    return True
+
+
+def delete_file(filename: str, debug: bool = False) -> bool:
+    """Delete a file if it exists and return whether it did."""
+    path = Path(filename)
+    if not path.exists():
+        return False
+    path.unlink()
+    if debug:
+        print(f"Deleted {filename}")
+    _CHANGED_FILES.append(filename)
+    return True
+
+
+def pop_changed_files() -> List[str]:
+    """Return the files changed since the last call, in the order they were changed, and reset the list."""
+    changed_files = list(dict.fromkeys(_CHANGED_FILES))
+    _CHANGED_FILES.clear()
+    return changed_files
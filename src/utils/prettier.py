@@ -0,0 +1,77 @@
+"""Serialise json files in the layout Prettier gives them, so that no Node.js round-trip is needed."""
+
+import json
+from typing import Any, List, Optional
+
+from src.constants.shared import DEFAULT_LINE_LENGTH
+
+INDENT = "  "
+
+
+def _dump_scalar(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _dump_inline_array(value: List[Any]) -> Optional[str]:
+    """Return the single line form of an array, or None when Prettier would always break it."""
+    # Objects are always expanded, and so are arrays where every element is an array of more than one element
+    if len(value) > 1 and all(isinstance(item, (list, tuple)) and len(item) > 1 for item in value):
+        return None
+
+    items: List[str] = []
+    for item in value:
+        if isinstance(item, dict):
+            if item:
+                return None
+            items.append("{}")
+        elif isinstance(item, (list, tuple)):
+            inline_item = _dump_inline_array(list(item)) if item else "[]"
+            if inline_item is None:
+                return None
+            items.append(inline_item)
+        else:
+            items.append(_dump_scalar(item))
+    return f"[{', '.join(items)}]"
+
+
+def _dump_value(value: Any, level: int, column: int, trailing: int, print_width: int, sort_keys: bool) -> str:
+    """Dump a value that starts at `column` and is followed by `trailing` characters on the same line."""
+    indent = INDENT * (level + 1)
+
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = sorted(value.items(), key=lambda item: str(item[0])) if sort_keys else list(value.items())
+        lines: List[str] = []
+        for index, (key, item) in enumerate(items):
+            separator = "," if index < len(items) - 1 else ""
+            prefix = f"{indent}{_dump_scalar(str(key))}: "
+            lines.append(
+                prefix + _dump_value(item, level + 1, len(prefix), len(separator), print_width, sort_keys) + separator
+            )
+        return "{\n" + "\n".join(lines) + "\n" + INDENT * level + "}"
+
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return "[]"
+        inline = _dump_inline_array(list(value))
+        if inline is not None and column + len(inline) + trailing <= print_width:
+            return inline
+        lines = []
+        for index, item in enumerate(value):
+            separator = "," if index < len(value) - 1 else ""
+            lines.append(
+                indent + _dump_value(item, level + 1, len(indent), len(separator), print_width, sort_keys) + separator
+            )
+        return "[\n" + "\n".join(lines) + "\n" + INDENT * level + "]"
+
+    return _dump_scalar(value)
+
+
+def dump_json(data: Any, print_width: int = DEFAULT_LINE_LENGTH, sort_keys: bool = False) -> str:
+    """Serialise json data with 2 space indentation the way Prettier formats it.
+
+    Objects are always expanded, arrays stay on a single line when they fit in `print_width`, and the output ends with
+    a newline. `sort_keys` sorts every object recursively, like `sort-json` does.
+    """
+    return _dump_value(data, 0, 0, 0, print_width, sort_keys) + "\n"
@@ -1,12 +1,16 @@
 """ruamel.yaml utility functions."""
 
-from copy import deepcopy
+from io import StringIO
 from os import getenv
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
 
 from ruamel.yaml import YAML
-from ruamel.yaml.comments import CommentedMap
+from ruamel.yaml.comments import CommentedMap, CommentedSeq
+from ruamel.yaml.emitter import RoundTripEmitter
+from ruamel.yaml.tokens import CommentToken
+
+from src.utils.core import thaw
 
 
 def load_yaml_file(debug: bool, exists: bool, filename: str, sample: str):
@@ -30,150 +34,269 @@ def load_yaml_file(debug: bool, exists: bool, filename: str, sample: str):
     return data
 
 
-def find_repo_index(pre_commit_config: Dict[str, Any], repo_url: str) -> int:
-    """Find the hook index of a given `repo_url` in the .pre-commit-config.yaml file."""
-    for index, repo in enumerate(cast(List[Dict[str, Any]], pre_commit_config.get("repos", []))):
-        if repo.get("repo") == repo_url:
-            return index
-    raise ValueError(f"Could not find repo: {repo_url}")
+class PrettierEmitter(RoundTripEmitter):
+    """Emit quoted scalars with double quotes, like Prettier does, unless that would need escaping."""
+
+    def choose_scalar_style(self) -> Any:
+        style = super().choose_scalar_style()
+        if style == "'" and '"' not in self.event.value:
+            return '"'
+        return style
+
+
+def _collapse_comment_indentation(node: Any):
+    """Put end of line comments a single space after their value, like Prettier does."""
+    if isinstance(node, (CommentedMap, CommentedSeq)):
+        for tokens in node.ca.items.values():
+            for token in tokens:
+                if isinstance(token, CommentToken) and token.value.startswith("#"):
+                    token.column = 0
+        for child in node.values() if isinstance(node, CommentedMap) else node:
+            _collapse_comment_indentation(child)
+
+
+def dump_yaml(data: Any) -> str:
+    """Serialise yaml data in the layout Prettier gives the .pre-commit-config.yaml file."""
+    yaml = YAML()
+    yaml.Emitter = PrettierEmitter
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    yaml.width = 4096  # Prettier does not fold long scalars
+    _collapse_comment_indentation(data)
+    stream = StringIO()
+    yaml.dump(data, stream)
+    return stream.getvalue()
+
+
+class PreCommitConfig:
+    """Index the repos of a .pre-commit-config.yaml file by url and their hooks by id.
+
+    The indexes are built once so that lookups do not have to scan the repos and hooks lists. They are kept in sync
+    with the repos and hooks added or removed through this class, which edits the wrapped data in place so that
+    comments are preserved.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """Build the repo and hook indexes of the wrapped data."""
+        self.data = data
+        self.repos = cast(List[Dict[str, Any]], data.get("repos") or [])
+        # Repos and hooks can be repeated (mostly local ones), the first one is the one that gets updated
+        self._repos_by_url: Dict[str, List[Dict[str, Any]]] = {}
+        self._hooks_by_repo: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+        for repo in self.repos:
+            self._index_repo(repo)
 
+    def _index_repo(self, repo: Dict[str, Any]):
+        self._repos_by_url.setdefault(repo.get("repo"), []).append(repo)  # type: ignore[arg-type]
+        hooks_by_id: Dict[str, List[Dict[str, Any]]] = {}
+        for hook in cast(List[Dict[str, Any]], repo.get("hooks") or []):
+            hooks_by_id.setdefault(hook.get("id"), []).append(hook)  # type: ignore[arg-type]
+        self._hooks_by_repo[id(repo)] = hooks_by_id
 
-def find_hook_id_index(pre_commit_repo: Dict[str, Any], hook_id: str):
-    """Find the hook index of a given `hook_id` in the .pre-commit-config.yaml file."""
-    for index, hook in enumerate(cast(List[Dict[str, Any]], pre_commit_repo.get("hooks", []))):
-        if hook.get("id") == hook_id:
+    def find_repo(self, repo_url: str) -> Optional[Dict[str, Any]]:
+        """Return the first repo with the given url."""
+        repos = self._repos_by_url.get(repo_url)
+        return repos[0] if repos else None
+
+    def find_hook(self, repo: Dict[str, Any], hook_id: str) -> Optional[Dict[str, Any]]:
+        """Return the first hook of `repo` with the given id."""
+        hooks = self._hooks_by_repo[id(repo)].get(hook_id)
+        return hooks[0] if hooks else None
+
+    def append_repo(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a repo at the end of the repos list."""
+        self.repos.append(repo)
+        self.data["repos"] = self.repos
+        self._index_repo(repo)
+        return repo
+
+    def remove_repo(self, repo: Dict[str, Any]):
+        """Remove a repo from the repos list."""
+        del self.repos[_identity_index(self.repos, repo)]
+        self._repos_by_url[repo.get("repo")].remove(repo)  # type: ignore[index]
+        del self._hooks_by_repo[id(repo)]
+
+    def append_hook(self, repo: Dict[str, Any], hook: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a hook at the end of the hooks of `repo`."""
+        hooks = cast(List[Dict[str, Any]], repo.get("hooks") or [])
+        hooks.append(hook)
+        repo["hooks"] = hooks
+        self._hooks_by_repo[id(repo)].setdefault(hook.get("id"), []).append(hook)  # type: ignore[arg-type]
+        return hook
+
+    def remove_hook(self, repo: Dict[str, Any], hook_id: str) -> bool:
+        """Remove the first hook of `repo` with the given id, and the repo itself once it has no hooks left."""
+        hook = self.find_hook(repo, hook_id)
+        if hook is None:
+            return False
+
+        hooks = cast(List[Dict[str, Any]], repo["hooks"])
+        del hooks[_identity_index(hooks, hook)]
+        self._hooks_by_repo[id(repo)][hook_id].pop(0)
+        if not hooks:
+            self.remove_repo(repo)
+        return True
+
+
+def _identity_index(items: List[Any], item: Any) -> int:
+    # list.index compares by equality, which would match an identical copy of the item
+    for index, candidate in enumerate(items):
+        if candidate is item:
             return index
-    raise ValueError(f"Could not find hook with id {hook_id} in repo: {pre_commit_repo.get('repo')}")
+    raise ValueError(f"{item} is not in list")
+
+
+def _indexed(pre_commit_config: Union[Dict[str, Any], PreCommitConfig]) -> PreCommitConfig:
+    if isinstance(pre_commit_config, PreCommitConfig):
+        return pre_commit_config
+    return PreCommitConfig(pre_commit_config)
 
 
 def _remove_local_hook(
-    pre_commit_config: Dict[str, Any],
-    repos: List[Dict[str, Any]],
+    pre_commit_config: PreCommitConfig,
     repo_url: str,
     local_ids: Optional[List[str]],
     debug: bool = False,
 ):
     if debug and local_ids:
         print(f"Removing local hook(s) {local_ids} from repo: {repo_url}")
-    try:
-        hook_index = find_repo_index(pre_commit_config, repo_url)
-    except ValueError:
+    pre_commit_repo = pre_commit_config.find_repo(repo_url)
+    if pre_commit_repo is None:
         # If the local repo doesn't exist, we don't need to do anything
         return
 
-    pre_commit_repo = repos[hook_index]
-
     if not local_ids:
         raise ValueError("Unable to remove local hooks without specifying the hook id(s) to remove.")
 
     for local_id in local_ids:
-        try:
-            hook_id_index = find_hook_id_index(pre_commit_repo, local_id)
-        except ValueError:
-            # If the local hook doesn't exist, we don't need to do anything
-            continue
-
-        hooks = cast(List[Dict[str, Any]], pre_commit_repo.get("hooks", []))
-        hooks.pop(hook_id_index)
-
-        if len(hooks) == 0:
-            repos.pop(hook_index)
-        else:
-            pre_commit_repo["hooks"] = hooks
-            repos[hook_index] = pre_commit_repo
+        # If the local hook doesn't exist, we don't need to do anything
+        pre_commit_config.remove_hook(pre_commit_repo, local_id)
 
 
 def remove_hooks(
-    pre_commit_config: Dict[str, Any],
+    pre_commit_config: Union[Dict[str, Any], PreCommitConfig],
     repo_urls: List[str],
     local_ids: Optional[List[str]] = None,
     debug: bool = False,
 ) -> None:
     """Remove hooks from the .pre-commit-config.yaml file."""
-    repos = cast(List[Dict[str, Any]], pre_commit_config.get("repos", []))
+    config = _indexed(pre_commit_config)
 
     for repo_url in repo_urls:
         if repo_url == "local":
-            _remove_local_hook(
-                pre_commit_config=pre_commit_config,
-                repos=repos,
-                repo_url=repo_url,
-                local_ids=local_ids,
-                debug=debug,
-            )
+            _remove_local_hook(pre_commit_config=config, repo_url=repo_url, local_ids=local_ids, debug=debug)
         else:
-            try:
-                hook_index = find_repo_index(pre_commit_config, repo_url)
-            except ValueError:
-                # If the repo doesn't exist, we don't need to do anything
-                continue
+            pre_commit_repo = config.find_repo(repo_url)
+            if pre_commit_repo is not None:
+                config.remove_repo(pre_commit_repo)
+
+
+APPEND_UNIQUE = "append_unique"
+REPLACE = "replace"
+KEYED_BY_ID = "keyed_by_id"
+LIST_MERGE_STRATEGIES = (APPEND_UNIQUE, REPLACE, KEYED_BY_ID)
+# Lists not listed here are merged with APPEND_UNIQUE
+DEFAULT_LIST_MERGE_STRATEGIES: Dict[str, str] = {"hooks": KEYED_BY_ID}
+
+
+def fingerprint(value: Any) -> Any:
+    """Return a hashable value that is equal for two values exactly when they compare equal.
+
+    Mappings compare regardless of key order and sequences compare item by item, so they are fingerprinted as a
+    frozenset of items and a tuple of items respectively.
+    """
+    if isinstance(value, Mapping):
+        return (dict, frozenset((fingerprint(key), fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(fingerprint(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        return (repr, repr(value))
+    return value
+
+
+def _merge_list(existing_list: List[Any], updates: Sequence[Any], strategy: str, strategies: Dict[str, str]):
+    if strategy not in LIST_MERGE_STRATEGIES:
+        raise ValueError(f"Invalid list merge strategy: {strategy}. Valid strategies are: {LIST_MERGE_STRATEGIES}")
+
+    if strategy == REPLACE:
+        existing_list[:] = thaw(updates)
+        return
+
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    if strategy == KEYED_BY_ID:
+        for item in existing_list:
+            if isinstance(item, dict) and "id" in item:
+                by_id.setdefault(fingerprint(item["id"]), item)
+
+    seen = {fingerprint(item) for item in existing_list}
+    for item in updates:
+        if by_id and isinstance(item, Mapping) and "id" in item and fingerprint(item["id"]) in by_id:
+            deep_update(by_id[fingerprint(item["id"])], item, strategies)
+            continue
+        item_fingerprint = fingerprint(item)
+        if item_fingerprint not in seen:
+            seen.add(item_fingerprint)
+            existing_list.append(thaw(item))
 
-            repos.pop(hook_index)
 
-    pre_commit_config["repos"] = repos
+def deep_update(source: dict, updates: Mapping[str, Any], strategies: Optional[Dict[str, str]] = None):
+    """Recursively update a dictionary.
 
+    Lists are merged with the strategy `strategies` gives for their key, at any depth: APPEND_UNIQUE adds the items
+    that are not in the list yet, REPLACE replaces the list, and KEYED_BY_ID updates the items with the same `id` and
+    adds the others. The order of the existing items is preserved and new items are added in the order of `updates`.
 
-def deep_update(source: dict, updates: dict):
-    """Recursively update a dictionary."""
+    `updates` can be a frozen template, only the values inserted into `source` are copied.
+    """
+    if strategies is None:
+        strategies = DEFAULT_LIST_MERGE_STRATEGIES
     for key, value in updates.items():
-        if isinstance(value, dict):
-            source[key] = deep_update(source.get(key, {}), value)
-        elif isinstance(value, list):
+        if isinstance(value, Mapping):
+            existing_dict = source.get(key, {})
+            if not isinstance(existing_dict, dict):
+                existing_dict = {}
+            source[key] = deep_update(existing_dict, value, strategies)
+        elif isinstance(value, (list, tuple)):
             existing_list = source.get(key, [])
             if not isinstance(existing_list, list):
                 existing_list = []
-            for item in value:
-                if item not in existing_list:
-                    existing_list.append(item)
+            _merge_list(existing_list, value, strategies.get(key, APPEND_UNIQUE), strategies)
             source[key] = existing_list
         else:
             source[key] = value
     return source
 
 
-def update_repo_rev(pre_commit_config: CommentedMap, repo_url: str, repo_default: Dict[str, Any], rev: str):
+def update_repo_rev(
+    pre_commit_config: Union[CommentedMap, PreCommitConfig], repo_url: str, repo_default: Mapping[str, Any], rev: str
+):
     """Update a repo rev in the .pre-commit-config.yaml file."""
-    try:
-        existing_repo_index = find_repo_index(pre_commit_config, repo_url)
-    except ValueError:
-        existing_repo_index = None
-
-    repos = cast(List[Dict[str, Any]], pre_commit_config.get("repos", []))
-    if existing_repo_index is None:
-        repos.append(deepcopy(repo_default))
-        pre_commit_config["repos"] = repos
+    config = _indexed(pre_commit_config)
+    existing_repo = config.find_repo(repo_url)
+    if existing_repo is None:
+        config.append_repo(thaw(repo_default))
     else:
-        existing_repo = repos[existing_repo_index]
         existing_repo["rev"] = rev
-    pre_commit_config["repos"] = repos
 
 
 def update_hook(
-    pre_commit_config: CommentedMap,
+    pre_commit_config: Union[CommentedMap, PreCommitConfig],
     repo_url: str,
-    repo_default: Dict[str, Any],
-    hooks: List[Tuple[str, Dict[str, Any]]],
+    repo_default: Mapping[str, Any],
+    hooks: List[Tuple[str, Mapping[str, Any]]],
 ):
     """Update a hook in the .pre-commit-config.yaml file."""
-    try:
-        existing_repo_index = find_repo_index(pre_commit_config, repo_url)
-    except ValueError:
-        existing_repo_index = None
-
-    repos = cast(List[Dict[str, Any]], pre_commit_config.get("repos", []))
-    if existing_repo_index is None:
-        repos.append(deepcopy(repo_default))
-        pre_commit_config["repos"] = repos
-    else:
-        existing_repo = repos[existing_repo_index]
-        for hook_id, hook_default in hooks:
-            try:
-                index = find_hook_id_index(existing_repo, hook_id)
-                existing_hook = existing_repo["hooks"][index]
-                existing_hook = deep_update(existing_hook, deepcopy(hook_default))
-                existing_repo["hooks"][index] = existing_hook
-            except ValueError:
-                existing_hooks = cast(List[Dict[str, Any]], existing_repo.get("hooks", []))
-                existing_hooks.append(deepcopy(hook_default))
-                existing_repo["hooks"] = existing_hooks
-    pre_commit_config["repos"] = repos
+    config = _indexed(pre_commit_config)
+    existing_repo = config.find_repo(repo_url)
+    if existing_repo is None:
+        config.append_repo(thaw(repo_default))
+        return
+
+    for hook_id, hook_default in hooks:
+        existing_hook = config.find_hook(existing_repo, hook_id)
+        if existing_hook is None:
+            config.append_hook(existing_repo, thaw(hook_default))
+        else:
+            deep_update(existing_hook, hook_default)
@@ -92,3 +92,23 @@ def test_process_flake8_existing_other_data():
     assert result.get("flake8", "max-line-length").value == str(line_length)
     assert result.get("flake8", "exclude").value == REPO_NAME
     assert result.get("FAKE", "fake").value == "fake"
+
+
+def test_process_flake8_tool_performance_profile():
+    """The profile should set jobs, and only its own value should be removed once it is turned off explicitly."""
+    result = process_flake8(flake8_config=ConfigUpdater(), tool_performance_profile=True, test=True)
+    assert result.get("flake8", "jobs").value == "auto"
+
+    result = process_flake8(flake8_config=result, tool_performance_profile=True, test=True)
+    assert result.get("flake8", "jobs").value == "auto"
+
+    # Without the option, a value that may have been set by hand is left alone
+    result = process_flake8(flake8_config=result, test=True)
+    assert result.get("flake8", "jobs").value == "auto"
+
+    result = process_flake8(flake8_config=result, tool_performance_profile=False, test=True)
+    assert result.get("flake8", "jobs", None) is None
+
+    result.set("flake8", "jobs", "4")
+    result = process_flake8(flake8_config=result, tool_performance_profile=False, test=True)
+    assert result.get("flake8", "jobs").value == "4"
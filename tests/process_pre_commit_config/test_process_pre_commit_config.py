@@ -2,6 +2,7 @@
 
 from typing import Any, Dict, List, cast
 
+import pytest
 from ruamel.yaml.comments import CommentedMap
 
 from src.constants.pre_commit_config import (
@@ -19,11 +20,14 @@ from src.constants.pre_commit_config import (
     JUMANJI_HOUSE_REV,
     LOCAL_REPO_URL,
     MARKDOWN_LINT_HOOK_ID,
+    MYPY_HOOK_ID,
     PRE_COMMIT_REPO_URL,
     PRE_COMMIT_REV,
     PRETTIER_HOOK_ID,
     PRETTIER_REPO_URL,
+    PYLINT_CACHE_SCRIPT,
     PYLINT_HOOK_ID,
+    PYLINT_SERVER_SCRIPT,
     SHELL_FORMAT_HOOK_ID,
     SHELLCHECK_HOOK_ID,
     TRAILING_WHITESPACE_HOOK_ID,
@@ -35,6 +39,7 @@ from src.process_pre_commit_config import PreCommitConfigProcessor
 PYLINT_PROPER_ENTRY = f"{REPO_NAME}/ensure_venv.sh"
 PYLINT_IMPROPER_ENTRY = "ensure_venv.sh"
 RC_FILE_ARG = f"--rcfile={PYLINTRC_FILENAME}"
+PYLINT_CACHE_COMMAND = ["python", f"{REPO_NAME}/{PYLINT_CACHE_SCRIPT}", "--"]
 IGNORE_TEST_ARG = "--ignore=tests"
 EXCLUDE_STATIC = "^static/"
 FAKE_ENTRY = "fake.sh"
@@ -225,6 +230,29 @@ def test_process_pre_commit_config_include_prettier():
 
 
 # Testing include_isort options
+def test_process_pre_commit_config_tool_performance_profile_prettier_cache():
+    """Turning the profile on adds the prettier cache arguments once, turning it off explicitly removes only them."""
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(CommentedMap, {}), tool_performance_profile=True, test=True
+    ).process_pre_commit_config()
+    result = PreCommitConfigProcessor(
+        pre_commit_config=result, tool_performance_profile=True, test=True
+    ).process_pre_commit_config()
+
+    repo = _find_repo(pre_commit_config=result, repo_url=PRETTIER_REPO_URL)
+    assert repo is not None
+    hook = cast(List[Dict[str, Any]], repo.get("hooks", []))[0]
+    assert hook["args"] == ["--write", "--config=.prettierrc", "--cache", "--cache-strategy=content"]
+
+    result = PreCommitConfigProcessor(pre_commit_config=result, test=True).process_pre_commit_config()
+    assert hook["args"] == ["--write", "--config=.prettierrc", "--cache", "--cache-strategy=content"]
+
+    result = PreCommitConfigProcessor(
+        pre_commit_config=result, tool_performance_profile=False, test=True
+    ).process_pre_commit_config()
+    assert hook["args"] == ["--write", "--config=.prettierrc"]
+
+
 def test_process_pre_commit_config_include_isort():
     """Test the process_pre_commit_config function with the include_isort option set to True."""
     result = PreCommitConfigProcessor(
@@ -522,6 +550,140 @@ def test_process_pre_commit_config_with_existing_random_local():
     assert hook2["args"] == ["pylint", "-v", RC_FILE_ARG]
 
 
+def test_process_pre_commit_config_pylint_server_hook_mode():
+    """The hook modes should replace each other's command, through the result cache or not, and keep the custom args.
+
+    Only the leading command is generated, custom args that look like part of it are kept.
+    """
+    custom_args = [IGNORE_TEST_ARG, "-v", RC_FILE_ARG, "python", f"--ignore-paths=vendor/{PYLINT_CACHE_SCRIPT}"]
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(
+            CommentedMap,
+            {
+                "repos": [
+                    {
+                        "repo": LOCAL_REPO_URL,
+                        "hooks": [
+                            {
+                                "id": PYLINT_HOOK_ID,
+                                "name": "pylint",
+                                "entry": PYLINT_IMPROPER_ENTRY,
+                                "language": "script",
+                                "types": ["python"],
+                                "args": ["pylint", *custom_args],
+                            }
+                        ],
+                    }
+                ]
+            },
+        ),
+        pylint_hook_mode="server",
+        pylint_result_cache=True,
+        test=True,
+    ).process_pre_commit_config()
+    assert result is not None
+
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    hook = cast(List[Dict[str, Any]], repo.get("hooks", []))[0]
+    assert hook["entry"] == PYLINT_PROPER_ENTRY
+    assert hook["args"] == [*PYLINT_CACHE_COMMAND, "python", f"{REPO_NAME}/{PYLINT_SERVER_SCRIPT}", *custom_args]
+    assert hook["require_serial"] is True
+
+    result = PreCommitConfigProcessor(pre_commit_config=result, test=True).process_pre_commit_config()
+    assert result is not None
+
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    hook = cast(List[Dict[str, Any]], repo.get("hooks", []))[0]
+    assert hook["args"] == ["pylint", *custom_args]
+    assert "require_serial" not in hook
+
+
+def test_process_pre_commit_config_invalid_pylint_hook_mode():
+    """An unknown pylint hook mode should be rejected."""
+    with pytest.raises(ValueError, match="Invalid pylint_hook_mode: daemon"):
+        PreCommitConfigProcessor(
+            pre_commit_config=cast(CommentedMap, {}), pylint_hook_mode="daemon", test=True
+        ).process_pre_commit_config()
+
+
+def test_process_pre_commit_config_mypy_daemon_mode():
+    """The daemon mode should add a dmypy hook next to pylint, and the process mode should remove it again."""
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(CommentedMap, {}), mypy_mode="daemon", test=True
+    ).process_pre_commit_config()
+    assert result is not None
+
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    hooks = cast(List[Dict[str, Any]], repo.get("hooks", []))
+    assert [hook["id"] for hook in hooks] == [PYLINT_HOOK_ID, MYPY_HOOK_ID]
+    mypy_hook = hooks[1]
+    assert mypy_hook["entry"] == PYLINT_PROPER_ENTRY
+    assert mypy_hook["args"][:2] == ["dmypy", "run"]
+    assert mypy_hook["args"][-1] == "."
+    assert mypy_hook["pass_filenames"] is False
+    assert mypy_hook["require_serial"] is True
+
+    result = PreCommitConfigProcessor(pre_commit_config=result, test=True).process_pre_commit_config()
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    assert [hook["id"] for hook in cast(List[Dict[str, Any]], repo.get("hooks", []))] == [PYLINT_HOOK_ID]
+
+
+def test_process_pre_commit_config_mypy_daemon_mode_without_pylint():
+    """The dmypy hook should get its own local repo when pylint is disabled."""
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(CommentedMap, {}), pylint_enabled=False, mypy_mode="daemon", test=True
+    ).process_pre_commit_config()
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    assert [hook["id"] for hook in cast(List[Dict[str, Any]], repo.get("hooks", []))] == [MYPY_HOOK_ID]
+
+    result = PreCommitConfigProcessor(
+        pre_commit_config=result, pylint_enabled=False, mypy_enabled=False, mypy_mode="daemon", test=True
+    ).process_pre_commit_config()
+    assert _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL) is None
+
+
+def test_process_pre_commit_config_process_mode_keeps_a_project_mypy_hook():
+    """Only the generated dmypy hook is removed, a local mypy hook the project wrote is kept."""
+    project_hook = {"id": MYPY_HOOK_ID, "entry": "mypy", "language": "system", "types": ["python"]}
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(CommentedMap, {"repos": [{"repo": LOCAL_REPO_URL, "hooks": [dict(project_hook)]}]}),
+        pylint_enabled=False,
+        test=True,
+    ).process_pre_commit_config()
+
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    assert repo["hooks"] == [project_hook]
+
+
+def test_process_pre_commit_config_daemon_mode_keeps_a_project_mypy_hook():
+    """The daemon mode should not merge the dmypy hook into a local mypy hook the project wrote."""
+    project_hook = {"id": MYPY_HOOK_ID, "entry": "mypy", "language": "system", "types": ["python"]}
+    result = PreCommitConfigProcessor(
+        pre_commit_config=cast(CommentedMap, {"repos": [{"repo": LOCAL_REPO_URL, "hooks": [dict(project_hook)]}]}),
+        pylint_enabled=False,
+        mypy_mode="daemon",
+        test=True,
+    ).process_pre_commit_config()
+
+    repo = _find_repo(pre_commit_config=result, repo_url=LOCAL_REPO_URL)
+    assert repo is not None
+    assert repo["hooks"] == [project_hook]
+
+
+def test_process_pre_commit_config_invalid_mypy_mode():
+    """An unknown mypy mode should be rejected."""
+    with pytest.raises(ValueError, match="Invalid mypy_mode: server"):
+        PreCommitConfigProcessor(
+            pre_commit_config=cast(CommentedMap, {}), mypy_mode="server", test=True
+        ).process_pre_commit_config()
+
+
 def test_process_pre_commit_config_disable_only_pylint_removes_empty_local_repo():
     """Disabling pylint should remove the local repo if it only contains the pylint hook."""
     result = PreCommitConfigProcessor(
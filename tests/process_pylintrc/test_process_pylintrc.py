@@ -5,6 +5,7 @@ from src.constants.pylintrc import (
     PYLINTRC_FORMAT_MAX_LINE_LENGTH_KEY,
     PYLINTRC_FORMAT_SECTION_KEY,
     PYLINTRC_MASTER_IGNORE_KEY,
+    PYLINTRC_MASTER_JOBS_KEY,
     PYLINTRC_MASTER_SECTION_KEY,
 )
 from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
@@ -108,3 +109,23 @@ def test_process_pylintrc_existing_other_data():
 
     assert_pylintrc(data=result, line_length=line_length)
     assert pylintrc.get("FAKE", "fake").value == "fake"
+
+
+def test_process_pylintrc_tool_performance_profile():
+    """The profile should lint with one process per CPU, and remove its value once it is turned off explicitly."""
+    pylintrc = ConfigUpdater()
+    pylintrc.read_string(f"[{PYLINTRC_MASTER_SECTION_KEY}]\n{PYLINTRC_MASTER_JOBS_KEY}=1\n")
+
+    result = process_pylintrc(pylintrc=pylintrc, tool_performance_profile=True, test=True)
+    assert result.get(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY).value == "0"
+
+    # Without the option, a value that may have been set by hand is left alone
+    result = process_pylintrc(pylintrc=result, test=True)
+    assert result.get(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY).value == "0"
+
+    result = process_pylintrc(pylintrc=result, tool_performance_profile=False, test=True)
+    assert not result.has_option(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY)
+
+    result.set(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY, "4")
+    result = process_pylintrc(pylintrc=result, tool_performance_profile=False, test=True)
+    assert result.get(PYLINTRC_MASTER_SECTION_KEY, PYLINTRC_MASTER_JOBS_KEY).value == "4"
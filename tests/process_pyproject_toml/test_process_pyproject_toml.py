@@ -1,17 +1,21 @@
 """Test the src/process_pyproject_toml.py file."""
 
+from pathlib import Path
 from typing import Any, Dict, cast
 
+import pytest
 from tomlkit import document, parse
 
 from src.constants.pyproject_toml import (
     PYPROJECT_AUTOPEP8_KEY,
     PYPROJECT_BLACK_KEY,
     PYPROJECT_ISORT_KEY,
+    PYPROJECT_MYPY_KEY,
     PYPROJECT_PYTEST_INI_OPTIONS_KEY,
     PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_DATE_FORMAT_VALUE,
     PYPROJECT_PYTEST_INI_OPTIONS_LOG_CLI_VALUE,
     PYPROJECT_PYTEST_KEY,
+    PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE,
     PYPROJECT_TOOL_KEY,
 )
 from src.constants.shared import DEFAULT_LINE_LENGTH, REPO_NAME
@@ -296,6 +300,112 @@ log_cli = true
     assert tool.get(PYPROJECT_PYTEST_KEY) is None
 
 
+def _pytest_addopts(result: Any) -> str:
+    tool = cast(Dict[str, Any], result.get(PYPROJECT_TOOL_KEY))
+    return cast(str, tool[PYPROJECT_PYTEST_KEY][PYPROJECT_PYTEST_INI_OPTIONS_KEY]["addopts"])
+
+
+def test_process_pyproject_toml_tool_performance_profile_pytest_xdist(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The profile should only run the tests in parallel when pytest-xdist is a dependency."""
+    monkeypatch.chdir(tmp_path)
+    pyproject = f"""
+[project]
+dependencies = ["requests"]
+
+[{PYPROJECT_TOOL_KEY}.{PYPROJECT_PYTEST_KEY}.{PYPROJECT_PYTEST_INI_OPTIONS_KEY}]
+addopts = "-m fake_mark"
+"""
+
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(pyproject), tool_performance_profile=True, test=True
+    ).process_pyproject_toml()
+    assert PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE not in _pytest_addopts(result)
+
+    (tmp_path / "requirements-dev.txt").write_text("pytest\npytest_xdist[psutil]==3.6.1\n", encoding="utf-8")
+    for _ in range(2):
+        result = PyProjectTomlProcessor(
+            pyproject_toml=result, tool_performance_profile=True, test=True
+        ).process_pyproject_toml()
+        assert _pytest_addopts(result) == f"-m fake_mark --ignore=./{REPO_NAME} {PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE}"
+
+    # Without the option, a value that may have been set by hand is left alone
+    result = PyProjectTomlProcessor(pyproject_toml=result, test=True).process_pyproject_toml()
+    assert _pytest_addopts(result).endswith(PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE)
+
+    result = PyProjectTomlProcessor(
+        pyproject_toml=result, tool_performance_profile=False, test=True
+    ).process_pyproject_toml()
+    assert _pytest_addopts(result) == f"-m fake_mark --ignore=./{REPO_NAME}"
+
+
+def test_process_pyproject_toml_tool_performance_profile_compares_whole_arguments():
+    """A hand-added `-n auto` is kept while pytest-xdist is not declared, and similar arguments are not matched."""
+    pyproject = f"""
+[{PYPROJECT_TOOL_KEY}.{PYPROJECT_PYTEST_KEY}.{PYPROJECT_PYTEST_INI_OPTIONS_KEY}]
+addopts = "-n auto --ignore=./{REPO_NAME}"
+"""
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(pyproject), tool_performance_profile=True, test=True
+    ).process_pyproject_toml()
+    assert _pytest_addopts(result) == f"-n auto --ignore=./{REPO_NAME}"
+
+    pyproject = f"""
+[{PYPROJECT_TOOL_KEY}.{PYPROJECT_PYTEST_KEY}.{PYPROJECT_PYTEST_INI_OPTIONS_KEY}]
+addopts = "-k 'not slow' -n autotune --ignore=./{REPO_NAME}"
+"""
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(pyproject), tool_performance_profile=False, test=True
+    ).process_pyproject_toml()
+    assert _pytest_addopts(result) == f"-k 'not slow' -n autotune --ignore=./{REPO_NAME}"
+
+
+def test_process_pyproject_toml_tool_performance_profile_reads_poetry_groups():
+    """pytest-xdist can be declared in a poetry dependency group."""
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(f"""
+[{PYPROJECT_TOOL_KEY}.poetry.group.test.dependencies]
+pytest-xdist = {{ version = "^3.2.1", extras = ["psutil"] }}
+"""),
+        tool_performance_profile=True,
+        test=True,
+    ).process_pyproject_toml()
+    assert _pytest_addopts(result).endswith(PYPROJECT_PYTEST_XDIST_ADDOPTS_VALUE)
+
+
+# Test mypy Options
+def test_process_pyproject_toml_mypy_daemon_mode():
+    """The daemon mode should configure the mypy cache and keep the existing mypy settings and excludes."""
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(f"""
+[{PYPROJECT_TOOL_KEY}.{PYPROJECT_MYPY_KEY}]
+strict = true
+exclude = "^build/"
+"""),
+        mypy_mode="daemon",
+        debug=True,
+        test=True,
+    ).process_pyproject_toml()
+
+    mypy_tool = cast(Dict[str, Any], cast(Dict[str, Any], result.get(PYPROJECT_TOOL_KEY)).get(PYPROJECT_MYPY_KEY))
+    assert mypy_tool is not None
+    assert mypy_tool.get("strict") is True
+    assert mypy_tool.get("incremental") is True
+    assert mypy_tool.get("cache_dir") == ".mypy_cache"
+    assert mypy_tool.get("sqlite_cache") is True
+    assert mypy_tool.get("exclude") == ["^build/", "^\\.venv/", f"^{REPO_NAME}/"]
+
+
+def test_process_pyproject_toml_mypy_process_mode_leaves_mypy_alone():
+    """The process mode should neither add nor remove the mypy table."""
+    result = PyProjectTomlProcessor(pyproject_toml=document(), test=True).process_pyproject_toml()
+    assert PYPROJECT_MYPY_KEY not in cast(Dict[str, Any], result.get(PYPROJECT_TOOL_KEY))
+
+    result = PyProjectTomlProcessor(
+        pyproject_toml=parse(f"[{PYPROJECT_TOOL_KEY}.{PYPROJECT_MYPY_KEY}]\nstrict = true\n"), test=True
+    ).process_pyproject_toml()
+    assert cast(Dict[str, Any], result.get(PYPROJECT_TOOL_KEY)).get(PYPROJECT_MYPY_KEY) == {"strict": True}
+
+
 # Happy Path Test
 def test_process_pyproject_toml():
     """Test the process_pyproject_toml function with all options set."""
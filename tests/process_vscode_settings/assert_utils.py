@@ -1,6 +1,5 @@
 """This module contains utility functions for asserting vscode settings."""
 
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, cast
 
 from src.constants.shared import REPO_NAME
@@ -58,7 +57,7 @@ def assert_python_analysis_package_index_depths_settings(data: Dict[str, Any]):
     package_index_depths = cast(Optional[List[Dict[str, Any]]], data.get(PYTHON_ANALYSIS_PACKAGE_INDEX_DEPTHS_KEY))
     assert package_index_depths is not None
 
-    index_names_copy = deepcopy(INDEX_NAMES)
+    index_names_copy = list(INDEX_NAMES)
 
     for item in package_index_depths:
         name = cast(Optional[str], item.get(NAME_KEY))
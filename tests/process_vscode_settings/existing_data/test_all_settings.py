@@ -1,9 +1,8 @@
 """Tests for process_vscode_settings.py with existing data."""
 
-from copy import deepcopy
-
 from src.constants.vscode_settings import SAMPLE_VSCODE_SETTINGS
 from src.process_vscode_settings import process_vscode_settings
+from src.utils.core import thaw
 from tests.process_vscode_settings.assert_utils import (
     assert_isort_settings,
     assert_python_analysis_settings,
@@ -20,7 +19,7 @@ def test_process_vscode_settings():
     python_formatter = "black"
 
     result = process_vscode_settings(
-        vscode_settings=deepcopy(SAMPLE_VSCODE_SETTINGS), test=True, python_formatter=python_formatter
+        vscode_settings=thaw(SAMPLE_VSCODE_SETTINGS), test=True, python_formatter=python_formatter
     )
     assert result is not None
 
@@ -1,7 +1,5 @@
 """Tests for process_vscode_settings.py flag-driven optional behavior with existing data."""
 
-from copy import deepcopy
-
 from src.constants.vscode_settings import (
     FLAKE8_ARGS_KEY,
     ISORT_ARGS_KEY,
@@ -14,12 +12,13 @@ from src.constants.vscode_settings import (
     SAMPLE_VSCODE_SETTINGS,
 )
 from src.process_vscode_settings import process_vscode_settings
+from src.utils.core import thaw
 
 
 def test_process_vscode_settings_disable_optional_features_and_enable_unittest():
     """Existing optional VS Code settings should be removable and unittest can be enabled."""
     result = process_vscode_settings(
-        vscode_settings=deepcopy(SAMPLE_VSCODE_SETTINGS),
+        vscode_settings=thaw(SAMPLE_VSCODE_SETTINGS),
         include_isort=False,
         pylint_enabled=False,
         flake8_enabled=False,
@@ -1,8 +1,8 @@
 """Tests for process_vscode_settings.py with existing data."""
-from copy import deepcopy
 
 from src.constants.vscode_settings import SAMPLE_VSCODE_SETTINGS
 from src.process_vscode_settings import process_vscode_settings
+from src.utils.core import thaw
 from tests.process_vscode_settings.assert_utils import assert_python_formatter_settings
 
 
@@ -11,7 +11,7 @@ def test_process_vscode_settings_no_python_formatter():
     python_formatter = ""
 
     result = process_vscode_settings(
-        vscode_settings=deepcopy(SAMPLE_VSCODE_SETTINGS),
+        vscode_settings=thaw(SAMPLE_VSCODE_SETTINGS),
         python_formatter=python_formatter,
         test=True,
         debug=True,
@@ -26,7 +26,7 @@ def test_process_vscode_settings_autopep8_python_formatter():
     python_formatter = "autopep8"
 
     result = process_vscode_settings(
-        vscode_settings=deepcopy(SAMPLE_VSCODE_SETTINGS),
+        vscode_settings=thaw(SAMPLE_VSCODE_SETTINGS),
         python_formatter=python_formatter,
         test=True,
         debug=True,
@@ -41,7 +41,7 @@ def test_process_vscode_settings_black_python_formatter():
     python_formatter = "black"
 
     result = process_vscode_settings(
-        vscode_settings=deepcopy(SAMPLE_VSCODE_SETTINGS),
+        vscode_settings=thaw(SAMPLE_VSCODE_SETTINGS),
         python_formatter=python_formatter,
         test=True,
         debug=True,
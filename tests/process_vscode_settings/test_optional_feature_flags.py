@@ -4,6 +4,7 @@ from src.constants.vscode_settings import (
     FLAKE8_ARGS_KEY,
     ISORT_ARGS_KEY,
     MYPY_ARGS_KEY,
+    MYPY_PREFER_DAEMON_KEY,
     PYLINT_ARGS_KEY,
     PYTHON_TESTING_PYTEST_ARGS_KEY,
     PYTHON_TESTING_PYTEST_ENABLED_KEY,
@@ -36,3 +37,13 @@ def test_process_vscode_settings_disable_optional_features_and_enable_unittest()
     assert result.get(PYTHON_TESTING_PYTEST_ENABLED_KEY) is False
     assert result.get(PYTHON_TESTING_UNITTEST_ARGS_KEY) == ["-v", "-s", ".", "-p", "*test*.py"]
     assert result.get(PYTHON_TESTING_UNITTEST_ENABLED_KEY) is True
+
+
+def test_process_vscode_settings_mypy_daemon_mode():
+    """The daemon mode should point the mypy extension at the daemon, the process mode should stop doing so."""
+    result = process_vscode_settings(vscode_settings={}, mypy_mode="daemon", test=True)
+    assert result.get(MYPY_PREFER_DAEMON_KEY) is True
+    assert result.get(MYPY_ARGS_KEY) == ["--ignore-missing-imports", "--follow-imports=silent"]
+
+    result = process_vscode_settings(vscode_settings=result, test=True)
+    assert MYPY_PREFER_DAEMON_KEY not in result
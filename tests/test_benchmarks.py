@@ -0,0 +1,40 @@
+"""Tests for the benchmark runner in benchmarks/run.py."""
+
+import json
+from pathlib import Path
+
+from benchmarks.run import BENCHMARKS, Result, find_regressions, load_baseline, main, result_key
+
+
+def test_benchmarks_run_on_generated_inputs(tmp_path: Path):
+    """Every benchmark should run and --save should record a result per benchmark and size."""
+    baseline = tmp_path / "baseline.json"
+
+    assert main(["--sizes=1,10", "--repeat=1", f"--baseline={baseline}", "--save"]) == 0
+
+    results = load_baseline(baseline)
+    assert set(results) == {result_key(benchmark.name, size) for benchmark in BENCHMARKS for size in (1, 10)}
+
+
+def test_benchmarks_fail_on_regressions(tmp_path: Path):
+    """A benchmark slower than its baseline by more than the threshold should fail the run."""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"format": 1, "results": {result_key("flake8", 10): 1e-9}}),
+        encoding="utf-8",
+    )
+
+    assert main(["--benchmarks=flake8", "--sizes=10", "--repeat=1", f"--baseline={baseline}"]) == 1
+    assert main(["--benchmarks=flake8", "--sizes=10", "--repeat=1", f"--baseline={tmp_path / 'missing.json'}"]) == 0
+    assert main(["--benchmarks=unknown", f"--baseline={baseline}"]) == 2
+
+
+def test_find_regressions_uses_threshold():
+    """Only results over the baseline by more than the threshold should be regressions."""
+    results = [
+        Result("flake8", 10, 1.2, 1.0),
+        Result("flake8", 100, 1.3, 1.0),
+        Result("pylintrc", 10, 5.0, None),
+    ]
+
+    assert find_regressions(results, 0.25) == [results[1]]
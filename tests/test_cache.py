@@ -0,0 +1,131 @@
+"""Tests for src/utils/cache.py and the processor skip cache in src/cli.py."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src import cli
+from src.cli import STEPS, main
+from src.utils.cache import CACHE_FILENAME, compute_step_key, load_cache
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a project with a virtual environment directory and make it the working directory."""
+    (tmp_path / ".venv").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def calls(monkeypatch: pytest.MonkeyPatch):
+    """Replace the processors with stubs that record which ones ran."""
+    recorded = []
+
+    def make_step(step: str):
+        def run(_args):
+            recorded.append(step)
+            Path(f".{step}").write_text(step, encoding="utf-8")
+
+        return run
+
+    for step in STEPS:
+        monkeypatch.setitem(STEPS, step, make_step(step))
+        monkeypatch.setitem(cli.STEP_FILENAMES, step, [f".{step}"])
+    return recorded
+
+
+def test_compute_step_key_depends_on_contents_and_options(project_dir: Path):
+    """The key should change when the file contents or the options change."""
+    (project_dir / ".flake8").write_text("[flake8]\n", encoding="utf-8")
+    key = compute_step_key("flake8", [".flake8"], {"line_length": 120})
+
+    assert key == compute_step_key("flake8", [".flake8"], {"line_length": 120})
+    assert key != compute_step_key("flake8", [".flake8"], {"line_length": 100})
+    assert key != compute_step_key("pylintrc", [".flake8"], {"line_length": 120})
+
+    (project_dir / ".flake8").write_text("[flake8]\nmax-line-length = 120\n", encoding="utf-8")
+    assert key != compute_step_key("flake8", [".flake8"], {"line_length": 120})
+
+
+def test_load_cache_ignores_invalid_files(project_dir: Path):
+    """A corrupt or outdated cache file should be treated as empty."""
+    assert not load_cache()
+
+    (project_dir / CACHE_FILENAME).write_text("not json", encoding="utf-8")
+    assert not load_cache()
+
+    (project_dir / CACHE_FILENAME).write_text(json.dumps({"format": 0, "steps": {"flake8": "x"}}), encoding="utf-8")
+    assert not load_cache()
+
+
+def test_main_skips_unchanged_steps(project_dir: Path, calls):
+    """A second run with the same files and options should not run any processor."""
+    assert main(["--steps=flake8,pylintrc"]) == 0
+    assert calls == ["flake8", "pylintrc"]
+    assert set(load_cache()) == {"flake8", "pylintrc"}
+
+    assert main(["--steps=flake8,pylintrc"]) == 0
+    assert calls == ["flake8", "pylintrc"]
+
+    (project_dir / ".flake8").write_text("edited", encoding="utf-8")
+    assert main(["--steps=flake8,pylintrc"]) == 0
+    assert calls == ["flake8", "pylintrc", "flake8"]
+
+
+def test_main_reruns_steps_when_options_change(project_dir: Path, calls):
+    """Changing an option that affects the generated files should invalidate the cache."""
+    assert main(["--steps=flake8"]) == 0
+    assert main(["--steps=flake8", "--debug"]) == 0
+    assert calls == ["flake8"]
+
+    assert main(["--steps=flake8", "--line_length=100"]) == 0
+    assert calls == ["flake8", "flake8"]
+
+
+def test_main_no_cache_always_runs(project_dir: Path, calls):
+    """--no_cache should run every processor without reading or writing the cache."""
+    assert main(["--steps=flake8", "--no_cache"]) == 0
+    assert main(["--steps=flake8", "--no_cache"]) == 0
+
+    assert calls == ["flake8", "flake8"]
+    assert not (project_dir / CACHE_FILENAME).exists()
+
+
+def test_main_record_cache_does_not_run_processors(project_dir: Path, calls):
+    """--record_cache should store the current state of the files so the next run skips them."""
+    (project_dir / ".flake8").write_text("formatted", encoding="utf-8")
+
+    assert main(["--steps=flake8", "--record_cache"]) == 0
+    assert not calls
+
+    assert main(["--steps=flake8"]) == 0
+    assert not calls
+
+
+def test_main_without_venv_does_not_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, calls):
+    """Projects without a .venv directory should not get a cache file."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+
+    assert main(["--steps=flake8"]) == 0
+    assert main(["--steps=flake8"]) == 0
+
+    assert calls == ["flake8", "flake8"]
+    assert not (tmp_path / ".venv").exists()
+
+
+def test_main_does_not_cache_failed_steps(project_dir: Path, calls, monkeypatch: pytest.MonkeyPatch):
+    """A failing processor should run again on the next run."""
+
+    def fail(_args):
+        calls.append("failed")
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(STEPS, "flake8", fail)
+
+    assert main(["--steps=flake8"]) == 1
+    assert main(["--steps=flake8"]) == 1
+    assert calls == ["failed", "failed"]
@@ -0,0 +1,98 @@
+"""Tests for src/cli.py."""
+
+from pathlib import Path
+
+import pytest
+
+from src.cli import STEPS, build_parser, main
+
+
+def test_build_parser_defaults_match_setup_python_app_sh():
+    """Parsing without arguments should use the same defaults as setup_python_app.sh."""
+    args, unknown = build_parser().parse_known_args([])
+
+    assert unknown == []
+    assert args.steps == list(STEPS)
+    assert args.package_manager == "poetry"
+    assert args.python_formatter == "black"
+    assert args.is_package is False
+    assert args.unittest_enabled is False
+
+
+def test_build_parser_ignores_shell_only_options():
+    """Options that only setup_python_app.sh understands should not break parsing."""
+    args, unknown = build_parser().parse_known_args(
+        ["-d", "--rebuild_venv=1", "--python_version=3.12.7", "--is_package", "--line_length=100"]
+    )
+
+    assert args.debug is True
+    assert args.is_package is True
+    assert args.line_length == 100
+    assert unknown == ["--rebuild_venv=1", "--python_version=3.12.7"]
+
+
+def test_build_parser_rejects_unknown_step():
+    """Selecting a step that does not exist should fail argument parsing."""
+    with pytest.raises(SystemExit):
+        build_parser().parse_known_args(["--steps=prettierrc,fake"])
+
+
+def test_main_runs_every_step(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Every processor should run in-process and report success."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+
+    assert main(["--test", f"--project_dir={tmp_path}"]) == 0
+
+
+def test_main_runs_selected_steps_only(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Only the processors passed with --steps should run."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+    calls = []
+    monkeypatch.setitem(STEPS, "flake8", lambda args: calls.append("flake8"))
+    monkeypatch.setitem(STEPS, "pylintrc", lambda args: calls.append("pylintrc"))
+
+    assert main(["--test", "--steps=flake8"]) == 0
+    assert calls == ["flake8"]
+
+
+def test_main_skips_the_skipped_steps(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The processors passed with --skip_steps should not run."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+    calls = []
+    monkeypatch.setitem(STEPS, "flake8", lambda args: calls.append("flake8"))
+    monkeypatch.setitem(STEPS, "pylintrc", lambda args: calls.append("pylintrc"))
+
+    assert main(["--test", "--steps=flake8,pylintrc", "--skip_steps=pylintrc"]) == 0
+    assert calls == ["flake8"]
+
+
+def test_main_returns_combined_failure_status(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """A failing processor should not stop the others but should fail the combined status."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+
+    calls = []
+    monkeypatch.setitem(STEPS, "prettierrc", lambda args: calls.append("prettierrc"))
+    monkeypatch.setitem(STEPS, "pre_commit_config", lambda args: 1 / 0)
+
+    assert main(["--test", "--steps=pre_commit_config,prettierrc"]) == 1
+    assert calls == ["prettierrc"]
+
+
+def test_main_reports_only_changed_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """A second run over generated files should not rewrite any of them."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PWD", str(tmp_path))
+
+    assert main(["--steps=flake8,pylintrc"]) == 0
+    assert "Updated .flake8, .pylintrc" in capsys.readouterr().out
+    mtime = (tmp_path / ".flake8").stat().st_mtime_ns
+
+    assert main(["--steps=flake8,pylintrc", "--debug"]) == 0
+    assert "All config files are up to date" in capsys.readouterr().out
+    assert (tmp_path / ".flake8").stat().st_mtime_ns == mtime
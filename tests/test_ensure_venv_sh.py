@@ -2,28 +2,26 @@
 
 import os
 import subprocess
+import time
 from pathlib import Path
+from typing import Optional, Sequence
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 ENSURE_VENV_SCRIPT = REPO_ROOT / "ensure_venv.sh"
 VENV_MARKER = "__VIRTUAL_ENV__="
 
 
-def run_ensure_venv(project_dir: Path, env: dict[str, str]) -> subprocess.CompletedProcess[str]:
+def run_ensure_venv(
+    project_dir: Path, env: dict[str, str], command: Optional[Sequence[str]] = None
+) -> subprocess.CompletedProcess[str]:
     """Run ensure_venv.sh and print the active virtual environment."""
     execution_env = env.copy()
     execution_env["PWD"] = str(project_dir)
+    if command is None:
+        command = ["bash", "--noprofile", "--norc", "-c", f'printf "{VENV_MARKER}%s" "${{VIRTUAL_ENV:-}}"']
 
     return subprocess.run(
-        [
-            "bash",
-            str(ENSURE_VENV_SCRIPT),
-            "bash",
-            "--noprofile",
-            "--norc",
-            "-c",
-            f'printf "{VENV_MARKER}%s" "${{VIRTUAL_ENV:-}}"',
-        ],
+        ["bash", str(ENSURE_VENV_SCRIPT), *command],
         cwd=project_dir,
         env=execution_env,
         text=True,
@@ -39,6 +37,18 @@ def write_activate_script(venv_dir: Path) -> None:
     activate_path.write_text(f'export VIRTUAL_ENV="{venv_dir}"\n', encoding="utf-8")
 
 
+def write_python_venv(venv_dir: Path) -> None:
+    """Create a venv-like environment with a pyvenv.cfg, whose activate script must not be needed."""
+    write_activate_script(venv_dir)
+    (venv_dir / "bin" / "activate").write_text('echo "activate was sourced" >&2\n', encoding="utf-8")
+    (venv_dir / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.12.9\n", encoding="utf-8")
+    tool_path = venv_dir / "bin" / "tool"
+    tool_path.write_text(
+        f'#!/bin/bash\nprintf "{VENV_MARKER}%s|%s|%s" "$VIRTUAL_ENV" "${{PATH%%:*}}" "$*"\n', encoding="utf-8"
+    )
+    tool_path.chmod(0o755)
+
+
 def extract_virtual_env(stdout: str) -> str:
     """Extract the VIRTUAL_ENV value from the marker output."""
     assert VENV_MARKER in stdout
@@ -170,3 +180,51 @@ def test_ensure_venv_warns_and_runs_command_when_virtual_env_is_missing(tmp_path
     assert result.returncode == 0
     assert "none of the candidate virtual environments exist or can be activated" in result.stderr
     assert extract_virtual_env(result.stdout) == ""
+
+
+def test_ensure_venv_execs_the_venv_executable_without_sourcing_activate(tmp_path: Path) -> None:
+    """Environments created by venv should be used by setting VIRTUAL_ENV and PATH and running their own executable."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    venv_dir = project_dir / ".venv"
+    write_python_venv(venv_dir)
+
+    env = os.environ.copy()
+    env["UTILITY_REPO_SCRIPTS_CACHE_DIR"] = str(tmp_path / "cache")
+    env.pop("VIRTUAL_ENV", None)
+    env.pop("WORKON_HOME", None)
+
+    result = run_ensure_venv(project_dir=project_dir, env=env, command=["tool", "src", "--jobs=2"])
+
+    assert result.returncode == 0
+    assert extract_virtual_env(result.stdout) == f"{venv_dir}|{venv_dir / 'bin'}|src --jobs=2"
+    assert result.stderr == ""
+    assert list((tmp_path / "cache" / "ensure-venv").iterdir())
+
+
+def test_ensure_venv_reuses_the_cached_environment_until_pyvenv_cfg_changes(tmp_path: Path) -> None:
+    """The resolved environment should be cached per project directory and resolved again once pyvenv.cfg changes."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    workon_home = tmp_path / "workon-home"
+    venv_dir = workon_home / project_dir.name
+    write_python_venv(venv_dir)
+
+    env = os.environ.copy()
+    env["UTILITY_REPO_SCRIPTS_CACHE_DIR"] = str(tmp_path / "cache")
+    env["WORKON_HOME"] = str(workon_home)
+    env["HOME"] = str(tmp_path / "home")
+    env.pop("VIRTUAL_ENV", None)
+    env.pop("PYENV_ROOT", None)
+    assert run_ensure_venv(project_dir=project_dir, env=env, command=["tool"]).returncode == 0
+
+    # Without WORKON_HOME only the cache can still find the environment
+    env.pop("WORKON_HOME")
+    result = run_ensure_venv(project_dir=project_dir, env=env, command=["tool"])
+    assert extract_virtual_env(result.stdout).startswith(f"{venv_dir}|")
+
+    later = time.time() + 10
+    os.utime(venv_dir / "pyvenv.cfg", (later, later))
+    result = run_ensure_venv(project_dir=project_dir, env=env)
+    assert "none of the candidate virtual environments exist or can be activated" in result.stderr
+    assert extract_virtual_env(result.stdout) == ""
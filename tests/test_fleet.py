@@ -0,0 +1,157 @@
+"""Tests for src/fleet.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.cli import STEPS
+from src.fleet import build_fleet_parser, find_repos, main, process_repo, read_setup_options
+
+
+def create_repo(path: Path, setup_options: str = "") -> Path:
+    """Create a minimal repository with a pyproject.toml, and a setup script when it has setup options."""
+    path.mkdir(parents=True)
+    (path / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    if setup_options:
+        (path / "setup").write_text(
+            f'#!/bin/bash\nsource utility-repo-scripts/setup_python_app.sh \\\n\t{setup_options} \\\n\t"$@"\n',
+            encoding="utf-8",
+        )
+    return path
+
+
+def fail_step(args):
+    """Stand in for a processor that fails."""
+    raise ValueError(f"Invalid python_formatter: {args.python_formatter}")
+
+
+@pytest.fixture(autouse=True)
+def restore_cwd(monkeypatch: pytest.MonkeyPatch):
+    """process_repo changes directory, so restore the working directory and PWD after every test."""
+    monkeypatch.chdir(os.getcwd())
+    monkeypatch.setenv("PWD", os.getcwd())
+
+
+def test_build_fleet_parser_forwards_processor_options():
+    """Options the fleet command does not know should be left for the processors."""
+    args, processor_argv = build_fleet_parser().parse_known_intermixed_args(
+        ["repo-a", "--workers=2", "--glob=services/*", "--line_length=100", "repo-b"]
+    )
+
+    assert args.repos == ["repo-a", "repo-b"]
+    assert args.glob == ["services/*"]
+    assert args.workers == 2
+    assert args.full_setup is False
+    assert processor_argv == ["--line_length=100"]
+
+
+def test_find_repos_merges_paths_and_globs(tmp_path: Path):
+    """Explicit paths and glob matches should be resolved, deduplicated and restricted to directories."""
+    repo_a = create_repo(tmp_path / "services" / "a")
+    repo_b = create_repo(tmp_path / "services" / "b")
+    (tmp_path / "services" / "notes.txt").write_text("", encoding="utf-8")
+
+    repos = find_repos([str(repo_a), str(tmp_path / "missing")], [str(tmp_path / "services" / "*")])
+
+    assert repos == [str(repo_a), str(repo_b)]
+
+
+def test_process_repo_generates_config_files_and_reports_changes(tmp_path: Path):
+    """The processors should run inside the repository and report the files they changed."""
+    repo = create_repo(tmp_path / "repo")
+
+    result = process_repo(str(repo), ["--line_length=100"])
+
+    assert result.status == 0
+    assert (repo / ".pylintrc").exists()
+    assert (repo / ".vscode" / "settings.json").exists()
+    assert ".flake8" in result.changed_files
+    assert "pyproject.toml" in result.changed_files
+
+    second_result = process_repo(str(repo), ["--line_length=100"])
+    assert second_result.status == 0
+    assert ".flake8" not in second_result.changed_files
+
+
+def test_process_repo_reports_processor_failures(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """A failing processor should fail the repository and keep its output for the summary."""
+    repo = create_repo(tmp_path / "repo")
+    monkeypatch.setitem(STEPS, "pre_commit_config", fail_step)
+
+    result = process_repo(str(repo), ["--steps=pre_commit_config", "--python_formatter=black"])
+
+    assert result.status == 1
+    assert "The following processors failed" in result.output
+
+
+def test_process_repo_rejects_invalid_options(tmp_path: Path):
+    """Invalid options should fail the repository before any processor runs."""
+    repo = create_repo(tmp_path / "repo")
+
+    result = process_repo(str(repo), ["--python_formatter=fake-formatter", "--steps=pre_commit_config"])
+
+    assert result.status == 2
+    assert "Invalid python_formatter option: (fake-formatter)" in result.output
+
+
+def test_main_processes_repos_in_parallel(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """Every matched repository should be processed and summarised."""
+    create_repo(tmp_path / "services" / "a", setup_options="--line_length=100")
+    create_repo(tmp_path / "services" / "b", setup_options='--package_manager="pip" --line_length=88')
+
+    assert main([f"--glob={tmp_path / 'services' / '*'}", "--workers=2", "--steps=flake8"]) == 0
+
+    output = capsys.readouterr().out
+    assert "Processed 2 repositories: 2 changed, 0 failed" in output
+    # Each repository keeps the options of its own setup script
+    assert "max-line-length=100" in (tmp_path / "services" / "a" / ".flake8").read_text(encoding="utf-8")
+    assert "max-line-length=88" in (tmp_path / "services" / "b" / ".flake8").read_text(encoding="utf-8")
+    assert not (tmp_path / "services" / "a" / ".pylintrc").exists()
+
+
+def test_read_setup_options_skips_shell_variables(tmp_path: Path):
+    """Only the literal options of the setup_python_app.sh call are read, the forwarded ones override them."""
+    repo = create_repo(tmp_path / "repo", setup_options='--rebuild_venv="$rebuild_venv" --python_formatter="" -d')
+
+    assert read_setup_options(str(repo)) == ["--python_formatter=", "-d"]
+    assert read_setup_options(str(create_repo(tmp_path / "no-setup"))) is None
+
+
+def test_process_repo_refuses_to_reset_a_repo_without_options(tmp_path: Path):
+    """Without a setup script or explicit options, the defaults would overwrite the repository's own options."""
+    repo = create_repo(tmp_path / "repo")
+
+    result = process_repo(str(repo), ["--steps=flake8", "--debug"])
+
+    assert result.status == 2
+    assert "pass the options of this repository explicitly" in result.output
+    assert not (repo / ".flake8").exists()
+
+
+def test_main_fails_without_repos(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """A glob that matches nothing should be reported as a failure."""
+    assert main([f"--glob={tmp_path / 'missing' / '*'}"]) == 1
+    assert "No repositories matched" in capsys.readouterr().out
+
+
+def test_process_repo_reports_errors_as_a_failed_repository(tmp_path: Path):
+    """An error in one repository, like a directory removed meanwhile, should not escape and stop the fleet."""
+    result = process_repo(str(tmp_path / "removed"), ["--steps=flake8", "--line_length=100"])
+
+    assert result.status == 1
+    assert "FileNotFoundError" in result.output
+
+
+def test_process_repo_forwards_options_to_the_repository_setup_script(tmp_path: Path):
+    """The full setup should pass the fleet options to the repository's own setup script."""
+    repo = create_repo(tmp_path / "repo")
+    (repo / "setup").write_text('echo "setup $*"\n', encoding="utf-8")
+
+    result = process_repo(str(repo), ["--line_length=100"], full_setup=True)
+
+    assert result.status == 0
+    assert result.output == "setup --line_length=100\n"
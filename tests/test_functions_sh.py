@@ -1,5 +1,6 @@
 """Integration tests for shell helpers in scripts/functions.sh."""
 
+import os
 import subprocess
 from pathlib import Path
 from typing import Tuple
@@ -7,8 +8,8 @@ from typing import Tuple
 REPO_ROOT = Path(__file__).resolve().parents[1]
 FUNCTIONS_SCRIPT = REPO_ROOT / "scripts" / "functions.sh"
 TEST_EXTENSION = "ms-python.python"
-STATE_MARKER = "state="
-STATUS_MARKER = "find_status="
+TOOL_PYTHON_MARKER = "tool_python="
+TOOL_STATUS_MARKER = "tool_status="
 
 
 def run_install_extension_helper(
@@ -78,58 +79,53 @@ ensure_vscode_launch_file "{sample_launch_path}" "{launch_path}" "{overwrite_lau
     return result, launch_contents
 
 
-def run_find_site_package_flow(
+def run_ensure_tool_venv(
     tmp_path: Path,
-    package_probe_result: str,
-    debug_enabled: int = 0,
+    requirements: str = "tomlkit\n",
     pip_install_status: int = 0,
+    debug_enabled: int = 0,
+    interpreter: str = "3.14.3",
 ) -> Tuple[subprocess.CompletedProcess[str], str]:
-    """Run the find/uninstall helper flow and capture pip invocations."""
-    calls_file = tmp_path / "pip_calls.txt"
+    """Run the tool environment helper with a fake python and capture venv/pip calls."""
+    calls_file = tmp_path / "python_calls.txt"
+    requirements_path = tmp_path / "tool-requirements.txt"
+    requirements_path.write_text(requirements, encoding="utf-8")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    fake_python = bin_dir / "python"
+    fake_python.write_text(
+        "#!/bin/bash\n"
+        f'printf \'%s\\n\' "$*" >> "{calls_file}"\n'
+        'if [ "$1" = "-c" ]; then\n'
+        f"\tprintf '%s\\n' {interpreter} /usr/bin/python{interpreter} '{interpreter} (main)'\n"
+        "\texit 0\n"
+        "fi\n"
+        'if [ "$1" = "-m" ] && [ "$2" = "venv" ]; then\n'
+        '\tmkdir -p "$3/bin"\n'
+        '\tcp "$0" "$3/bin/python"\n'
+        "\texit 0\n"
+        "fi\n"
+        f"exit {pip_install_status}\n",
+        encoding="utf-8",
+    )
+    fake_python.chmod(0o755)
     normalized_functions_script = write_normalized_functions_script(tmp_path)
     command = f"""
-source "{normalized_functions_script}"
 debug={debug_enabled}
-    python() {{
-\tcase "{package_probe_result}" in
-\tpresent)
-\t\tprintf 'present:/tmp/fake_package.py\\n'
-\t\treturn 0
-\t\t;;
-\tnamespace)
-\t\tprintf 'present:<namespace>\\n'
-\t\treturn 0
-\t\t;;
-\tmissing)
-\t\tprintf 'missing\\n'
-\t\treturn 0
-\t\t;;
-\terror)
-\t\techo 'unexpected package probe error' >&2
-\t\treturn 1
-\t\t;;
-\tesac
-\treturn 1
-}}
-pip() {{
-\tprintf '%s\\n' "$*" >> "{calls_file}"
-\tif [ "$1" = "install" ]; then
-\t\treturn {pip_install_status}
-\tfi
-\treturn 0
-}}
-state="$(find_site_package fake_package fake-package)"
-find_status=$?
-printf '{STATE_MARKER}%s\\n' "$state"
-printf '{STATUS_MARKER}%s\\n' "$find_status"
-if [ "$find_status" -eq 0 ]; then
-\tuninstall_site_package fake-package "$state"
-fi
+source "{normalized_functions_script}"
+tool_python="$(ensure_tool_venv "{requirements_path}")"
+tool_status=$?
+printf '{TOOL_PYTHON_MARKER}%s\\n' "$tool_python"
+printf '{TOOL_STATUS_MARKER}%s\\n' "$tool_status"
 """
 
+    env = os.environ.copy()
+    env["PATH"] = f"{bin_dir}:/usr/bin:/bin"
+    env["UTILITY_REPO_SCRIPTS_CACHE_DIR"] = str(tmp_path / "cache")
     result = subprocess.run(
         ["bash", "--noprofile", "--norc", "-c", command],
         cwd=REPO_ROOT,
+        env=env,
         text=True,
         capture_output=True,
         check=False,
@@ -139,46 +135,6 @@ fi
     return result, calls
 
 
-def run_find_site_distribution_flow(
-    tmp_path: Path, distribution_probe_result: str, debug_enabled: int = 0
-) -> subprocess.CompletedProcess[str]:
-    """Run the distribution-state helper and capture its markers."""
-    normalized_functions_script = write_normalized_functions_script(tmp_path)
-    command = f"""
-source "{normalized_functions_script}"
-debug={debug_enabled}
-python() {{
-\tcase "{distribution_probe_result}" in
-\tpresent)
-\t\tprintf 'present\\n'
-\t\treturn 0
-\t\t;;
-\tmissing)
-\t\tprintf 'missing\\n'
-\t\treturn 0
-\t\t;;
-\terror)
-\t\techo 'unexpected distribution probe error' >&2
-\t\treturn 1
-\t\t;;
-\tesac
-\treturn 1
-}}
-state="$(find_site_distribution fake-distribution)"
-find_status=$?
-printf '{STATE_MARKER}%s\\n' "$state"
-printf '{STATUS_MARKER}%s\\n' "$find_status"
-"""
-
-    return subprocess.run(
-        ["bash", "--noprofile", "--norc", "-c", command],
-        cwd=REPO_ROOT,
-        text=True,
-        capture_output=True,
-        check=False,
-    )
-
-
 def extract_marker_value(stdout: str, marker: str) -> str:
     """Extract a single marker value from captured stdout."""
     for line in stdout.splitlines():
@@ -199,120 +155,6 @@ def test_install_vscode_extension_helper_skips_existing_extension(tmp_path: Path
     assert calls == ""
 
 
-def test_find_site_package_returns_existing_state_without_installing(tmp_path: Path) -> None:
-    """Existing packages should report state=1 and skip install/uninstall calls."""
-    result, calls = run_find_site_package_flow(tmp_path=tmp_path, package_probe_result="present")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "1"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert result.stderr == ""
-    assert calls == ""
-
-
-def test_find_site_package_reports_temporary_install_and_uninstalls_afterward(tmp_path: Path) -> None:
-    """Missing packages should report state=0 and uninstall after temporary install."""
-    result, calls = run_find_site_package_flow(tmp_path=tmp_path, package_probe_result="missing")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "0"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert "Uninstalling fake-package" in result.stdout
-    assert result.stderr == ""
-    assert calls == "install fake-package\nuninstall -y fake-package\n"
-
-
-def test_find_site_package_debug_logs_do_not_pollute_captured_state(tmp_path: Path) -> None:
-    """Debug logging should go to stderr so command substitution captures only the state value."""
-    result, calls = run_find_site_package_flow(tmp_path=tmp_path, package_probe_result="present", debug_enabled=1)
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "1"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert "find_site_package(): fake-package found" in result.stderr
-    assert calls == ""
-
-
-def test_find_site_package_propagates_install_failure(tmp_path: Path) -> None:
-    """A temporary install failure should surface as a nonzero helper status."""
-    result, calls = run_find_site_package_flow(
-        tmp_path=tmp_path,
-        package_probe_result="missing",
-        pip_install_status=1,
-    )
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == ""
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "1"
-    assert calls == "install fake-package\n"
-
-
-def test_find_site_package_propagates_unexpected_probe_errors(tmp_path: Path) -> None:
-    """Unexpected probe errors should not be treated as missing packages."""
-    result, calls = run_find_site_package_flow(tmp_path=tmp_path, package_probe_result="error")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == ""
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "1"
-    assert "unexpected package probe error" in result.stderr
-    assert calls == ""
-
-
-def test_find_site_package_treats_namespace_packages_as_present(tmp_path: Path) -> None:
-    """Namespace packages should be treated as present without a temporary install."""
-    result, calls = run_find_site_package_flow(tmp_path=tmp_path, package_probe_result="namespace")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "1"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert result.stderr == ""
-    assert calls == ""
-
-
-def test_find_site_distribution_reports_existing_state(tmp_path: Path) -> None:
-    """Existing distributions should report state=1."""
-    result = run_find_site_distribution_flow(tmp_path=tmp_path, distribution_probe_result="present")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "1"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert result.stderr == ""
-
-
-def test_find_site_distribution_reports_missing_state(tmp_path: Path) -> None:
-    """Missing distributions should report state=0."""
-    result = run_find_site_distribution_flow(tmp_path=tmp_path, distribution_probe_result="missing")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "0"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert result.stderr == ""
-
-
-def test_find_site_distribution_propagates_probe_errors(tmp_path: Path) -> None:
-    """Unexpected distribution probe errors should surface as a nonzero status."""
-    result = run_find_site_distribution_flow(tmp_path=tmp_path, distribution_probe_result="error")
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == ""
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "1"
-    assert "unexpected distribution probe error" in result.stderr
-
-
-def test_find_site_distribution_debug_logs_go_to_stderr(tmp_path: Path) -> None:
-    """Debug logging should stay off stdout for distribution-state capture."""
-    result = run_find_site_distribution_flow(
-        tmp_path=tmp_path,
-        distribution_probe_result="present",
-        debug_enabled=1,
-    )
-
-    assert result.returncode == 0
-    assert extract_marker_value(result.stdout, STATE_MARKER) == "1"
-    assert extract_marker_value(result.stdout, STATUS_MARKER) == "0"
-    assert "find_site_distribution(): fake-distribution exists = 1" in result.stderr
-
-
 def test_install_vscode_extension_helper_installs_missing_extension(tmp_path: Path) -> None:
     """Missing extensions should trigger a VS Code install command."""
     installed_extensions = "\n".join(["bungcip.better-toml", "ms-python.flake8"])
@@ -342,6 +184,41 @@ def test_install_vscode_extension_helper_skips_dash_prefixed_existing_extension(
     assert calls == ""
 
 
+def test_install_vscode_extensions_installs_every_missing_extension_at_once(tmp_path: Path) -> None:
+    """Missing extensions should be installed by one code invocation, from the VSIX directory when possible."""
+    calls_file = tmp_path / "code_calls.txt"
+    vsix_dir = tmp_path / "vsix"
+    vsix_dir.mkdir()
+    (vsix_dir / "ms-python.flake8-2023.10.0.vsix").write_text("", encoding="utf-8")
+    (vsix_dir / "ms-python.flake8-2024.2.0.vsix").write_text("", encoding="utf-8")
+    (vsix_dir / "ms-python.flake8-2024.10.0.vsix").write_text("", encoding="utf-8")
+    (vsix_dir / "ms-python.isort.vsix").write_text("", encoding="utf-8")
+    (vsix_dir / "ms-python.isort-tools-1.0.0.vsix").write_text("", encoding="utf-8")
+    normalized_functions_script = write_normalized_functions_script(tmp_path)
+    command = f"""
+source "{normalized_functions_script}"
+code() {{
+\tprintf '%s\\n' "$*" >> "{calls_file}"
+}}
+install_vscode_extensions "MS-Python.Python" "{vsix_dir}" ms-python.python ms-python.isort ms-python.flake8
+"""
+
+    result = subprocess.run(
+        ["bash", "--noprofile", "--norc", "-c", command],
+        cwd=REPO_ROOT,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+    assert result.returncode == 0
+    assert result.stderr == ""
+    assert calls_file.read_text(encoding="utf-8") == (
+        f"--install-extension {vsix_dir}/ms-python.isort.vsix "
+        f"--install-extension {vsix_dir}/ms-python.flake8-2024.10.0.vsix --force\n"
+    )
+
+
 def test_ensure_vscode_launch_file_creates_missing_launch_without_overwrite_flag(tmp_path: Path) -> None:
     """A missing launch.json should be created from the sample by default."""
     result, launch_contents = run_ensure_vscode_launch_file(
@@ -400,3 +277,196 @@ def test_ensure_vscode_launch_file_preserves_existing_launch_without_overwrite_f
     assert result.stdout == ""
     assert result.stderr == ""
     assert launch_contents == '{"version":"existing"}\n'
+
+
+def test_ensure_tool_venv_builds_environment_once(tmp_path: Path) -> None:
+    """The tool environment should be built on first use and reused afterwards."""
+    first_result, first_calls = run_ensure_tool_venv(tmp_path=tmp_path)
+
+    tool_python = extract_marker_value(first_result.stdout, TOOL_PYTHON_MARKER)
+    assert extract_marker_value(first_result.stdout, TOOL_STATUS_MARKER) == "0"
+    assert tool_python.startswith(str(tmp_path / "cache" / "tool-venvs" / "3.14.3-"))
+    assert tool_python.endswith("/bin/python")
+    assert (Path(tool_python).parents[1] / ".complete").exists()
+    assert first_calls.count("-m venv") == 1
+    assert first_calls.count("-m pip install") == 1
+
+    (tmp_path / "python_calls.txt").unlink()
+    second_result, second_calls = run_ensure_tool_venv(tmp_path=tmp_path)
+
+    assert extract_marker_value(second_result.stdout, TOOL_PYTHON_MARKER) == tool_python
+    assert extract_marker_value(second_result.stdout, TOOL_STATUS_MARKER) == "0"
+    assert "-m venv" not in second_calls
+    assert "-m pip" not in second_calls
+
+
+def test_ensure_tool_venv_rebuilds_when_requirements_change(tmp_path: Path) -> None:
+    """Changing the tool requirements should produce a new tool environment."""
+    first_result, _first_calls = run_ensure_tool_venv(tmp_path=tmp_path)
+    second_result, second_calls = run_ensure_tool_venv(tmp_path=tmp_path, requirements="tomlkit\nconfigupdater\n")
+
+    assert extract_marker_value(first_result.stdout, TOOL_PYTHON_MARKER) != extract_marker_value(
+        second_result.stdout, TOOL_PYTHON_MARKER
+    )
+    assert second_calls.count("-m venv") == 2
+
+
+def test_ensure_tool_venv_is_keyed_by_the_interpreter(tmp_path: Path) -> None:
+    """Another interpreter gets its own environment, built where it is used since venvs cannot be moved."""
+    first_result, _first_calls = run_ensure_tool_venv(tmp_path=tmp_path)
+    second_result, second_calls = run_ensure_tool_venv(tmp_path=tmp_path, interpreter="3.14.4")
+
+    second_python = extract_marker_value(second_result.stdout, TOOL_PYTHON_MARKER)
+    assert second_python != extract_marker_value(first_result.stdout, TOOL_PYTHON_MARKER)
+    assert second_python.startswith(str(tmp_path / "cache" / "tool-venvs" / "3.14.4-"))
+    assert f"-m venv {Path(second_python).parents[1]}" in second_calls
+    assert not list((tmp_path / "cache" / "tool-venvs").glob("*.lock"))
+
+
+def test_ensure_tool_venv_cleans_up_failed_install(tmp_path: Path) -> None:
+    """A failed install should return a nonzero status and leave no partial environment behind."""
+    result, calls = run_ensure_tool_venv(tmp_path=tmp_path, pip_install_status=1)
+
+    assert extract_marker_value(result.stdout, TOOL_STATUS_MARKER) == "1"
+    assert extract_marker_value(result.stdout, TOOL_PYTHON_MARKER) == ""
+    assert "-m pip install" in calls
+    assert not list((tmp_path / "cache" / "tool-venvs").iterdir())
+
+
+def test_ensure_tool_venv_debug_logs_go_to_stderr(tmp_path: Path) -> None:
+    """Debug logging should stay off stdout so command substitution captures only the interpreter path."""
+    result, _calls = run_ensure_tool_venv(tmp_path=tmp_path, debug_enabled=1)
+
+    assert extract_marker_value(result.stdout, TOOL_STATUS_MARKER) == "0"
+    assert "ensure_tool_venv(): Building tool environment at" in result.stderr
+    assert "ensure_tool_venv()" not in result.stdout
+
+
+def run_scheduled_regions_helper(
+    tmp_path: Path, parallel: int, failing_region: str = ""
+) -> subprocess.CompletedProcess[str]:
+    """Schedule a small region graph that records when each region runs, and run it."""
+    normalized_functions_script = write_normalized_functions_script(tmp_path)
+    order_file = tmp_path / "order.txt"
+    command = f"""
+source "{normalized_functions_script}"
+region() {{
+\techo "output of $1"
+\tif [ "$1" = "{failing_region}" ]; then
+\t\terror "$1 failed"
+\tfi
+\tprintf '%s\\n' "$1" >> "{order_file}"
+}}
+slow() {{ sleep 0.3; region slow; }}
+fast() {{ region fast; }}
+after_both() {{ region after_both; }}
+after_fast() {{ region after_fast; }}
+schedule_region slow slow
+schedule_region fast fast
+schedule_region after_both after_both slow fast
+schedule_region after_fast after_fast fast
+run_scheduled_regions {parallel}
+echo "scheduler_status=$?"
+"""
+
+    return subprocess.run(
+        ["bash", "--noprofile", "--norc", "-c", command],
+        cwd=REPO_ROOT,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+
+def test_run_scheduled_regions_runs_independent_regions_concurrently(tmp_path: Path) -> None:
+    """Regions should start as soon as their dependencies finish, and their output should be prefixed."""
+    result = run_scheduled_regions_helper(tmp_path=tmp_path, parallel=1)
+
+    assert "scheduler_status=0" in result.stdout
+    order = (tmp_path / "order.txt").read_text(encoding="utf-8").split()
+    assert order.index("fast") < order.index("slow")
+    assert order.index("after_fast") < order.index("slow")
+    assert order[-1] == "after_both"
+    assert "[slow] output of slow" in result.stdout
+    assert "[after_both] output of after_both" in result.stdout
+
+
+def test_run_scheduled_regions_skips_dependents_of_failed_regions(tmp_path: Path) -> None:
+    """A failed region should skip the regions that depend on it and make the scheduler fail."""
+    result = run_scheduled_regions_helper(tmp_path=tmp_path, parallel=1, failing_region="fast")
+
+    assert "scheduler_status=1" in result.stdout
+    assert (tmp_path / "order.txt").read_text(encoding="utf-8").split() == ["slow"]
+    assert "[fast] fast failed" in result.stdout
+    assert "Skipping after_both because a region it depends on failed" in result.stdout
+    assert "Failed or skipped regions: fast after_both after_fast" in result.stderr
+
+
+def test_run_scheduled_regions_sequential_keeps_scheduling_order(tmp_path: Path) -> None:
+    """parallel=0 should run the regions in the order they were scheduled without prefixing their output."""
+    result = run_scheduled_regions_helper(tmp_path=tmp_path, parallel=0)
+
+    assert "scheduler_status=0" in result.stdout
+    order = (tmp_path / "order.txt").read_text(encoding="utf-8").split()
+    assert order == ["slow", "fast", "after_both", "after_fast"]
+    assert "output of slow" in result.stdout
+    assert "[slow]" not in result.stdout
+
+
+def test_start_outdated_report_does_not_leave_a_pid_file_behind(tmp_path: Path) -> None:
+    """A refresh that finishes at once should remove its pid file, which is never written back after it."""
+    normalized_functions_script = write_normalized_functions_script(tmp_path)
+    report_file = tmp_path / "report"
+    command = f"""
+source "{normalized_functions_script}"
+(
+\tbackground_pid
+\techo "$BASHPID"
+)
+for run in 1 2 3 4 5; do
+\tstart_outdated_report "{report_file}" 0 "{tmp_path}/missing.lock" printf 'pkg 1.0 2.0\\n'
+\twait
+\t[ -f "{report_file}.pid" ] && echo "pid file left behind"
+done
+print_outdated_report "{report_file}" "Update them."
+"""
+
+    result = subprocess.run(
+        ["bash", "--noprofile", "--norc", "-c", command],
+        cwd=REPO_ROOT,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+    background_pid, subshell_pid = result.stdout.splitlines()[:2]
+    assert background_pid == subshell_pid
+    assert "pid file left behind" not in result.stdout
+    assert "Outdated packages:\npkg 1.0 2.0\nUpdate them." in result.stdout
+
+
+def test_start_pre_commit_install_hooks_keeps_the_status_of_a_build_that_finished_at_once(tmp_path: Path) -> None:
+    """The exit status written by the build should never be overwritten with a running state."""
+    normalized_functions_script = write_normalized_functions_script(tmp_path)
+    (tmp_path / ".pre-commit-config.yaml").write_text("repos: []\n", encoding="utf-8")
+    status_file = tmp_path / "status"
+    command = f"""
+source "{normalized_functions_script}"
+pre-commit() {{ return 3; }}
+for run in 1 2 3 4 5; do
+\trm -f "{status_file}"
+\tstart_pre_commit_install_hooks "{status_file}" "{tmp_path}/log"
+\twait
+\tcut -d ' ' -f 1 "{status_file}"
+done
+"""
+
+    result = subprocess.run(
+        ["bash", "--noprofile", "--norc", "-c", command],
+        cwd=tmp_path,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+    assert result.stdout.splitlines()[1::2] == ["3"] * 5
@@ -0,0 +1,98 @@
+"""Tests for src/options.py."""
+
+import subprocess
+
+import pytest
+
+from src.cli import build_parser
+from src.options import (
+    OPTIONS_ENV_VAR,
+    SetupOptions,
+    dump_options,
+    load_options,
+    main,
+    parse_setup_options,
+    shell_assignments,
+)
+
+
+def test_parse_setup_options_normalises_flags_and_ignores_shell_only_options():
+    """Flags given without a value or as 0/1 should become booleans, and shell only options should be ignored."""
+    options = parse_setup_options(
+        ["-d", "--rebuild_venv=1", "--is_package", "--include_isort=0", "--python_formatter=", "--line_length=100"]
+    )
+
+    assert options == SetupOptions(
+        debug=True, is_package=True, include_isort=False, python_formatter="", line_length=100
+    )
+
+
+@pytest.mark.parametrize(
+    "argument, message",
+    [
+        (
+            "--python_formatter=yapf",
+            "Invalid python_formatter option: (yapf). Valid values are ['', 'autopep8', 'black']",
+        ),
+        ("--isort_profile=fake", "Invalid isort_profile option: (fake)"),
+        ("--package_manager=conda", "Invalid package_manager option: (conda)"),
+        ("--pylint_enabled=2", "Invalid pylint_enabled option: (2). Valid values are [0, 1]"),
+        ("--line_length=0", "Invalid line_length option: (0)"),
+        ("--mypy_mode=server", "Invalid mypy_mode option: (server). Valid values are ['process', 'daemon']"),
+    ],
+)
+def test_parse_setup_options_rejects_invalid_values(argument: str, message: str, capsys: pytest.CaptureFixture[str]):
+    """Every option should be validated in one place, with the messages setup_python_app.sh used to print."""
+    with pytest.raises(SystemExit) as exc_info:
+        parse_setup_options([argument])
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_parse_setup_options_keeps_the_tool_performance_profile_unset_unless_given():
+    """The profile is three-state: unset leaves its settings alone, while 0 removes them."""
+    assert parse_setup_options([]).tool_performance_profile is None
+    assert parse_setup_options(["--tool_performance_profile"]).tool_performance_profile is True
+    assert parse_setup_options(["--tool_performance_profile=0"]).tool_performance_profile is False
+    assert "tool_performance_profile=''" in shell_assignments(SetupOptions())
+    assert load_options(dump_options(SetupOptions())).tool_performance_profile is None
+
+
+def test_options_round_trip_through_json():
+    """Serialised options should load back unchanged, and missing options should get their default."""
+    options = SetupOptions(include_prettier=False, isort_profile="google", line_length=88)
+
+    assert load_options(dump_options(options)) == options
+    assert load_options('{"line_length": 88}') == SetupOptions(line_length=88)
+
+
+def test_main_prints_shell_assignments_that_export_the_options(capsys: pytest.CaptureFixture[str]):
+    """The printed assignments should set 0/1 shell variables and export the options for the processors."""
+    assert main(["--include_prettier=false", "--python_formatter=", "--pre_commit_pylint_entry_prefix=a b/"]) == 0
+    output = capsys.readouterr().out
+
+    result = subprocess.run(
+        ["bash", "-c", f'{output}\nprintf "%s|%s|%s\\n" "$include_prettier" "$python_formatter" "${OPTIONS_ENV_VAR}"'],
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+
+    include_prettier, python_formatter, exported = result.stdout.strip().split("|")
+    assert (include_prettier, python_formatter) == ("0", "")
+    assert load_options(exported) == SetupOptions(
+        include_prettier=False, python_formatter="", pre_commit_pylint_entry_prefix="a b/"
+    )
+
+
+def test_build_parser_uses_the_exported_options_as_defaults(monkeypatch: pytest.MonkeyPatch):
+    """Processors launched by the setup should not need the setup arguments, explicit arguments still win."""
+    monkeypatch.setenv(OPTIONS_ENV_VAR, dump_options(SetupOptions(line_length=88, include_isort=False)))
+
+    args, _unknown = build_parser().parse_known_args(["--steps=flake8"])
+    assert args.line_length == 88
+    assert args.include_isort is False
+
+    args, _unknown = build_parser().parse_known_args(["--line_length=100"])
+    assert args.line_length == 100
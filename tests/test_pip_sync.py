@@ -0,0 +1,154 @@
+"""Tests for src/pip_sync.py."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src import pip_sync
+from src.pip_sync import (
+    InstalledDistribution,
+    RequirementsSet,
+    parse_requirements_file,
+    plan_sync,
+    split_requirement_line,
+    sync,
+)
+
+INSTALLED = {
+    "pip": InstalledDistribution(version="25.0", requires=[]),
+    "setuptools": InstalledDistribution(version="80.0", requires=[]),
+    "pytest": InstalledDistribution(
+        version="8.3.0",
+        requires=["iniconfig", "pluggy<2,>=1.5", 'pygments>=2; extra == "dev"', 'tomli>=1; python_version < "3.0"'],
+    ),
+    "iniconfig": InstalledDistribution(version="2.0.0", requires=[]),
+    "pluggy": InstalledDistribution(version="1.5.0", requires=[]),
+    "pygments": InstalledDistribution(version="2.19.0", requires=[]),
+    "tomli": InstalledDistribution(version="2.2.1", requires=[]),
+    "black": InstalledDistribution(version="24.1.0", requires=["click>=8"]),
+    "click": InstalledDistribution(version="8.1.7", requires=[]),
+}
+
+
+def requirements(*named: str) -> RequirementsSet:
+    """Build a set of named requirements."""
+    return RequirementsSet(named=list(named), unnamed=[], options=[])
+
+
+def test_parse_requirements_file_follows_includes_and_splits_lines(tmp_path: Path):
+    """Included files are read, options are passed through and lines pip cannot compare are kept apart."""
+    (tmp_path / "requirements.txt").write_text("pydantic[dotenv]>=2  # runtime\n-e .\n", encoding="utf-8")
+    (tmp_path / "requirements-dev.txt").write_text(
+        "# dev tools\n--index-url https://example.org/simple\n-r requirements.txt\n-c constraints.txt\n"
+        'pytest==8.3.0 \\\n    ; python_version >= "3.8"\n',
+        encoding="utf-8",
+    )
+
+    parsed = parse_requirements_file(tmp_path / "requirements-dev.txt")
+
+    assert parsed.named == ["pydantic[dotenv]>=2", 'pytest==8.3.0      ; python_version >= "3.8"']
+    assert parsed.unnamed == [["-e", "."]]
+    assert parsed.options == [
+        "--index-url",
+        "https://example.org/simple",
+        "--constraint",
+        f"{tmp_path}/constraints.txt",
+    ]
+
+
+def test_parse_requirements_file_keeps_hashed_requirements_named(tmp_path: Path):
+    """pip-compile --generate-hashes output is compared with the environment, with its hashes kept."""
+    (tmp_path / "requirements.txt").write_text(
+        "requests==2.31.0 \\\n    --hash=sha256:aaa \\\n    --hash=sha256:bbb\n    # via -r requirements.in\n",
+        encoding="utf-8",
+    )
+
+    parsed = parse_requirements_file(tmp_path / "requirements.txt")
+
+    assert not parsed.unnamed
+    assert [split_requirement_line(line) for line in parsed.named] == [
+        ("requests==2.31.0", ["--hash=sha256:aaa", "--hash=sha256:bbb"])
+    ]
+    assert plan_sync(parsed, INSTALLED).install == parsed.named
+
+
+def test_plan_sync_installs_missing_and_outdated_requirements_and_uninstalls_extras():
+    """Only what is missing or at an unsatisfying version is installed, and unrequired distributions are removed."""
+    plan = plan_sync(requirements("pytest==8.3.0", "Pluggy>=1.6", "requests"), INSTALLED)
+
+    assert plan.install == ["Pluggy>=1.6", "requests"]
+    # pygments is only required by an extra nobody asked for and tomli by a marker that does not apply
+    assert plan.uninstall == ["black", "click", "pygments", "tomli"]
+
+
+def test_plan_sync_keeps_the_dependencies_of_requested_extras():
+    """The dependencies an extra pulls in are required too."""
+    plan = plan_sync(requirements("pytest[dev]", "black"), INSTALLED)
+
+    assert not plan.install
+    assert plan.uninstall == ["tomli"]
+
+
+def test_plan_sync_does_not_uninstall_when_some_requirements_are_not_named():
+    """The dependencies of a requirement like `-e .` are unknown, so nothing can be considered extra."""
+    plan = plan_sync(RequirementsSet(named=["pytest"], unnamed=[["-e", "."]], options=[]), INSTALLED)
+
+    assert not plan.install
+    assert not plan.uninstall
+
+
+def test_sync_runs_pip_only_for_the_changes(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]):
+    """pip should be called once to install and once to uninstall, with the options of the requirements files."""
+    calls: List[List[str]] = []
+    monkeypatch.setattr(pip_sync, "installed_distributions", lambda: INSTALLED)
+    monkeypatch.setattr(pip_sync, "_pip", lambda *args: calls.append(list(args)) or 0)
+
+    status = sync(
+        RequirementsSet(named=["pytest", "black", "requests"], unnamed=[], options=["--no-deps"]), strict=True
+    )
+
+    assert status == 0
+    assert calls == [
+        ["install", "--no-deps", "requests"],
+        ["uninstall", "--yes", "pygments", "tomli"],
+    ]
+    assert "Installing 1 missing or outdated requirement(s): requests" in capsys.readouterr().out
+
+    calls.clear()
+    assert sync(requirements("pytest[dev]", "black", "tomli"), strict=True) == 0
+    assert not calls
+    assert "All requirements are already installed" in capsys.readouterr().out
+
+
+def test_sync_passes_hashes_to_pip_in_a_requirements_file(monkeypatch: pytest.MonkeyPatch):
+    """pip only accepts --hash in a requirements file, so the requirements to install are written to one."""
+    installed_with: List[str] = []
+
+    def fake_pip(*args: str) -> int:
+        installed_with.extend([*args, Path(args[-1]).read_text(encoding="utf-8")])
+        return 0
+
+    monkeypatch.setattr(pip_sync, "installed_distributions", lambda: INSTALLED)
+    monkeypatch.setattr(pip_sync, "_pip", fake_pip)
+
+    assert sync(requirements("pytest==8.3.0 --hash=sha256:aaa", "requests==2.31.0 --hash=sha256:bbb")) == 0
+    assert installed_with[:2] == ["install", "--requirement"]
+    assert installed_with[-1] == "requests==2.31.0 --hash=sha256:bbb\n"
+
+
+def test_sync_only_uninstalls_what_a_previous_sync_installed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Distributions installed by hand, and their dependencies, are kept when the requirements change."""
+    calls: List[List[str]] = []
+    record = tmp_path / ".urs-pip-sync-managed"
+    monkeypatch.setattr(pip_sync, "installed_distributions", lambda: INSTALLED)
+    monkeypatch.setattr(pip_sync, "_pip", lambda *args: calls.append(list(args)) or 0)
+
+    # The first sync of an existing environment cannot tell what was installed by hand, so it uninstalls nothing
+    assert sync(requirements("pytest[dev]", "tomli", "click"), record=record) == 0
+    assert not calls
+    assert record.read_text(encoding="utf-8").split() == ["click", "iniconfig", "pluggy", "pygments", "pytest", "tomli"]
+
+    # black was never required, so it and its dependency click are kept, while pygments and tomli were dropped
+    assert sync(requirements("pytest"), record=record) == 0
+    assert calls == [["uninstall", "--yes", "pygments", "tomli"]]
@@ -0,0 +1,157 @@
+"""Tests for src/pylint_cache.py."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src import pylint_cache
+from src.pylint_cache import imported_files, prune_cache, split_command
+
+# Lints by reporting an unused-import warning per `import os` line and records the files it was given
+FAKE_PYLINT = """
+import json
+import sys
+
+args = sys.argv[1:]
+output_format = next((arg for arg in args if arg.startswith("--output-format=")), "")
+report_path = output_format.split("json2:", 1)[1] if "json2:" in output_format else None
+files = [arg for arg in args if arg.endswith(".py")]
+with open("lint-calls.log", "a", encoding="utf-8") as log:
+    log.write(" ".join(files) + "\\n")
+messages = []
+for file in files:
+    with open(file, encoding="utf-8") as source:
+        for number, line in enumerate(source, start=1):
+            if line.strip() == "import os":
+                messages.append(
+                    {
+                        "type": "warning",
+                        "symbol": "unused-import",
+                        "message": "Unused import os",
+                        "messageId": "W0611",
+                        "module": file[:-3].replace("/", "."),
+                        "line": number,
+                        "column": 0,
+                        "path": file,
+                    }
+                )
+for message in messages:
+    print(f"{message['path']}:{message['line']}:0: W0611: Unused import os (unused-import)")
+if report_path:
+    with open(report_path, "w", encoding="utf-8") as report:
+        json.dump({"messages": messages}, report)
+sys.exit(4 if messages else 0)
+"""
+
+
+@pytest.fixture(name="project_dir")
+def fixture_project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A project with a fake pylint, linted from its directory with a private cache."""
+    project_dir = tmp_path / "project"
+    (project_dir / "pkg").mkdir(parents=True)
+    (project_dir / "fake_pylint").write_text(FAKE_PYLINT, encoding="utf-8")
+    (project_dir / ".pylintrc").write_text("[MAIN]\n", encoding="utf-8")
+    (project_dir / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (project_dir / "pkg" / "models.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (project_dir / "app.py").write_text("import os\nfrom pkg.models import VALUE\n", encoding="utf-8")
+    (project_dir / "clean.py").write_text("X = 1\n", encoding="utf-8")
+    monkeypatch.chdir(project_dir)
+    monkeypatch.setenv("UTILITY_REPO_SCRIPTS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(pylint_cache, "_distribution_version", lambda name: "3.3.0")
+    return project_dir
+
+
+def lint(capsys: pytest.CaptureFixture[str], *files: str) -> List[str]:
+    """Lint through the cache and return the files the fake pylint was run with and the output."""
+    log = Path("lint-calls.log")
+    log.unlink(missing_ok=True)
+    status = pylint_cache.main(["--", sys.executable, "fake_pylint", "-v", "--rcfile=.pylintrc", *files])
+    calls = log.read_text(encoding="utf-8").splitlines() if log.exists() else []
+    return [str(status), *calls, capsys.readouterr().out]
+
+
+def test_split_command_finds_the_files_pre_commit_appended(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Files are the trailing python files, a configuration file given as an option value is not one of them."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "app.py").write_text("", encoding="utf-8")
+    (tmp_path / "manage").write_text("#!/usr/bin/env python3\n", encoding="utf-8")
+    (tmp_path / ".pylintrc").write_text("", encoding="utf-8")
+
+    assert split_command(["python", "server.py", "-v", "--rcfile", ".pylintrc", "manage", "app.py"]) == (
+        ["python", "server.py"],
+        ["-v", "--rcfile", ".pylintrc"],
+        ["manage", "app.py"],
+    )
+
+
+def test_imported_files_resolves_direct_project_imports(project_dir: Path):
+    """Absolute and relative imports of project modules are found, third party imports are not."""
+    (project_dir / "pkg" / "views.py").write_text(
+        "import json\nfrom . import models\nfrom .. import app\nimport pkg\n", encoding="utf-8"
+    )
+
+    assert imported_files(Path("pkg/views.py")) == [Path("app.py"), Path("pkg/__init__.py"), Path("pkg/models.py")]
+
+
+def test_main_only_lints_the_files_that_changed(project_dir: Path, capsys: pytest.CaptureFixture[str]):
+    """Hits are replayed with their exit status, misses are linted, and imports are part of the key."""
+    first = lint(capsys, "app.py", "clean.py")
+    assert first[:2] == ["4", "app.py clean.py"]
+
+    second = lint(capsys, "app.py", "clean.py")
+    assert second == [
+        "4",
+        "************* Module app\napp.py:1:0: W0611: Unused import os (unused-import)\n",
+    ]
+
+    (project_dir / "pkg" / "models.py").write_text("VALUE = 2\n", encoding="utf-8")
+    third = lint(capsys, "app.py", "clean.py")
+    assert third[:2] == ["4", "app.py"]
+
+    (project_dir / ".pylintrc").write_text("[MAIN]\njobs = 2\n", encoding="utf-8")
+    fourth = lint(capsys, "clean.py")
+    assert fourth[:2] == ["0", "clean.py"]
+
+
+def test_main_does_not_cache_runs_that_failed(project_dir: Path, capsys: pytest.CaptureFixture[str]):
+    """A fatal or usage error means the files were not linted, so nothing is cached."""
+    (project_dir / "fake_pylint").write_text("import sys\nsys.exit(32)\n", encoding="utf-8")
+
+    assert lint(capsys, "clean.py") == ["32", ""]
+    assert lint(capsys, "clean.py") == ["32", ""]
+    assert not list((project_dir.parent / "cache").glob("pylint-results/*/*.json"))
+
+
+def test_main_runs_pylint_without_the_cache_when_it_has_no_json2_reporter(
+    project_dir: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+):
+    """pylint 2 cannot write the JSON report, so the original command runs every time and nothing is cached."""
+    monkeypatch.setattr(pylint_cache, "_distribution_version", lambda name: "2.17.7")
+
+    assert lint(capsys, "app.py", "clean.py")[:2] == ["4", "app.py clean.py"]
+    assert lint(capsys, "app.py", "clean.py")[:2] == ["4", "app.py clean.py"]
+    assert not list((project_dir.parent / "cache").glob("pylint-results/*/*.json"))
+
+
+def test_prune_cache_deletes_unused_entries_once_a_day(project_dir: Path):
+    """Entries unused for a month are deleted, and the cache is only scanned once a day."""
+    cache_dir = project_dir.parent / "cache" / "pylint-results"
+    old_entry = cache_dir / "ab" / "old.json"
+    new_entry = cache_dir / "cd" / "new.json"
+    for entry in (old_entry, new_entry):
+        entry.parent.mkdir(parents=True)
+        entry.write_text(json.dumps([]), encoding="utf-8")
+    now = os.stat(new_entry).st_mtime
+    os.utime(old_entry, (now - 31 * 24 * 3600, now - 31 * 24 * 3600))
+
+    prune_cache(now=now)
+    assert not old_entry.exists()
+    assert new_entry.exists()
+
+    os.utime(new_entry, (now - 31 * 24 * 3600, now - 31 * 24 * 3600))
+    prune_cache(now=now)
+    assert new_entry.exists()
@@ -0,0 +1,147 @@
+"""Tests for src/pylint_server.py."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, List, Sequence, Tuple
+
+import pytest
+
+from src import pylint_server
+from src.pylint_server import PylintServer, ServerPaths, refresh_astroid_cache, request_lint, server_paths
+
+
+@pytest.fixture(name="short_tmp_dir")
+def fixture_short_tmp_dir(monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """A temporary directory short enough for Unix socket paths, also used as the system temporary directory."""
+    path = Path(tempfile.mkdtemp(prefix="urs"))
+    monkeypatch.setattr(tempfile, "tempdir", str(path))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class FakeLinter:
+    """Record the lint requests and answer with the number of the request."""
+
+    def __init__(self):
+        """Initialize the FakeLinter class."""
+        self.requests: List[Tuple[str, List[str]]] = []
+
+    def __call__(self, cwd: str, args: Sequence[str]) -> Tuple[int, str]:
+        """Lint a request."""
+        self.requests.append((cwd, list(args)))
+        return len(self.requests), f"run {len(self.requests)}: {' '.join(args)}\n"
+
+
+def start_thread_server(server: PylintServer) -> threading.Thread:
+    """Serve in a thread and wait until the socket accepts connections."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if server.socket_path.exists():
+            break
+        threading.Event().wait(0.01)
+    return thread
+
+
+def test_refresh_astroid_cache_drops_project_and_changed_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Dependency trees should be kept, unless their file changed after they were built."""
+    project_dir = tmp_path / "project"
+    monkeypatch.setattr(sys, "prefix", str(project_dir / ".venv"))
+    files = {
+        "app": project_dir / "app.py",
+        "requests": project_dir / ".venv" / "lib" / "requests.py",
+        "json": tmp_path / "python" / "json.py",
+        "upgraded": tmp_path / "python" / "upgraded.py",
+    }
+    for path in files.values():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+    manager = SimpleNamespace(
+        astroid_cache={name: SimpleNamespace(file=str(path)) for name, path in files.items()},
+        _mod_file_cache={("app", None): "spec"},
+    )
+    manager.astroid_cache["builtins"] = SimpleNamespace(file=None)
+    loaded_at = {"upgraded": 0.0}
+
+    dropped = refresh_astroid_cache(manager, str(project_dir), loaded_at, last_run=os.stat(files["json"]).st_mtime + 1)
+
+    assert sorted(dropped) == ["app", "upgraded"]
+    assert sorted(manager.astroid_cache) == ["builtins", "json", "requests"]
+    assert sorted(loaded_at) == ["json", "requests"]
+    assert not manager._mod_file_cache  # pylint: disable=protected-access
+
+
+def test_request_lint_starts_the_server_once_and_reuses_it(short_tmp_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    """The first request starts the server, the next ones are answered by the same server."""
+    paths = server_paths(str(short_tmp_dir / "project"))
+    linter = FakeLinter()
+    servers: List[PylintServer] = []
+
+    def start_server(started_paths: ServerPaths):
+        server = PylintServer(
+            started_paths.socket,
+            idle_timeout=5,
+            lint=linter,
+            manager=SimpleNamespace(astroid_cache={}),
+            fingerprint=tuple,
+        )
+        servers.append(server)
+        start_thread_server(server)
+
+    monkeypatch.setattr(pylint_server, "start_server", start_server)
+
+    first = request_lint(paths, {"cwd": str(short_tmp_dir), "args": ["-v", "app.py"]})
+    second = request_lint(paths, {"cwd": str(short_tmp_dir), "args": ["lib.py"]})
+
+    assert first == {"status": 1, "output": "run 1: -v app.py\n"}
+    assert second == {"status": 2, "output": "run 2: lib.py\n"}
+    assert len(servers) == 1
+    assert linter.requests == [(str(short_tmp_dir), ["-v", "app.py"]), (str(short_tmp_dir), ["lib.py"])]
+
+
+def test_server_asks_for_a_restart_when_pylint_is_reinstalled(short_tmp_dir: Path):
+    """A server whose pylint or astroid changed should stop instead of linting with the old code."""
+    installations = iter([(1,), (2,)])
+    linter = FakeLinter()
+    server = PylintServer(
+        short_tmp_dir / "pylint.sock", idle_timeout=5, lint=linter, fingerprint=lambda: next(installations)
+    )
+    thread = start_thread_server(server)
+
+    response = pylint_server.send_request(server.socket_path, {"cwd": str(short_tmp_dir), "args": []})
+    thread.join(timeout=5)
+
+    assert response == {"restart": True}
+    assert not linter.requests
+    assert not thread.is_alive()
+    assert not server.socket_path.exists()
+
+
+def test_client_runs_pylint_in_a_new_process_without_a_server(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """The hook should still lint when the server cannot be used."""
+
+    def unavailable(*_args):
+        raise PermissionError("not private")
+
+    monkeypatch.setattr(pylint_server, "server_paths", unavailable)
+    monkeypatch.setattr(pylint_server, "run_pylint_process", lambda args: 16 if list(args) == ["app.py"] else 0)
+
+    assert pylint_server.client(["app.py"]) == 16
+    assert "running pylint in a new process" in capsys.readouterr().err
+
+
+def test_server_paths_refuses_a_directory_other_users_can_access(short_tmp_dir: Path):
+    """Other users must not be able to reach the socket."""
+    server_dir = short_tmp_dir / f"urs-pylint-{os.getuid()}"
+    server_dir.mkdir(mode=0o777)
+    server_dir.chmod(0o777)
+
+    with pytest.raises(PermissionError):
+        server_paths(str(short_tmp_dir))
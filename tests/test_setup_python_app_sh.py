@@ -1,18 +1,22 @@
 """Integration tests for setup_python_app.sh using PATH-based command shims."""
 
+import json
 import os
 import shutil
 import stat
 import subprocess
+import sys
 import textwrap
+import time
 from pathlib import Path
-from typing import Collection, Sequence, Tuple
+from typing import Collection, Optional, Sequence, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SETUP_PYTHON_APP_SCRIPT = REPO_ROOT / "setup_python_app.sh"
 CALLS_FILE_ENV = "SETUP_PYTHON_APP_TEST_CALLS_FILE"
 BIN_DIR_ENV = "SETUP_PYTHON_APP_TEST_BIN_DIR"
 CODE_EXTENSIONS_ENV = "SETUP_PYTHON_APP_TEST_CODE_EXTENSIONS"
+PYTHON_ENV = "SETUP_PYTHON_APP_TEST_PYTHON"
 
 
 def write_executable(path: Path, contents: str) -> None:
@@ -49,57 +53,82 @@ EOF
                 exit 0
             fi
 
+            # The interpreter ensure_tool_venv keys the tool environment by
             if [ "${1:-}" = "-c" ]; then
-                case "${2:-}" in
-                *"importlib.util.find_spec"*)
-                    printf 'present:/fake/site-packages/%s.py\\n' "${3:-package}"
-                    exit 0
-                    ;;
-                *"metadata.distribution"*)
-                    printf 'present\\n'
-                    exit 0
-                    ;;
-                esac
-
-                echo "unexpected python -c invocation: $*" >&2
-                exit 1
+                printf '3.14.3\n%s\n3.14.3 (main)\n' "$0"
+                exit 0
             fi
 
-            script_name="$(basename -- "${1:-}")"
-            case "$script_name" in
-            setup_prettierrc.py)
-                printf '{"semi": true}\\n' > .prettierrc
-                ;;
-            setup_pre_commit_config.py)
-                printf 'repos: []\\n' > .pre-commit-config.yaml
-                ;;
-            setup_pyproject_toml.py)
-                if [ ! -f pyproject.toml ]; then
-                    printf '[tool.poetry]\\nname = "sample-project"\\nversion = "0.1.0"\\n' > pyproject.toml
-                fi
-                :
-                ;;
-            setup_pylintrc.py)
-                printf '[MASTER]\\n' > .pylintrc
-                ;;
-            setup_flake8.py)
-                printf '[flake8]\\n' > .flake8
-                ;;
-            setup_fix_prettier_pre_commit.py)
-                if [ ! -f .pre-commit-config.yaml ]; then
-                    printf 'repos: []\\n' > .pre-commit-config.yaml
-                fi
-                printf '# prettier hook fixed\\n' >> .pre-commit-config.yaml
-                ;;
-            setup_vscode_settings.py)
-                mkdir -p .vscode
-                printf '{"python.testing.pytestEnabled": true}\\n' > .vscode/settings.json
-                ;;
-            *)
-                echo "unexpected python invocation: $*" >&2
-                exit 1
-                ;;
-            esac
+            if [[ "${1:-}" == */src/pip_sync.py ]]; then
+                exit 0
+            fi
+
+            if [ "${1:-}" = "-m" ] && [ "${2:-}" = "src.options" ]; then
+                exec "$SETUP_PYTHON_APP_TEST_PYTHON" "$@"
+            fi
+
+            if [ "${1:-}" = "-m" ] && [ "${2:-}" = "src" ]; then
+                steps="prettierrc,pre_commit_config,pyproject_toml,pylintrc,flake8"
+                steps="$steps,fix_prettier_pre_commit,vscode_settings"
+                skip_steps=""
+                for arg in "$@"; do
+                    case "$arg" in
+                    --project_dir=*)
+                        cd "${arg#--project_dir=}"
+                        ;;
+                    --steps=*)
+                        steps="${arg#--steps=}"
+                        ;;
+                    --skip_steps=*)
+                        skip_steps="${arg#--skip_steps=}"
+                        ;;
+                    --record_cache)
+                        steps=""
+                        ;;
+                    esac
+                done
+
+                for step in ${steps//,/ }; do
+                    case ",$skip_steps," in
+                    *",$step,"*)
+                        continue
+                        ;;
+                    esac
+                    case "$step" in
+                    prettierrc)
+                        printf '{"semi": true}\\n' > .prettierrc
+                        ;;
+                    pre_commit_config)
+                        printf 'repos: []\\n' > .pre-commit-config.yaml
+                        ;;
+                    pyproject_toml)
+                        if [ ! -f pyproject.toml ]; then
+                            printf '[tool.poetry]\\nname = "sample-project"\\nversion = "0.1.0"\\n' > pyproject.toml
+                        fi
+                        ;;
+                    pylintrc)
+                        printf '[MASTER]\\n' > .pylintrc
+                        ;;
+                    flake8)
+                        printf '[flake8]\\n' > .flake8
+                        ;;
+                    fix_prettier_pre_commit)
+                        if [ ! -f .pre-commit-config.yaml ]; then
+                            printf 'repos: []\\n' > .pre-commit-config.yaml
+                        fi
+                        printf '# prettier hook fixed\\n' >> .pre-commit-config.yaml
+                        ;;
+                    vscode_settings)
+                        mkdir -p .vscode
+                        printf '{"python.testing.pytestEnabled": true}\\n' > .vscode/settings.json
+                        ;;
+                    esac
+                done
+                exit 0
+            fi
+
+            echo "unexpected python invocation: $*" >&2
+            exit 1
             """,
         )
 
@@ -144,7 +173,8 @@ EOF
             f"""\
             #!/bin/bash
             set -eu
-            printf '%s\\n' "{command_name} $*" >> "$SETUP_PYTHON_APP_TEST_CALLS_FILE"
+            printf '%s\\n' "{command_name} $*${{PIP_FIND_LINKS:+ [find-links $PIP_FIND_LINKS]}}" \\
+                >> "$SETUP_PYTHON_APP_TEST_CALLS_FILE"
             exit 0
             """,
         )
@@ -205,6 +235,7 @@ def run_setup_python_app(
     args: Sequence[str] = (),
     unavailable_tools: Collection[str] = (),
     code_extensions: str = "",
+    cache_dir: Optional[Path] = None,
 ) -> Tuple[subprocess.CompletedProcess[str], str, Path]:
     """Run setup_python_app.sh with isolated fake tools and return command logs."""
     home_dir = tmp_path / "home"
@@ -216,11 +247,16 @@ def run_setup_python_app(
 
     env = os.environ.copy()
     env["HOME"] = str(home_dir)
+    env.pop("XDG_CACHE_HOME", None)
+    env.pop("UTILITY_REPO_SCRIPTS_CACHE_DIR", None)
     env["PATH"] = f"{bin_dir}:/usr/bin:/bin"
     env["SHELL"] = "/bin/bash"
     env[CALLS_FILE_ENV] = str(calls_file)
     env[BIN_DIR_ENV] = str(bin_dir)
+    env[PYTHON_ENV] = sys.executable
     env[CODE_EXTENSIONS_ENV] = code_extensions
+    if cache_dir is not None:
+        env["UTILITY_REPO_SCRIPTS_CACHE_DIR"] = str(cache_dir)
 
     result = subprocess.run(
         ["bash", "--noprofile", "--norc", str(SETUP_PYTHON_APP_SCRIPT), *args],
@@ -237,10 +273,16 @@ def run_setup_python_app(
 
 def create_setup_project(project_dir: Path) -> None:
     """Create a minimal project layout for exercising the repository setup wrapper."""
-    for relative_path in (Path("setup"), Path("setup_python_app.sh"), Path("scripts/functions.sh")):
+    for relative_path in (
+        Path("setup"),
+        Path("setup_python_app.sh"),
+        Path("scripts/functions.sh"),
+        Path("scripts/tool-requirements.txt"),
+    ):
         destination = project_dir / relative_path
         destination.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(REPO_ROOT / relative_path, destination)
+    shutil.copytree(REPO_ROOT / "src", project_dir / "src", ignore=shutil.ignore_patterns("__pycache__"))
 
 
 def run_setup_wrapper(
@@ -260,10 +302,13 @@ def run_setup_wrapper(
 
     env = os.environ.copy()
     env["HOME"] = str(home_dir)
+    env.pop("XDG_CACHE_HOME", None)
+    env.pop("UTILITY_REPO_SCRIPTS_CACHE_DIR", None)
     env["PATH"] = f"{bin_dir}:/usr/bin:/bin"
     env["SHELL"] = "/bin/bash"
     env[CALLS_FILE_ENV] = str(calls_file)
     env[BIN_DIR_ENV] = str(bin_dir)
+    env[PYTHON_ENV] = sys.executable
     env[CODE_EXTENSIONS_ENV] = code_extensions
 
     result = subprocess.run(
@@ -345,6 +390,26 @@ def test_setup_python_app_rejects_python_version_that_looks_like_an_option(tmp_p
     assert calls == ""
 
 
+def test_setup_python_app_rejects_invalid_processor_options_before_running_them(tmp_path: Path) -> None:
+    """The processor options should be validated once, before any processor or installer runs."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text('[tool.poetry]\nname = "sample-project"\n', encoding="utf-8")
+
+    result, calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=tmp_path,
+        args=["--package_manager=poetry", "--python_formatter=yapf"],
+    )
+
+    assert result.returncode == 2
+    assert "Invalid python_formatter option: (yapf)" in result.stderr
+    assert "python -m src.options" in calls
+    assert "python -m src " not in calls
+    assert "poetry sync" not in calls
+    assert "python -m venv" not in calls
+
+
 def test_setup_python_app_requires_pyenv_when_missing(tmp_path: Path) -> None:
     """The script should stop with a clear message when pyenv is unavailable."""
     project_dir = tmp_path / "sample-project"
@@ -363,7 +428,8 @@ def test_setup_python_app_requires_pyenv_when_missing(tmp_path: Path) -> None:
     assert result.returncode == 1
     assert "pyenv not installed!" in result.stdout
     assert "Please install pyenv to use this setup script." in result.stdout
-    assert calls == ""
+    # Nothing but the option validation ran
+    assert [call.split()[:3] for call in calls.splitlines()] == [["python", "-m", "src.options"]]
 
 
 def test_setup_python_app_requires_uv_when_missing_for_uv_modes(tmp_path: Path) -> None:
@@ -385,7 +451,8 @@ def test_setup_python_app_requires_uv_when_missing_for_uv_modes(tmp_path: Path)
     assert result.returncode == 1
     assert "uv not installed!" in result.stdout
     assert "Please install uv to use this setup script." in result.stdout
-    assert calls == ""
+    # Nothing but the option validation ran
+    assert [call.split()[:3] for call in calls.splitlines()] == [["python", "-m", "src.options"]]
 
 
 def test_setup_python_app_poetry_happy_path_uses_mocked_tools(tmp_path: Path) -> None:
@@ -429,17 +496,70 @@ def test_setup_python_app_poetry_happy_path_uses_mocked_tools(tmp_path: Path) ->
     assert "poetry env remove --all" not in calls
     assert "poetry sync" in calls
     assert "poetry show -o" in calls
-    assert "python " in calls
-    assert "setup_prettierrc.py" in calls
-    assert "setup_pre_commit_config.py" in calls
-    assert "setup_pyproject_toml.py" in calls
-    assert "setup_pylintrc.py" in calls
-    assert "setup_flake8.py" in calls
-    assert "setup_fix_prettier_pre_commit.py" in calls
-    assert "setup_vscode_settings.py" in calls
+    assert "python -m src.options --package_manager=poetry --pre_commit_autoupdate=1 --python_formatter=black" in calls
+    assert calls.count("python -m src ") == 4
+    assert f"python -m src --project_dir={project_dir} --record_cache" in calls
+    assert "--python_formatter=black --record_cache" not in calls
+    assert "python -m pip install --disable-pip-version-check -r" in calls
+    assert list((home_dir / ".cache" / "utility-repo-scripts" / "tool-venvs").glob("3.14.3-*/.complete"))
+    assert f"python -m src --project_dir={project_dir} --steps=pyproject_toml" in calls
+    assert f"python -m src --project_dir={project_dir} --skip_steps=pyproject_toml" in calls
+    assert "--steps=fix_prettier_pre_commit" in calls
+    assert "setup_prettierrc.py" not in calls
     assert "pre-commit install" in calls
     assert "pre-commit autoupdate" in calls
-    assert "code --install-extension ms-python.black-formatter --force" in calls
+    # Every missing extension is installed by a single code invocation
+    assert [call for call in calls.splitlines() if call.startswith("code --install-extension")] == [
+        "code --install-extension ms-python.python --install-extension ms-python.vscode-pylance"
+        " --install-extension editorconfig.editorconfig --install-extension streetsidesoftware.code-spell-checker"
+        " --install-extension esbenp.prettier-vscode --install-extension ms-python.isort"
+        " --install-extension ms-python.pylint --install-extension ms-python.flake8"
+        " --install-extension ms-python.black-formatter --force"
+    ]
+
+
+def test_setup_python_app_reuses_the_vscode_extension_inventory(tmp_path: Path) -> None:
+    """The installed extensions should be listed once per ttl, and extensions installed from the VSIX directory."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    vsix_dir = tmp_path / "vsix"
+    vsix_dir.mkdir()
+    (vsix_dir / "ms-python.pylint-2024.1.0.vsix").write_text("", encoding="utf-8")
+    installed = "MS-Python.Python\nms-python.vscode-pylance\n"
+
+    cache_dir = tmp_path / "cache"
+
+    first_result, first_calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=tmp_path,
+        args=["--package_manager=poetry", f"--vscode_vsix_dir={vsix_dir}"],
+        code_extensions=installed,
+        cache_dir=cache_dir,
+    )
+
+    assert first_result.returncode == 0
+    assert "code --list-extensions" in first_calls
+    assert "--install-extension ms-python.python" not in first_calls
+    assert f"--install-extension {vsix_dir / 'ms-python.pylint-2024.1.0.vsix'}" in first_calls
+    assert "--install-extension ms-python.flake8" in first_calls
+    assert "ms-python.flake8" in (cache_dir / "vscode-extensions.txt").read_text(encoding="utf-8")
+
+    for run, args in enumerate([[], ["--vscode_extensions_ttl=0"]]):
+        run_tmp_path = tmp_path / f"run-{run}"
+        run_tmp_path.mkdir()
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_tmp_path,
+            args=["--package_manager=poetry", *args],
+            code_extensions=installed,
+            cache_dir=cache_dir,
+        )
+        assert result.returncode == 0
+        assert ("code --list-extensions" in calls) == (run == 1)
 
 
 def test_setup_python_app_uv_happy_path_uses_pyproject_sync(tmp_path: Path) -> None:
@@ -545,12 +665,41 @@ def test_setup_python_app_reuses_existing_venv_for_poetry(tmp_path: Path) -> Non
 
     assert second_result.returncode == 0
     assert f"python -m venv {project_dir / '.venv'}" not in second_calls
+    assert "python -m src" in second_calls
     assert "pyenv which python" not in second_calls
-    assert "poetry sync" in second_calls
+    # Nothing that decides what gets installed changed since the first run
+    assert "poetry sync" not in second_calls
+    assert "Dependencies are up to date" in second_result.stdout
 
 
-def test_setup_python_app_pip_flow_rebuilds_virtualenv_and_installs_requirements(tmp_path: Path) -> None:
-    """The pip flow should rebuild the virtualenv and install requirements-dev.txt."""
+def test_setup_python_app_syncs_again_when_lock_changes_or_forced(tmp_path: Path) -> None:
+    """The install region should run again when the lock file changes or --force_sync=1 is passed."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    runs = []
+    for run, args in enumerate([[], [], ["--force_sync=1"], [], []]):
+        if run == 3:
+            (project_dir / "poetry.lock").write_text("# lock\n", encoding="utf-8")
+        run_tmp_path = tmp_path / f"run-{run}"
+        run_tmp_path.mkdir()
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_tmp_path,
+            args=["--package_manager=poetry", *args],
+        )
+        assert result.returncode == 0
+        runs.append("poetry sync" in calls)
+
+    assert runs == [True, False, True, True, False]
+    assert (project_dir / ".venv" / ".urs-install-fingerprint").exists()
+
+
+def test_setup_python_app_pip_flow_syncs_requirements_incrementally(tmp_path: Path) -> None:
+    """The pip flow should sync requirements-dev.txt into the virtualenv instead of rebuilding it on every run."""
     project_dir = tmp_path / "sample-project"
     project_dir.mkdir()
     (project_dir / "requirements-dev.txt").write_text("pytest\n", encoding="utf-8")
@@ -569,12 +718,123 @@ def test_setup_python_app_pip_flow_rebuilds_virtualenv_and_installs_requirements
     assert "python -m pip install --upgrade pip" in calls
     assert "pip install --upgrade setuptools" in calls
     assert "pip install wheel" in calls
-    assert "pip install -r requirements-dev.txt" in calls
+    assert "/src/pip_sync.py requirements-dev.txt" in calls
+    assert "pip install -r requirements-dev.txt" not in calls
     assert "poetry sync" not in calls
 
+    (project_dir / "requirements-dev.txt").write_text("pytest\nblack\n", encoding="utf-8")
+    second_tmp_path = tmp_path / "second-run"
+    second_tmp_path.mkdir()
+    second_result, second_calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=second_tmp_path,
+        args=["--package_manager=pip"],
+        code_extensions="ms-python.python\n",
+    )
+
+    assert second_result.returncode == 0
+    assert f"python -m venv {project_dir / '.venv'}" not in second_calls
+    assert "/src/pip_sync.py requirements-dev.txt" in second_calls
+
+
+def test_setup_python_app_installs_from_a_filled_wheelhouse(tmp_path: Path) -> None:
+    """--fill_wheelhouse should download every pip install of the setup, which then all resolve from the wheelhouse."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "requirements-dev.txt").write_text("-r requirements.txt\npytest\n", encoding="utf-8")
+    (project_dir / "requirements.txt").write_text("requests\n", encoding="utf-8")
+    wheelhouse = tmp_path / "wheelhouse"
+
+    result, calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=tmp_path,
+        args=["--package_manager=pip", "--wheelhouse=../wheelhouse", "--fill_wheelhouse"],
+    )
+
+    assert result.returncode == 0
+    assert wheelhouse.is_dir()
+    assert (
+        "python -m pip download --disable-pip-version-check --dest ../wheelhouse pip setuptools wheel"
+        f" -r {REPO_ROOT / 'scripts' / 'tool-requirements.txt'} -r requirements-dev.txt -r requirements.txt"
+    ) in calls
+    assert f"pip install --upgrade setuptools [find-links {wheelhouse}]" in calls
+    assert f"pip install wheel [find-links {wheelhouse}]" in calls
+    # Only the installs of the setup resolve from the wheelhouse, pre-commit keeps using the index
+    assert "pre-commit install\n" in calls
+
+
+def test_setup_python_app_rejects_a_missing_wheelhouse(tmp_path: Path) -> None:
+    """A wheelhouse that does not exist is only accepted when it is going to be filled."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+
+    result, calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir, tmp_path=tmp_path, args=["--wheelhouse=missing"]
+    )
+
+    assert result.returncode == 2
+    assert "Invalid wheelhouse option: (missing)" in result.stderr
+    assert calls == ""
+
+
+def test_setup_python_app_rebuilds_virtualenv_for_a_different_python_version(tmp_path: Path) -> None:
+    """An existing virtualenv should only be rebuilt when it was created with another python version."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "requirements.txt").write_text("pytest\n", encoding="utf-8")
+    rebuilt = []
+    for run, venv_version in enumerate(["", "3.12.9", "3.13.2"]):
+        if venv_version:
+            (project_dir / ".venv" / "pyvenv.cfg").write_text(f"version = {venv_version}\n", encoding="utf-8")
+        run_tmp_path = tmp_path / f"run-{run}"
+        run_tmp_path.mkdir()
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_tmp_path,
+            args=["--package_manager=pip", "--python_version=3.12", "--debug"],
+        )
+        assert result.returncode == 0
+        rebuilt.append(f"python -m venv {project_dir / '.venv'}" in calls)
+
+    assert rebuilt == [True, False, True]
+    assert "virtual environment uses python 3.13.2 instead of 3.12" in result.stdout
+
+
+def test_setup_python_app_skips_pyenv_when_the_virtualenv_uses_the_requested_python(tmp_path: Path) -> None:
+    """pyenv should only run when the virtualenv is missing, uses another python or lost its base interpreter."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "requirements.txt").write_text("pytest\n", encoding="utf-8")
+    base_python_dir = tmp_path / "pyenv" / "versions" / "3.12.9" / "bin"
+    base_python_dir.mkdir(parents=True)
+    write_executable(base_python_dir / "python3", "#!/bin/bash\n")
+    args = ["--package_manager=pip", "--python_version=3.12"]
+    for run in ("cold", "warm", "moved"):
+        (tmp_path / run).mkdir()
+
+    result, calls, _home_dir = run_setup_python_app(project_dir=project_dir, tmp_path=tmp_path / "cold", args=args)
+    assert result.returncode == 0
+    assert "pyenv install -s 3.12" in calls
+    (project_dir / ".venv" / "pyvenv.cfg").write_text(
+        f"home = {base_python_dir}\ninclude-system-site-packages = false\nversion = 3.12.9\n", encoding="utf-8"
+    )
+    (project_dir / ".python-version").unlink()
+
+    result, calls, _home_dir = run_setup_python_app(project_dir=project_dir, tmp_path=tmp_path / "warm", args=args)
+    assert result.returncode == 0
+    assert "pyenv" not in calls
+    assert f"python -m venv {project_dir / '.venv'}" not in calls
+    assert (project_dir / ".python-version").read_text(encoding="utf-8") == "3.12\n"
+
+    shutil.rmtree(tmp_path / "pyenv")
+    result, calls, _home_dir = run_setup_python_app(project_dir=project_dir, tmp_path=tmp_path / "moved", args=args)
+    assert result.returncode == 0
+    assert "pyenv install -s 3.12" in calls
+    assert "pyenv local 3.12" in calls
+
 
-def test_setup_python_app_can_mock_npm_fallback_for_formatting_tools(tmp_path: Path) -> None:
-    """Missing prettier and sort-json commands should fall back to fake npm installs."""
+def test_setup_python_app_does_not_use_node_formatting_tools(tmp_path: Path) -> None:
+    """The processors write formatted files themselves, so prettier, sort-json and npm should never run."""
     project_dir = tmp_path / "sample-project"
     project_dir.mkdir()
     (project_dir / "pyproject.toml").write_text(
@@ -586,14 +846,169 @@ def test_setup_python_app_can_mock_npm_fallback_for_formatting_tools(tmp_path: P
         project_dir=project_dir,
         tmp_path=tmp_path,
         args=["--package_manager=poetry"],
-        unavailable_tools={"prettier", "sort-json"},
     )
 
     assert result.returncode == 0
-    assert "npm install -g prettier" in calls
-    assert "npm install -g sort-json" in calls
-    assert "prettier .prettierrc --write --ignore-path .prettierignore" in calls
-    assert "sort-json .vscode/settings.json" in calls
+    assert (project_dir / ".prettierrc").exists()
+    called_tools = {line.split(" ", 1)[0] for line in calls.splitlines()}
+    assert not called_tools & {"npm", "prettier", "sort-json"}
+
+
+def test_setup_python_app_parallel_option_controls_region_output(tmp_path: Path) -> None:
+    """Concurrent regions should prefix their buffered output, and --parallel=0 should stream it as before."""
+    for parallel in ("1", "0"):
+        project_dir = tmp_path / f"sample-project-{parallel}"
+        project_dir.mkdir()
+        (project_dir / "pyproject.toml").write_text(
+            '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+            encoding="utf-8",
+        )
+        run_dir = tmp_path / f"run-{parallel}"
+        run_dir.mkdir()
+
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_dir,
+            args=["--package_manager=poetry", f"--parallel={parallel}"],
+        )
+
+        assert result.returncode == 0
+        assert "poetry sync" in calls
+        assert "pre-commit install" in calls
+        prefixed = "[dependencies] Computing the outdated package report in the background" in result.stdout
+        assert prefixed == (parallel == "1")
+        assert "Computing the outdated package report in the background" in result.stdout
+
+
+def test_setup_python_app_reuses_the_outdated_report_until_it_expires(tmp_path: Path) -> None:
+    """poetry show -o should run in the background, and its report be reused until the ttl or poetry.lock expire it."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    report_file = project_dir / ".venv" / ".urs-outdated-report"
+    runs = []
+    for run, args in enumerate([[], [], ["--outdated_report_ttl=0"], [], ["--outdated_report=0"]]):
+        if run == 1:
+            report_file.write_text("black 24.1.0 25.1.0 The uncompromising code formatter.\n", encoding="utf-8")
+        if run == 3:
+            (project_dir / "poetry.lock").write_text("# lock\n", encoding="utf-8")
+        run_tmp_path = tmp_path / f"run-{run}"
+        run_tmp_path.mkdir()
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_tmp_path,
+            args=["--package_manager=poetry", *args],
+        )
+        assert result.returncode == 0
+        runs.append("poetry show -o" in calls)
+        if run == 1:
+            assert "Outdated packages:\nblack 24.1.0 25.1.0" in result.stdout
+        if run == 4:
+            assert "Outdated packages" not in result.stdout
+
+    assert runs == [True, False, True, True, False]
+
+
+def test_setup_python_app_builds_pre_commit_hook_environments_in_the_background(tmp_path: Path) -> None:
+    """pre-commit install-hooks should run once per .pre-commit-config.yaml, unless it is turned off."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    status_file = project_dir / ".venv" / ".urs-pre-commit-install-hooks.status"
+    runs = []
+    for run, args in enumerate([[], [], ["--pre_commit_autoupdate=1"], ["--pre_commit_install_hooks=0", "--no_cache"]]):
+        run_tmp_path = tmp_path / f"run-{run}"
+        run_tmp_path.mkdir()
+        result, calls, _home_dir = run_setup_python_app(
+            project_dir=project_dir,
+            tmp_path=run_tmp_path,
+            args=["--package_manager=poetry", *args],
+        )
+        assert result.returncode == 0
+        for _ in range(50):
+            if not status_file.read_text(encoding="utf-8").startswith("running"):
+                break
+            time.sleep(0.1)
+        runs.append("pre-commit install-hooks" in calls)
+
+    # The autoupdate run changes the config through the prettier fix
+    assert runs == [True, False, True, False]
+    assert status_file.read_text(encoding="utf-8").startswith("0 ")
+
+
+def test_setup_python_app_rejects_invalid_parallel_option(tmp_path: Path) -> None:
+    """--parallel should only accept 0 or 1."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+
+    result, calls, _home_dir = run_setup_python_app(project_dir=project_dir, tmp_path=tmp_path, args=["--parallel=2"])
+
+    assert result.returncode == 2
+    assert "Invalid parallel option: (2)" in result.stderr
+    assert calls == ""
+
+
+def test_setup_python_app_reports_region_timings(tmp_path: Path) -> None:
+    """--timings should print a table of the regions and --timings_file should write them as JSON."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "sample-project"\nversion = "0.1.0"\n',
+        encoding="utf-8",
+    )
+    timings_file = tmp_path / "timings.json"
+
+    result, calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=tmp_path,
+        args=["--package_manager=poetry", "--timings=1", f"--timings_file={timings_file}"],
+    )
+
+    assert result.returncode == 0
+    # The pyproject.toml processor can rewrite pyproject.toml, so the dependencies are installed after it
+    assert calls.index(f"python -m src --project_dir={project_dir} --steps=pyproject_toml") < calls.index("poetry sync")
+    assert result.stdout.count("Timings") == 1
+    assert "Total" in result.stdout
+    timings = json.loads(timings_file.read_text(encoding="utf-8"))
+    regions = {region["region"]: region for region in timings["regions"]}
+    assert set(regions) == {
+        "virtual_environment",
+        "dependencies",
+        "pyproject_toml",
+        "config_files",
+        "pre_commit",
+        "vscode_launch",
+        "vscode_extensions",
+        "after_setup",
+    }
+    assert all(region["status"] == 0 and not region["skipped"] for region in regions.values())
+    assert all(region["duration"] >= 0 for region in regions.values())
+
+
+def test_setup_python_app_writes_timings_when_a_region_fails(tmp_path: Path) -> None:
+    """The timings file should still be written, with skipped regions, when the setup fails."""
+    project_dir = tmp_path / "sample-project"
+    project_dir.mkdir()
+    timings_file = tmp_path / "timings.json"
+
+    result, _calls, _home_dir = run_setup_python_app(
+        project_dir=project_dir,
+        tmp_path=tmp_path,
+        args=["--package_manager=pip", f"--timings_file={timings_file}"],
+    )
+
+    assert result.returncode == 2
+    assert "Timings" not in result.stdout
+    regions = {region["region"]: region for region in json.loads(timings_file.read_text(encoding="utf-8"))["regions"]}
+    assert regions["dependencies"]["status"] == 2
+    assert regions["pre_commit"]["skipped"] is True
+    assert regions["pre_commit"]["status"] is None
 
 
 def test_setup_wrapper_forwards_python_version_override(tmp_path: Path) -> None:
@@ -1,8 +1,33 @@
 """Test the src/utils.py file."""
 
+import os
+from pathlib import Path
+
 import pytest
+from configupdater import ConfigUpdater
 
-from src.utils.core import validate_python_formatter_option
+from src.constants.pre_commit_config import FLAKE8_HOOK, FLAKE8_HOOK_ID, FLAKE8_REPO, FLAKE8_REPO_URL
+from src.utils.configupdater import dump_ini_file
+from src.utils.core import (
+    delete_file,
+    freeze,
+    pop_changed_files,
+    thaw,
+    validate_python_formatter_option,
+    write_if_changed,
+)
+from src.utils.prettier import dump_json
+from src.utils.ruamel.yaml import (
+    KEYED_BY_ID,
+    REPLACE,
+    PreCommitConfig,
+    deep_update,
+    dump_yaml,
+    fingerprint,
+    load_yaml_file,
+    remove_hooks,
+    update_hook,
+)
 
 
 # Testing python_formatter options
@@ -17,3 +42,290 @@ def test_process_vs_code_settings_invalid_python_formatter():
     assert exception_info.value.args[0] == (
         f"Invalid python_formatter: {python_formatter}. " + "Valid Options are: ['', 'autopep8', 'black']"
     )
+
+
+@pytest.fixture
+def changed_files():
+    """Start every write test with an empty list of changed files."""
+    pop_changed_files()
+    yield
+    pop_changed_files()
+
+
+def test_write_if_changed_creates_missing_file(tmp_path: Path, changed_files):
+    """A missing file should be created and reported as changed."""
+    path = tmp_path / ".flake8"
+
+    assert write_if_changed(str(path), "[flake8]\n") is True
+    assert path.read_text(encoding="utf-8") == "[flake8]\n"
+    assert pop_changed_files() == [str(path)]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_write_if_changed_leaves_identical_file_untouched(tmp_path: Path, changed_files):
+    """Writing the same content should not replace the file or touch its mtime."""
+    path = tmp_path / ".flake8"
+    path.write_text("[flake8]\n", encoding="utf-8")
+    os.utime(path, (1_000_000, 1_000_000))
+    inode = path.stat().st_ino
+
+    assert write_if_changed(str(path), "[flake8]\n") is False
+    assert path.stat().st_mtime == 1_000_000
+    assert path.stat().st_ino == inode
+    assert not pop_changed_files()
+
+
+def test_write_if_changed_replaces_changed_file_and_keeps_mode(tmp_path: Path, changed_files):
+    """Different content should replace the file while keeping its permissions."""
+    path = tmp_path / ".pylintrc"
+    path.write_text("[MASTER]\n", encoding="utf-8")
+    path.chmod(0o640)
+
+    assert write_if_changed(str(path), "[MASTER]\njobs=1\n") is True
+    assert path.read_text(encoding="utf-8") == "[MASTER]\njobs=1\n"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert pop_changed_files() == [str(path)]
+
+
+def test_write_if_changed_writes_through_symlinks(tmp_path: Path, changed_files):
+    """A symlinked config file should keep pointing at its (updated) target."""
+    target = tmp_path / "shared.flake8"
+    target.write_text("[flake8]\n", encoding="utf-8")
+    link = tmp_path / ".flake8"
+    link.symlink_to(target)
+
+    assert write_if_changed(str(link), "[flake8]\nmax-line-length=120\n") is True
+    assert link.is_symlink()
+    assert target.read_text(encoding="utf-8") == "[flake8]\nmax-line-length=120\n"
+
+
+def test_delete_file_reports_deleted_files_only(tmp_path: Path, changed_files):
+    """Only files that existed should be reported as changed."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text("", encoding="utf-8")
+
+    assert delete_file(str(path)) is True
+    assert delete_file(str(path)) is False
+    assert pop_changed_files() == [str(path)]
+
+
+def test_dump_json_expands_objects_and_keeps_short_arrays_inline():
+    """Objects should always be expanded while arrays that fit stay on one line."""
+    data = {"b": {"x": 1}, "a": ["one", "two"], "c": [], "d": {}}
+
+    assert dump_json(data).splitlines() == [
+        "{",
+        '  "b": {',
+        '    "x": 1',
+        "  },",
+        '  "a": ["one", "two"],',
+        '  "c": [],',
+        '  "d": {}',
+        "}",
+    ]
+    assert dump_json(data).endswith("}\n")
+
+
+def test_dump_json_breaks_arrays_longer_than_print_width():
+    """Arrays that do not fit in the print width, including the trailing comma, should be broken per item."""
+    data = {"items": ["aaaa", "bbbb"], "last": True}
+
+    assert dump_json(data, print_width=28) == '{\n  "items": ["aaaa", "bbbb"],\n  "last": true\n}\n'
+    assert dump_json(data, print_width=27) == '{\n  "items": [\n    "aaaa",\n    "bbbb"\n  ],\n  "last": true\n}\n'
+
+
+def test_dump_json_always_breaks_arrays_of_objects():
+    """Arrays holding objects or arrays of arrays should never be inlined."""
+    assert dump_json([{"name": "a"}]) == '[\n  {\n    "name": "a"\n  }\n]\n'
+    assert dump_json([[1, 2], [3, 4]]) == "[\n  [1, 2],\n  [3, 4]\n]\n"
+    assert dump_json([[1], [2]]) == "[[1], [2]]\n"
+
+
+def test_dump_json_sorts_keys_recursively():
+    """sort_keys should sort nested objects too, like sort-json does."""
+    data = {"b": 1, "a": {"d": 1, "c": [{"f": 1, "e": 2}]}}
+
+    assert dump_json(data, sort_keys=True) == (
+        "{\n"
+        '  "a": {\n'
+        '    "c": [\n'
+        "      {\n"
+        '        "e": 2,\n'
+        '        "f": 1\n'
+        "      }\n"
+        "    ],\n"
+        '    "d": 1\n'
+        "  },\n"
+        '  "b": 1\n'
+        "}\n"
+    )
+
+
+def test_dump_yaml_uses_prettier_layout():
+    """Sequences should be indented under their key, comments follow a single space and quotes are double."""
+    data = load_yaml_file(
+        debug=False,
+        exists=False,
+        filename=".pre-commit-config.yaml",
+        sample="repos:\n- repo: local\n  hooks:\n  - id: a     # comment\n    files: 'a: b'\n    args: [-v]\n",
+    )
+
+    assert dump_yaml(data) == (
+        "repos:\n"
+        "  - repo: local\n"
+        "    hooks:\n"
+        "      - id: a # comment\n"
+        '        files: "a: b"\n'
+        "        args: [-v]\n"
+    )
+
+
+def test_dump_ini_file_strips_trailing_whitespace():
+    """Trailing whitespace should be removed from every line."""
+    data = ConfigUpdater()
+    data.read_string("[flake8]  \nexclude=.git   \n")
+
+    assert dump_ini_file(data) == "[flake8]\nexclude=.git\n"
+
+
+INDEXED_PRE_COMMIT_CONFIG = """repos:
+  # local hooks
+  - repo: local
+    hooks:
+      - id: a # first
+      - id: b
+  - repo: https://github.com/example/tool
+    rev: v1.0.0
+    hooks:
+      - id: tool
+  - repo: local
+    hooks:
+      - id: a
+"""
+
+
+def test_pre_commit_config_finds_first_repo_and_hook():
+    """Lookups should return the first repo with a url and the first hook with an id, like the linear scans did."""
+    data = load_yaml_file(
+        debug=False, exists=False, filename=".pre-commit-config.yaml", sample=INDEXED_PRE_COMMIT_CONFIG
+    )
+    config = PreCommitConfig(data)
+
+    local_repo = config.find_repo("local")
+    assert local_repo is data["repos"][0]
+    assert config.find_hook(local_repo, "a") is data["repos"][0]["hooks"][0]
+    assert config.find_hook(local_repo, "missing") is None
+    assert config.find_repo("https://github.com/example/missing") is None
+
+
+def test_pre_commit_config_keeps_indexes_in_sync():
+    """Repos and hooks removed or added through the class should be reflected in later lookups."""
+    data = load_yaml_file(
+        debug=False, exists=False, filename=".pre-commit-config.yaml", sample=INDEXED_PRE_COMMIT_CONFIG
+    )
+    config = PreCommitConfig(data)
+
+    remove_hooks(config, repo_urls=["local"], local_ids=["a", "b"])
+    # The first local repo is gone once it has no hooks left, the second one is found next
+    assert config.find_repo("local") is data["repos"][1]
+
+    update_hook(config, "local", {}, hooks=[("c", {"id": "c", "entry": "c"})])
+    assert config.find_hook(data["repos"][1], "c") == {"id": "c", "entry": "c"}
+
+    remove_hooks(config, repo_urls=["https://github.com/example/tool"])
+    assert config.find_repo("https://github.com/example/tool") is None
+    assert dump_yaml(data) == (
+        "repos:\n"
+        "  # local hooks\n"
+        "  - repo: local\n"
+        "    hooks:\n"
+        "      - id: a\n"
+        "      - id: c\n"
+        "        entry: c\n"
+    )
+
+
+def test_pre_commit_config_adds_repos_key_on_first_repo():
+    """A config without repos should only get a repos list once a repo is added."""
+    data: dict = {}
+    config = PreCommitConfig(data)
+    assert not data
+
+    update_hook(config, "local", {"repo": "local", "hooks": []}, hooks=[])
+    assert data == {"repos": [{"repo": "local", "hooks": []}]}
+
+
+def test_fingerprint_matches_equality():
+    """Values should share a fingerprint exactly when they compare equal."""
+    assert fingerprint({"a": [1, {"b": 2}], "c": 3}) == fingerprint({"c": 3, "a": [1, {"b": 2}]})
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    assert fingerprint(["a"]) != fingerprint("a")
+    assert fingerprint({"a": 1}) != fingerprint([("a", 1)])
+
+
+def test_deep_update_appends_unique_items_in_order():
+    """New list items should be added once, after the existing ones, without reordering them."""
+    source = {"args": ["-v", {"x": 1}], "additional_dependencies": [f"pkg{i}==1.0" for i in range(500)]}
+
+    deep_update(
+        source,
+        {
+            "args": [{"x": 1}, "--fast", "-v", "--fast"],
+            "additional_dependencies": ["pkg499==1.0", "new==2.0", "pkg0==1.0"],
+        },
+    )
+
+    assert source["args"] == ["-v", {"x": 1}, "--fast"]
+    assert source["additional_dependencies"][-2:] == ["pkg499==1.0", "new==2.0"]
+    assert len(source["additional_dependencies"]) == 501
+
+
+def test_deep_update_list_merge_strategies():
+    """Per key strategies should replace lists or merge their items by id."""
+    source = {
+        "args": ["-v"],
+        "hooks": [{"id": "a", "args": ["-x"]}, {"id": "b"}, "plain"],
+    }
+
+    deep_update(
+        source,
+        {"args": ["-q"], "hooks": [{"id": "b", "entry": "b"}, {"id": "c"}, {"id": "a", "args": ["-y"]}, "plain"]},
+        strategies={"args": REPLACE, "hooks": KEYED_BY_ID},
+    )
+
+    assert source == {
+        "args": ["-q"],
+        "hooks": [{"id": "a", "args": ["-y"]}, {"id": "b", "entry": "b"}, "plain", {"id": "c"}],
+    }
+
+
+def test_deep_update_rejects_unknown_strategy():
+    """An unknown strategy name should raise a ValueError."""
+    with pytest.raises(ValueError):
+        deep_update({"args": []}, {"args": ["-v"]}, strategies={"args": "merge"})
+
+
+def test_freeze_and_thaw_templates():
+    """Frozen templates should be read only, and thawing them should give an independent mutable copy."""
+    template = freeze({"id": "a", "args": ["-v"], "nested": {"files": ["a.py"]}})
+
+    with pytest.raises(TypeError):
+        template["id"] = "b"  # type: ignore[index]
+    assert template["args"] == ("-v",)
+
+    copy = thaw(template)
+    copy["nested"]["files"].append("b.py")
+    assert copy == {"id": "a", "args": ["-v"], "nested": {"files": ["a.py", "b.py"]}}
+    assert template["nested"]["files"] == ("a.py",)
+
+
+def test_update_hook_copies_frozen_templates_on_insert():
+    """Editing a document after inserting or merging a template should leave the template unchanged."""
+    data: dict = {}
+    update_hook(data, FLAKE8_REPO_URL, FLAKE8_REPO, hooks=[(FLAKE8_HOOK_ID, FLAKE8_HOOK)])
+    data["repos"][0]["hooks"][0]["args"].append("--extra")
+
+    update_hook(data, FLAKE8_REPO_URL, FLAKE8_REPO, hooks=[(FLAKE8_HOOK_ID, FLAKE8_HOOK)])
+    assert data["repos"][0]["hooks"][0]["args"] == ["--config=.flake8", "--extra"]
+    assert FLAKE8_HOOK["args"] == ("--config=.flake8",)
+    assert FLAKE8_REPO["hooks"][0]["args"] == ("--config=.flake8",)